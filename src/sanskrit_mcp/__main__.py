@@ -6,32 +6,192 @@ with real-time translation and Vedic knowledge grounding.
 """
 
 import asyncio
+import json
 import logging
-from typing import Any
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import (
+    Resource,
     TextContent,
     Tool,
-    Resource,
 )
 
-from .lib.agent_registry import AgentRegistry
+from .lib.agent_registry import DEFAULT_PAGE_SIZE, AgentRegistry
+from .lib.chandas import analyze_meter
+from .lib.circuit_breaker import FAILURE_THRESHOLD, RESET_TIMEOUT, CircuitBreaker
+from .lib.conversation_log import LOG_CAPACITY, ConversationLog
+from .lib.fake_backend import FAKE_MEDIAN_LATENCY, FakeBackend
+from .lib.gemini_client import MAX_PROMPT_TOKENS, ChunkCallback, GeminiClient, GeminiUnavailable
+from .lib.grammar_analyzers import GrammarAnalyzers
+from .lib.latency import LatencyTracker
+from .lib.local_fallback import VOCABULARY, local_translation
+from .lib.mailbox import MAILBOX_SIZE, MAX_WAIT, MailboxHub
+from .lib.registry_store import RegistryStore
+from .lib.request_limiter import DEADLINE, MAX_IN_FLIGHT, MAX_RETRIES, RequestLimiter
 from .lib.sanskrit_validator import SanskritValidator
+from .lib.shared_registry import SHARED_CAPACITY, SharedRegistryTable
+from .lib.token_usage import INPUT_PRICE, MAX_AGENTS, OUTPUT_PRICE, TokenLedger, usage_scope
+from .lib.tokenizer import word_spans
+from .lib.translation_cache import CACHE_MAX_BYTES, CACHE_TTL, TranslationCache
+from .lib.translation_memory import (
+    HINT_THRESHOLD,
+    MATCH_THRESHOLD,
+    MEMORY_CAPACITY,
+    TranslationMemory,
+)
+from .lib.transliteration import (
+    DEVANAGARI,
+    IAST,
+    SCHEMES,
+    source_scheme,
+    transliterate,
+    transliterate_many,
+)
+from .lib.types import (
+    Agent,
+    ComprehensionLevel,
+    Formality,
+    Language,
+    LatencyStatistics,
+    MessageMetadata,
+    MorphAnalysis,
+    OverflowPolicy,
+    SanskritCapabilities,
+    SanskritMessage,
+    TokenUsage,
+    ValidationResult,
+)
 from .lib.vedic_corpus_parser import VedicCorpusParser
-from .lib.types import Agent, SanskritCapabilities, Formality
-from .lib.gemini_client import GeminiClient
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds each tool waits for Gemini before answering from local resources
+LATENCY_BUDGETS = {
+    "translate_sanskrit": 10.0,
+    "translate_sanskrit_batch": 30.0,
+    "query_vedic_knowledge": 5.0,
+}
+
+# Corpus confidence below which query_vedic_knowledge adds an AI insight
+INSIGHT_CONFIDENCE = 0.8
+# Estimated tokens of corpus context in the AI insight prompt
+INSIGHT_CONTEXT_TOKENS = 400
+# Schema description of the scheme a tool's input text is written in
+SCHEME_DESCRIPTION = (
+    "Scheme of the text; detected for Devanagari and IAST, other plain ASCII is read as "
+    "Harvard-Kyoto (rAma, dharma); give it for SLP1 or ITRANS"
+)
+
+
+def forget_agent(agent: Agent) -> None:
+    """Drop the per-agent state kept outside the registry for an evicted agent."""
+    mailboxes.discard(agent.id)
+    gemini_client.usage.discard_agent(agent.id)
+
+
 # Initialize core services
-agent_registry = AgentRegistry()
-sanskrit_validator = SanskritValidator()
+mailboxes = MailboxHub(
+    capacity=int(os.getenv("SANSKRIT_MAILBOX_SIZE", MAILBOX_SIZE)),
+    policy=OverflowPolicy(os.getenv("SANSKRIT_MAILBOX_POLICY", OverflowPolicy.BLOCK.value).lower()),
+)
+registry_db = os.getenv("SANSKRIT_REGISTRY_DB")
+shared_registry = os.getenv("SANSKRIT_SHARED_REGISTRY")
+idle_ttl = os.getenv("SANSKRIT_AGENT_IDLE_TTL")
+archive_evicted = os.getenv("SANSKRIT_ARCHIVE_EVICTED", "true")
+agent_registry = AgentRegistry(
+    store=RegistryStore(registry_db) if registry_db else None,
+    idle_ttl=float(idle_ttl) if idle_ttl else None,
+    archive_evicted=archive_evicted.lower() not in ("0", "false", "no"),
+    on_evict=forget_agent,
+    shared=(
+        SharedRegistryTable(
+            shared_registry,
+            capacity=int(os.getenv("SANSKRIT_SHARED_REGISTRY_CAPACITY", SHARED_CAPACITY)),
+        )
+        if shared_registry
+        else None
+    ),
+)
+communication_log = ConversationLog(
+    capacity=int(os.getenv("SANSKRIT_LOG_CAPACITY", LOG_CAPACITY)),
+    spill_dir=os.getenv("SANSKRIT_LOG_SPILL_DIR"),
+)
 vedic_corpus = VedicCorpusParser()
-gemini_client = GeminiClient()
+grammar_analyzers = GrammarAnalyzers(corpus=vedic_corpus)
+sanskrit_validator = SanskritValidator(analyzers=grammar_analyzers)
+translation_cache = TranslationCache(
+    path=os.getenv("SANSKRIT_TRANSLATION_CACHE"),
+    ttl=float(os.getenv("SANSKRIT_TRANSLATION_CACHE_TTL", CACHE_TTL)),
+    max_bytes=int(
+        float(os.getenv("SANSKRIT_TRANSLATION_CACHE_MB", CACHE_MAX_BYTES / 2**20)) * 2**20
+    ),
+)
+translation_memory = TranslationMemory(
+    capacity=int(os.getenv("SANSKRIT_TM_CAPACITY", MEMORY_CAPACITY)),
+    hint_threshold=float(os.getenv("SANSKRIT_TM_HINT_THRESHOLD", HINT_THRESHOLD)),
+)
+translation_memory.add_passages(vedic_corpus.all_passages())
+fake_responses = os.getenv("SANSKRIT_FAKE_RESPONSES")
+fake_median = os.getenv("SANSKRIT_FAKE_MEDIAN_MS")
+fake_p99 = os.getenv("SANSKRIT_FAKE_P99_MS")
+fake_seed = os.getenv("SANSKRIT_FAKE_SEED")
+llm_backend = (
+    FakeBackend(
+        median_latency=float(fake_median) / 1000 if fake_median else FAKE_MEDIAN_LATENCY,
+        p99_latency=float(fake_p99) / 1000 if fake_p99 else None,
+        error_rate=float(os.getenv("SANSKRIT_FAKE_ERROR_RATE", "0.0")),
+        responses=(
+            json.loads(Path(fake_responses).read_text(encoding="utf-8")) if fake_responses else None
+        ),
+        seed=int(fake_seed) if fake_seed else None,
+    )
+    if os.getenv("SANSKRIT_LLM_BACKEND", "gemini").lower() == "fake"
+    else None
+)
+gemini_rpm = os.getenv("SANSKRIT_GEMINI_RPM")
+gemini_tpm = os.getenv("SANSKRIT_GEMINI_TPM")
+gemini_client = GeminiClient(
+    cache=translation_cache,
+    limiter=RequestLimiter(
+        max_in_flight=int(os.getenv("SANSKRIT_GEMINI_MAX_IN_FLIGHT", MAX_IN_FLIGHT)),
+        requests_per_minute=float(gemini_rpm) if gemini_rpm else None,
+        tokens_per_minute=float(gemini_tpm) if gemini_tpm else None,
+        max_retries=int(os.getenv("SANSKRIT_GEMINI_MAX_RETRIES", MAX_RETRIES)),
+        deadline=float(os.getenv("SANSKRIT_GEMINI_DEADLINE", DEADLINE)),
+    ),
+    backend=llm_backend,
+    usage=TokenLedger(
+        input_price=float(os.getenv("SANSKRIT_GEMINI_INPUT_PRICE", INPUT_PRICE)),
+        output_price=float(os.getenv("SANSKRIT_GEMINI_OUTPUT_PRICE", OUTPUT_PRICE)),
+        max_agents=int(os.getenv("SANSKRIT_USAGE_MAX_AGENTS", MAX_AGENTS)),
+    ),
+    max_prompt_tokens=int(os.getenv("SANSKRIT_GEMINI_MAX_PROMPT_TOKENS", MAX_PROMPT_TOKENS)),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.getenv("SANSKRIT_GEMINI_BREAKER_FAILURES", FAILURE_THRESHOLD)),
+        reset_timeout=float(os.getenv("SANSKRIT_GEMINI_BREAKER_RESET", RESET_TIMEOUT)),
+    ),
+    memory=translation_memory,
+    memory_threshold=float(os.getenv("SANSKRIT_TM_THRESHOLD", MATCH_THRESHOLD)),
+)
+insight_context_tokens = int(os.getenv("SANSKRIT_INSIGHT_CONTEXT_TOKENS", INSIGHT_CONTEXT_TOKENS))
+latency_budgets = {
+    tool: float(os.getenv(f"SANSKRIT_{tool.upper()}_BUDGET", seconds))
+    for tool, seconds in LATENCY_BUDGETS.items()
+}
+tool_latency = LatencyTracker()
+# What became of query_vedic_knowledge's AI insight requests
+insight_outcomes: Counter[str] = Counter()
 
 # Create MCP server
 app = Server("sanskrit-agent-communication")
@@ -65,6 +225,10 @@ async def list_tools() -> list[Tool]:
                                 "enum": ["formal", "moderate", "casual"],
                                 "default": "moderate",
                             },
+                            "comprehensionLevel": {
+                                "type": "string",
+                                "enum": [level.value for level in ComprehensionLevel],
+                            },
                         },
                     },
                 },
@@ -81,6 +245,10 @@ async def list_tools() -> list[Tool]:
                     "toAgent": {"type": "string"},
                     "content": {"type": "string"},
                     "context": {"type": "string"},
+                    "sessionId": {
+                        "type": "string",
+                        "description": "Conversation ID (defaults to one per agent pair)",
+                    },
                     "formality": {
                         "type": "string",
                         "enum": ["formal", "moderate", "casual"],
@@ -90,6 +258,67 @@ async def list_tools() -> list[Tool]:
                 "required": ["fromAgent", "toAgent", "content"],
             },
         ),
+        Tool(
+            name="broadcast_sanskrit_message",
+            description="Send a Sanskrit message to every active agent in a capability group",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "fromAgent": {"type": "string"},
+                    "content": {"type": "string"},
+                    "capabilities": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Recipients must have all of these capabilities",
+                    },
+                    "anyCapabilities": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Recipients must have at least one of these capabilities",
+                    },
+                    "comprehensionLevel": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": [level.value for level in ComprehensionLevel],
+                        },
+                    },
+                    "context": {"type": "string"},
+                    "sessionId": {
+                        "type": "string",
+                        "description": "Conversation ID (defaults to one per sender)",
+                    },
+                    "formality": {
+                        "type": "string",
+                        "enum": ["formal", "moderate", "casual"],
+                        "default": "moderate",
+                    },
+                },
+                "required": ["fromAgent", "content"],
+            },
+        ),
+        Tool(
+            name="receive_messages",
+            description=(
+                "Take messages waiting in an agent's mailbox, optionally waiting for new ones"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "agentId": {"type": "string"},
+                    "maxMessages": {"type": "integer", "default": 10},
+                    "waitSeconds": {
+                        "type": "number",
+                        "default": 0,
+                        "description": (
+                            f"Long-poll for up to this many seconds (max {MAX_WAIT:g}) "
+                            "if the mailbox is empty"
+                        ),
+                    },
+                },
+                "required": ["agentId"],
+            },
+        ),
         Tool(
             name="translate_sanskrit",
             description="Translate between Sanskrit and English with cultural context",
@@ -103,10 +332,29 @@ async def list_tools() -> list[Tool]:
                     },
                     "includeTransliteration": {"type": "boolean", "default": False},
                     "culturalContext": {"type": "boolean", "default": False},
+                    "agentId": {"type": "string", "description": "Agent to charge model usage to"},
                 },
                 "required": ["text", "direction"],
             },
         ),
+        Tool(
+            name="translate_sanskrit_batch",
+            description="Translate many texts between Sanskrit and English, several per model call",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "texts": {"type": "array", "items": {"type": "string"}, "minItems": 1},
+                    "direction": {
+                        "type": "string",
+                        "enum": ["sanskrit-to-english", "english-to-sanskrit"],
+                    },
+                    "includeTransliteration": {"type": "boolean", "default": False},
+                    "culturalContext": {"type": "boolean", "default": False},
+                    "agentId": {"type": "string", "description": "Agent to charge model usage to"},
+                },
+                "required": ["texts", "direction"],
+            },
+        ),
         Tool(
             name="get_agent_status",
             description="Get status and statistics for registered agents",
@@ -135,10 +383,15 @@ async def list_tools() -> list[Tool]:
                 "type": "object",
                 "properties": {
                     "query": {"type": "string", "description": "Question about Vedic topics"},
-                    "context": {"type": "string", "description": "Optional context"}
+                    "context": {"type": "string", "description": "Optional context"},
+                    "meter": {
+                        "type": "string",
+                        "description": "Only passages in this meter, e.g. anuṣṭubh",
+                    },
+                    "agentId": {"type": "string", "description": "Agent to charge model usage to"},
                 },
-                "required": ["query"]
-            }
+                "required": ["query"],
+            },
         ),
         Tool(
             name="validate_grammar",
@@ -147,52 +400,150 @@ async def list_tools() -> list[Tool]:
                 "type": "object",
                 "properties": {
                     "text": {"type": "string", "description": "Sanskrit text to analyze"},
-                    "mode": {"type": "string", "enum": ["sandhi", "morphology"], "default": "morphology"}
+                    "mode": {
+                        "type": "string",
+                        "enum": ["sandhi", "morphology"],
+                        "default": "morphology",
+                    },
+                    "scheme": {
+                        "type": "string",
+                        "enum": list(SCHEMES),
+                        "description": SCHEME_DESCRIPTION,
+                    },
+                },
+                "required": ["text"],
+            },
+        ),
+        Tool(
+            name="transliterate_sanskrit",
+            description=(
+                "Convert Sanskrit text between Devanagari, IAST, SLP1, ITRANS and Harvard-Kyoto"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "text": {"type": "string", "description": "Text to convert"},
+                    "texts": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Batch of texts to convert in one call",
+                    },
+                    "source": {
+                        "type": "string",
+                        "enum": list(SCHEMES),
+                        "description": SCHEME_DESCRIPTION,
+                    },
+                    "target": {"type": "string", "enum": list(SCHEMES)},
                 },
-                "required": ["text"]
-            }
+                "required": ["target"],
+            },
+        ),
+        Tool(
+            name="find_agents",
+            description="Find registered agents by capability, formality and comprehension level",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "capabilities": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Agents must have all of these capabilities",
+                    },
+                    "anyCapabilities": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Agents must have at least one of these capabilities",
+                    },
+                    "formality": {
+                        "type": "array",
+                        "items": {"type": "string", "enum": [f.value for f in Formality]},
+                    },
+                    "comprehensionLevel": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": [level.value for level in ComprehensionLevel],
+                        },
+                    },
+                    "canRead": {"type": "boolean"},
+                    "canWrite": {"type": "boolean"},
+                    "includeInactive": {"type": "boolean", "default": False},
+                    "offset": {"type": "integer", "default": 0},
+                    "limit": {"type": "integer", "default": DEFAULT_PAGE_SIZE},
+                },
+            },
+        ),
+        Tool(
+            name="analyze_meter",
+            description=(
+                "Identify the meter (chandas) of a verse, or list corpus passages in a meter"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "text": {
+                        "type": "string",
+                        "description": "Verse, pādas separated by daṇḍas or newlines",
+                    },
+                    "scheme": {
+                        "type": "string",
+                        "enum": list(SCHEMES),
+                        "description": SCHEME_DESCRIPTION,
+                    },
+                    "meter": {"type": "string", "description": "Meter to list corpus passages for"},
+                },
+            },
         ),
     ]
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
+    """Handle tool calls, recording each tool's latency and errors."""
+    start = time.perf_counter()
+    # Charge model calls made for this tool call to the tool and its agent
+    usage_scope.set((name, arguments.get("agentId") or arguments.get("fromAgent")))
     try:
-        if name == "register_agent":
-            return await handle_register_agent(arguments)
-        elif name == "send_sanskrit_message":
-            return await handle_send_message(arguments)
-        elif name == "translate_sanskrit":
-            return await handle_translate(arguments)
-        elif name == "get_agent_status":
-            return await handle_get_status(arguments)
-        elif name == "analyze_conversation":
-            return await handle_analyze_conversation(arguments)
-        elif name == "query_vedic_knowledge":
-            return await handle_query_vedic_knowledge(arguments)
-        elif name == "validate_grammar":
-            text = arguments["text"]
-            mode = arguments.get("mode", "morphology")
-            
-            try:
-                # Attempt to use sanskrit_parser if available
-                from sanskrit_parser.base.sanskrit_base import SanskritObject, SLP1
-                from sanskrit_parser.parser.sandhi_analyzer import LexicalSandhiAnalyzer
-                
-                # This is a simplified usage. In a real scenario, we'd initialize the analyzer properly.
-                # Since data files might be missing, we wrap this in a try-except.
-                return [TextContent(type="text", text=f"Analysis for '{text}':\n[Rule Engine Integration Pending: Please ensure sanskrit-parser data is installed]\n\nValidating structure... OK.")]
-                
-            except ImportError:
-                return [TextContent(type="text", text="Error: 'sanskrit-parser' library not found. Please install it to enable strict Paninian validation.")]
-            except Exception as e:
-                return [TextContent(type="text", text=f"Rule Engine Validation:\nText: {text}\nStatus: Structure Validated (Basic)\nNote: Full morphological analysis requires local data files.\nError: {str(e)}")]
-        else:
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+        result = await dispatch_tool(name, arguments)
     except Exception as e:
+        tool_latency.record(name, time.perf_counter() - start, error=True)
         logger.error(f"Error in tool {name}: {e}", exc_info=True)
         return [TextContent(type="text", text=f"Error: {str(e)}")]
+    if result is None:
+        return [TextContent(type="text", text=f"Unknown tool: {name}")]
+    tool_latency.record(name, time.perf_counter() - start)
+    return result
+
+
+async def dispatch_tool(name: str, arguments: dict[str, Any]) -> Optional[list[TextContent]]:
+    """Run the handler for a tool, or return None for an unknown tool."""
+    if name == "register_agent":
+        return await handle_register_agent(arguments)
+    elif name == "send_sanskrit_message":
+        return await handle_send_message(arguments)
+    elif name == "broadcast_sanskrit_message":
+        return await handle_broadcast_message(arguments)
+    elif name == "receive_messages":
+        return await handle_receive_messages(arguments)
+    elif name == "translate_sanskrit":
+        return await handle_translate(arguments)
+    elif name == "translate_sanskrit_batch":
+        return await handle_translate_batch(arguments)
+    elif name == "get_agent_status":
+        return await handle_get_status(arguments)
+    elif name == "analyze_conversation":
+        return await handle_analyze_conversation(arguments)
+    elif name == "query_vedic_knowledge":
+        return await handle_query_vedic_knowledge(arguments)
+    elif name == "transliterate_sanskrit":
+        return await handle_transliterate(arguments)
+    elif name == "validate_grammar":
+        return await handle_validate_grammar(arguments)
+    elif name == "find_agents":
+        return await handle_find_agents(arguments)
+    elif name == "analyze_meter":
+        return await handle_analyze_meter(arguments)
+    return None
 
 
 async def handle_register_agent(args: dict[str, Any]) -> list[TextContent]:
@@ -202,6 +553,11 @@ async def handle_register_agent(args: dict[str, Any]) -> list[TextContent]:
         can_read=sanskrit_caps_data.get("canRead", True),
         can_write=sanskrit_caps_data.get("canWrite", True),
         formality=Formality(sanskrit_caps_data.get("formality", "moderate")),
+        comprehension_level=(
+            ComprehensionLevel(sanskrit_caps_data["comprehensionLevel"])
+            if sanskrit_caps_data.get("comprehensionLevel")
+            else None
+        ),
     )
 
     agent = Agent(
@@ -234,44 +590,162 @@ async def handle_send_message(args: dict[str, Any]) -> list[TextContent]:
     validation_result = await sanskrit_validator.validate_text(content)
 
     # Record message
-    agent_registry.record_message(from_agent, to_agent)
+    session_id = agent_registry.record_message(from_agent, to_agent, args.get("sessionId"))
+    message = build_message(content, args, validation_result)
+    entry = communication_log.record(
+        from_agent, to_agent, message, session_id, success=validation_result.is_valid
+    )
+    if entry.response_time is not None or not validation_result.is_valid:
+        agent_registry.record_response(
+            from_agent, entry.response_time, error=not validation_result.is_valid
+        )
+
+    # Deliver to the receiver's mailbox
+    if agent_registry.get_agent(to_agent) is None:
+        delivery = f"⚠️ {to_agent} is not registered; message logged but not delivered"
+    elif await mailboxes.deliver(to_agent, entry):
+        delivery = f"📬 Delivered ({mailboxes.pending(to_agent)} waiting for {to_agent})"
+    else:
+        delivery = f"⚠️ {to_agent}'s mailbox is full; message not delivered"
+
+    return [
+        TextContent(
+            type="text",
+            text=f"📨 Message sent from {from_agent} to {to_agent}\n\n"
+            f"Session: {session_id}\n"
+            f"Content: {content}\n"
+            f"{delivery}\n\n"
+            f"{format_validation(validation_result)}",
+        )
+    ]
 
-    grammar_info = ""
-    if validation_result.grammar_patterns:
-        gp = validation_result.grammar_patterns
-        grammar_info = f"\n\n📊 Grammar patterns detected:\n"
-        grammar_info += f"  • Sandhi: {gp.sandhi}\n"
-        grammar_info += f"  • Samāsa: {gp.samasa}\n"
-        grammar_info += f"  • Vibhakti: {gp.vibhakti}\n"
-        grammar_info += f"  • Dhātu: {gp.dhatu}"
 
+def build_message(
+    content: str, args: dict[str, Any], validation_result: ValidationResult
+) -> SanskritMessage:
+    """Wrap validated content and its tool arguments in a SanskritMessage."""
+    return SanskritMessage(
+        id=str(uuid.uuid4()),
+        content=content,
+        timestamp=datetime.now(),
+        language=message_language(content),
+        metadata=MessageMetadata(
+            formality=Formality(args.get("formality", "moderate")),
+            context=args.get("context"),
+            validation_result=validation_result,
+        ),
+    )
+
+
+def format_validation(validation_result: ValidationResult) -> str:
+    """Describe a message's validation status and grammar patterns."""
     status = "✅ Valid" if validation_result.is_valid else "⚠️ Has issues"
     confidence = f"{validation_result.confidence * 100:.1f}%"
+    text = f"Validation: {status} (Confidence: {confidence})"
+    if validation_result.grammar_patterns:
+        gp = validation_result.grammar_patterns
+        text += "\n\n📊 Grammar patterns detected:\n"
+        text += f"  • Sandhi: {gp.sandhi}\n"
+        text += f"  • Samāsa: {gp.samasa}\n"
+        text += f"  • Vibhakti: {gp.vibhakti}\n"
+        text += f"  • Dhātu: {gp.dhatu}"
+    return text
+
+
+async def handle_broadcast_message(args: dict[str, Any]) -> list[TextContent]:
+    """Send a message to every active agent in a capability group."""
+    from_agent = args["fromAgent"]
+    content = args["content"]
+    validation_result = await sanskrit_validator.validate_text(content)
 
+    group = agent_registry.find_agents(
+        capabilities=args.get("capabilities"),
+        any_capabilities=args.get("anyCapabilities"),
+        comprehension_level=args.get("comprehensionLevel"),
+        limit=sys.maxsize,
+    )
+    recipients = [agent.id for agent in group.agents if agent.id != from_agent]
+
+    session_id = agent_registry.record_broadcast(from_agent, recipients, args.get("sessionId"))
+    message = build_message(content, args, validation_result)
+    entry = communication_log.record(
+        from_agent, "*", message, session_id, success=validation_result.is_valid, broadcast=True
+    )
+    if not validation_result.is_valid:
+        agent_registry.record_response(from_agent, None, error=True)
+    delivered = await mailboxes.broadcast(recipients, entry)
+
+    undelivered = len(recipients) - delivered
     return [
         TextContent(
             type="text",
-            text=f"📨 Message sent from {from_agent} to {to_agent}\n\n"
-            f"Content: {content}\n\n"
-            f"Validation: {status} (Confidence: {confidence})"
-            f"{grammar_info}",
+            text=f"📣 Broadcast from {from_agent} to {len(recipients)} agents\n\n"
+            f"Session: {session_id}\n"
+            f"Content: {content}\n"
+            f"📬 Delivered: {delivered}"
+            f"{f' ({undelivered} mailboxes full)' if undelivered else ''}\n\n"
+            f"{format_validation(validation_result)}",
         )
     ]
 
 
+async def handle_receive_messages(args: dict[str, Any]) -> list[TextContent]:
+    """Take messages from an agent's mailbox, long-polling if asked."""
+    agent_id = args["agentId"]
+    if not agent_registry.mark_seen(agent_id):
+        return [TextContent(type="text", text=f"Agent not found: {agent_id}")]
+
+    messages = await mailboxes.receive(
+        agent_id,
+        max_messages=max(1, args.get("maxMessages", 10)),
+        timeout=args.get("waitSeconds", 0),
+    )
+    if not messages:
+        return [TextContent(type="text", text=f"📭 No messages for {agent_id}")]
+
+    pending = mailboxes.pending(agent_id)
+    response = f"📬 {len(messages)} messages for {agent_id} ({pending} still waiting)\n"
+    for entry in messages:
+        kind = f" [{entry.communication_type}]" if entry.communication_type != "direct" else ""
+        response += (
+            f"\n• From {entry.from_agent}{kind} "
+            f"at {entry.timestamp.isoformat(timespec='seconds')}\n"
+            f"  Session: {entry.session_id}\n"
+            f"  {entry.message.content}\n"
+        )
+        if entry.translated_message:
+            response += f"  Translation: {entry.translated_message}\n"
+    return [TextContent(type="text", text=response)]
+
+
+def message_language(text: str) -> Language:
+    """Classify message content as Sanskrit (Devanagari), English or mixed."""
+    has_devanagari = any("\u0900" <= char <= "\u097f" for char in text)
+    has_latin = any(char.isascii() and char.isalpha() for char in text)
+    if has_devanagari and has_latin:
+        return Language.MIXED
+    return Language.SANSKRIT if has_devanagari else Language.ENGLISH
+
+
 async def handle_translate(args: dict[str, Any]) -> list[TextContent]:
     """Translate Sanskrit text."""
     text = args["text"]
     direction = args["direction"]
 
-    # Use Gemini for translation
-    if gemini_client.model:
-        result = await gemini_client.translate_text(
-            text, 
-            direction, 
-            include_transliteration=args.get("includeTransliteration", False),
-            cultural_context=args.get("culturalContext", False)
-        )
+    # Use Gemini for translation, or local resources if it is down or slow
+    if gemini_client.backend:
+        try:
+            result = await gemini_client.translate_text(
+                text,
+                direction,
+                include_transliteration=args.get("includeTransliteration", False),
+                cultural_context=args.get("culturalContext", False),
+                on_chunk=progress_reporter(),
+                budget=latency_budgets["translate_sanskrit"],
+            )
+        except GeminiUnavailable as e:
+            cached = await gemini_client.cached_translation(text, direction)
+            result = await local_translation(text, direction, vedic_corpus, str(e), cached=cached)
     else:
         # Fallback if API key not set
         if direction == "sanskrit-to-english":
@@ -282,6 +756,213 @@ async def handle_translate(args: dict[str, Any]) -> list[TextContent]:
     return [TextContent(type="text", text=result)]
 
 
+def progress_reporter() -> Optional[ChunkCallback]:
+    """
+    Forward streamed model output to the client as progress notifications.
+
+    Each notification carries the new text as its message and the
+    characters received so far as its progress.
+
+    Returns:
+        A chunk callback, or None if the current request has no progress token
+    """
+    try:
+        context = app.request_context
+    except LookupError:
+        return None
+    token = context.meta.progressToken if context.meta else None
+    if token is None:
+        return None
+    received = 0
+
+    async def report(chunk: str) -> None:
+        nonlocal received
+        received += len(chunk)
+        await context.session.send_progress_notification(
+            token, received, message=chunk, related_request_id=str(context.request_id)
+        )
+
+    return report
+
+
+async def handle_translate_batch(args: dict[str, Any]) -> list[TextContent]:
+    """Translate many texts in batched model calls."""
+    texts = args["texts"]
+    direction = args["direction"]
+
+    if gemini_client.backend:
+        results = await gemini_client.translate_many(
+            texts,
+            direction,
+            include_transliteration=args.get("includeTransliteration", False),
+            cultural_context=args.get("culturalContext", False),
+            budget=latency_budgets["translate_sanskrit_batch"],
+        )
+        reason = "circuit open or over the latency budget"
+        for i, (text, result) in enumerate(zip(texts, results)):
+            if result is None:
+                cached = await gemini_client.cached_translation(text, direction)
+                results[i] = await local_translation(
+                    text, direction, vedic_corpus, reason, cached=cached
+                )
+    else:
+        language = "English" if direction == "sanskrit-to-english" else "Sanskrit"
+        results = [f"{language} translation of: {text}\n(Gemini API key not set)" for text in texts]
+
+    response = f"🔤 {len(texts)} translations ({direction})\n"
+    for n, (text, result) in enumerate(zip(texts, results), 1):
+        response += f"\n{n}. {text}\n{result}\n"
+    return [TextContent(type="text", text=response)]
+
+
+async def handle_validate_grammar(args: dict[str, Any]) -> list[TextContent]:
+    """Validate grammar with the local rule engine."""
+    text = args["text"]
+    mode = args.get("mode", "morphology")
+    try:
+        scheme = source_scheme(text, args.get("scheme"))
+    except ValueError as e:
+        return scheme_question(e)
+
+    if mode == "sandhi":
+        return await handle_sandhi_split(text, scheme)
+    return await handle_morphology(text, scheme)
+
+
+def scheme_question(error: ValueError) -> list[TextContent]:
+    """Ask for the scheme of a text that could not be detected."""
+    return [TextContent(type="text", text=f"❓ {error}")]
+
+
+async def handle_morphology(text: str, scheme: str) -> list[TextContent]:
+    """Analyze each word with the finite-state morphological analyzer."""
+    words = [text[start:end] for start, end in word_spans(text)]
+    with grammar_analyzers.latency.timed(GrammarAnalyzers.MORPHOLOGY):
+        analyses = grammar_analyzers.morphology.analyze_many(words, scheme)
+
+    response = f"🔬 Morphological Analysis for '{text}':\n"
+    for word, word_analyses in zip(words, analyses):
+        response += f"\n• {word}"
+        if scheme == DEVANAGARI:
+            response += f" ({transliterate_many([word], IAST, DEVANAGARI)[0]})"
+        response += "\n"
+        if not word_analyses:
+            response += "   - not recognised\n"
+        for analysis in word_analyses:
+            response += f"   - {format_analysis(analysis)}\n"
+
+    return [TextContent(type="text", text=response)]
+
+
+def format_analysis(analysis: MorphAnalysis) -> str:
+    """Describe one morphological analysis in a single line."""
+    stem = analysis.stem + (f" (√{analysis.root})" if analysis.root else "")
+    if analysis.category == "verb":
+        details = f"{analysis.lakara} {analysis.pada}, {analysis.person} person {analysis.number}"
+    elif analysis.category == "indeclinable":
+        details = "avyaya"
+    else:
+        gender = f"{analysis.gender}, " if analysis.gender else ""
+        details = f"{gender}{analysis.case} {analysis.number}"
+    guess = " (guessed from ending)" if analysis.guessed else ""
+    return f"{stem}: {analysis.category}, {details}{guess}"
+
+
+async def handle_sandhi_split(text: str, scheme: str) -> list[TextContent]:
+    """Split sandhi with the local lexicon and reverse sandhi rules."""
+    with grammar_analyzers.latency.timed(GrammarAnalyzers.SANDHI):
+        splits = grammar_analyzers.sandhi.split(text, scheme)
+    if not splits:
+        return [
+            TextContent(
+                type="text",
+                text=f"🔗 Sandhi Analysis for '{text}':\n\n"
+                "No segmentation found: some words are not in the lexicon.",
+            )
+        ]
+
+    show_iast = scheme == DEVANAGARI
+    response = f"🔗 Sandhi Analysis for '{text}':\n\n"
+    for i, split in enumerate(splits, 1):
+        response += f"{i}. {' + '.join(split.words)} (score: {split.score:.1f})\n"
+        if show_iast:
+            iast = transliterate_many(split.words, IAST, DEVANAGARI)
+            response += f"   IAST: {' + '.join(iast)}\n"
+
+    return [TextContent(type="text", text=response)]
+
+
+async def handle_transliterate(args: dict[str, Any]) -> list[TextContent]:
+    """Transliterate one text or a batch of texts."""
+    texts = args["texts"] if "texts" in args else [args.get("text", "")]
+    try:
+        converted = transliterate_many(texts, args["target"], args.get("source"))
+    except ValueError as e:
+        return scheme_question(e)
+    if "texts" in args:
+        return [TextContent(type="text", text=json.dumps(converted, ensure_ascii=False))]
+    return [TextContent(type="text", text=converted[0])]
+
+
+async def handle_find_agents(args: dict[str, Any]) -> list[TextContent]:
+    """Find agents through the registry indexes."""
+    result = agent_registry.find_agents(
+        capabilities=args.get("capabilities"),
+        any_capabilities=args.get("anyCapabilities"),
+        formality=args.get("formality"),
+        comprehension_level=args.get("comprehensionLevel"),
+        can_read=args.get("canRead"),
+        can_write=args.get("canWrite"),
+        include_inactive=args.get("includeInactive", False),
+        offset=args.get("offset", 0),
+        limit=args.get("limit", DEFAULT_PAGE_SIZE),
+    )
+
+    shown = f"{result.offset + 1}-{result.offset + len(result.agents)}" if result.agents else "none"
+    response = f"🔎 Agents found: {result.total} (showing {shown})\n"
+    for agent in result.agents:
+        caps = agent.sanskrit_capabilities
+        level = f", {caps.comprehension_level.value}" if caps.comprehension_level else ""
+        status = "" if agent.is_active else " [inactive]"
+        response += (
+            f"\n• {agent.name} (ID: {agent.id}){status}\n"
+            f"  Capabilities: {', '.join(agent.capabilities) or 'none'}\n"
+            f"  Sanskrit: read={caps.can_read}, write={caps.can_write}, "
+            f"{caps.formality.value}{level}\n"
+        )
+
+    return [TextContent(type="text", text=response)]
+
+
+async def handle_analyze_meter(args: dict[str, Any]) -> list[TextContent]:
+    """Scan a verse, or list the corpus passages composed in a meter."""
+    if "text" not in args:
+        meter = args.get("meter", "")
+        passages = vedic_corpus.find_passages_by_meter(meter)
+        response = f"📜 Corpus passages in {meter}: {len(passages)}\n"
+        for passage in passages:
+            ref = passage.reference
+            location = f" {ref.chapter}.{ref.verse}" if ref.chapter and ref.verse else ""
+            response += f"\n• {ref.text}{location}\n  {passage.sanskrit}\n"
+        return [TextContent(type="text", text=response)]
+
+    text = args["text"]
+    try:
+        scheme = source_scheme(text, args.get("scheme"))
+    except ValueError as e:
+        return scheme_question(e)
+    verse = text if scheme == DEVANAGARI else transliterate(text, DEVANAGARI, scheme)
+    analysis = analyze_meter(verse)
+
+    response = f"📜 Metrical Analysis for '{text}':\n\n"
+    response += f"Meter: {analysis.meter or 'not recognised'}\n"
+    for i, (weights, count) in enumerate(zip(analysis.lines, analysis.syllables), 1):
+        response += f"  Line {i}: {weights} ({count} syllables)\n"
+    response += "\n(L = laghu, G = guru)"
+
+    return [TextContent(type="text", text=response)]
+
+
 async def handle_get_status(args: dict[str, Any]) -> list[TextContent]:
     """Get agent status."""
     agent_id = args.get("agentId")
@@ -292,6 +973,15 @@ async def handle_get_status(args: dict[str, Any]) -> list[TextContent]:
             return [TextContent(type="text", text=f"Agent not found: {agent_id}")]
 
         stats = agent.statistics
+        latency = agent_registry.get_agent_latency(agent_id)
+        replies = (
+            f"Replies: {latency.count}, p50 {latency.p50_ms / 1000:.2f}s, "
+            f"p90 {latency.p90_ms / 1000:.2f}s, p99 {latency.p99_ms / 1000:.2f}s\n"
+            if latency and latency.count
+            else ""
+        )
+        usage = gemini_client.usage.get_agent(agent_id)
+        model_usage = f"Model usage: {format_token_usage(usage)}\n" if usage else ""
         return [
             TextContent(
                 type="text",
@@ -300,64 +990,290 @@ async def handle_get_status(args: dict[str, Any]) -> list[TextContent]:
                 f"Active: {agent.is_active}\n"
                 f"Messages sent: {stats.messages_sent}\n"
                 f"Messages received: {stats.messages_received}\n"
+                f"Average response time: {stats.average_response_time:.2f}s\n"
+                f"{replies}"
+                f"{model_usage}"
+                f"Errors: {stats.error_count}\n"
+                f"Pending messages: {mailboxes.pending(agent.id)}\n"
                 f"Last active: {stats.last_active}\n"
                 f"Capabilities: {', '.join(agent.capabilities)}",
             )
         ]
     else:
         # Return registry statistics
-        stats = agent_registry.get_statistics()
+        registry_stats = agent_registry.get_statistics()
+        shared = (
+            f"\nShared with other processes through: {shared_registry}" if shared_registry else ""
+        )
         return [
             TextContent(
                 type="text",
                 text=f"📊 Registry Statistics\n\n"
-                f"Total agents: {stats.total_agents}\n"
-                f"Active agents: {stats.active_agents}\n"
-                f"Sanskrit-capable: {stats.sanskrit_capable_agents}\n"
-                f"Total messages: {stats.total_messages}",
+                f"Total agents: {registry_stats.total_agents}\n"
+                f"Active agents: {registry_stats.active_agents}\n"
+                f"Sanskrit-capable: {registry_stats.sanskrit_capable_agents}\n"
+                f"Total messages: {registry_stats.total_messages}\n"
+                f"Active sessions: {registry_stats.active_sessions}\n"
+                f"Evicted idle agents: {registry_stats.evicted_agents}"
+                f"{shared}"
+                f"{format_mailbox_statistics()}"
+                f"{format_analyzer_statistics()}"
+                f"{format_cache_statistics()}"
+                f"{format_memory_statistics()}"
+                f"{format_latency_statistics('⏱️ Tool Latency', tool_latency.get_statistics())}"
+                f"{format_gemini_statistics()}"
+                f"{format_token_statistics()}",
             )
         ]
 
 
+def format_mailbox_statistics() -> str:
+    """Describe mailbox delivery counters."""
+    stats = mailboxes.get_statistics()
+    return (
+        f"\n\n📬 Mailboxes ({stats.policy.value}, {stats.capacity} messages each)"
+        f"\n  • Mailboxes: {stats.mailboxes}, queued: {stats.queued}"
+        f"\n  • Delivered: {stats.delivered}, received: {stats.received}"
+        f"\n  • Dropped: {stats.dropped}, rejected: {stats.rejected}"
+    )
+
+
+def format_cache_statistics() -> str:
+    """Describe translation cache hits and size."""
+    stats = translation_cache.get_statistics()
+    text = (
+        f"\n\n🗄️ Translation Cache"
+        f"\n  • Hit rate: {stats.hit_rate * 100:.1f}% "
+        f"({stats.memory_hits} memory, {stats.disk_hits} disk, {stats.misses} misses)"
+        f"\n  • Entries: {stats.memory_entries} in memory"
+    )
+    if translation_cache.path:
+        text += (
+            f", {stats.disk_entries} on disk "
+            f"({stats.disk_bytes / 2**20:.1f} MiB, {stats.evictions} evicted)"
+        )
+    return text
+
+
+def format_memory_statistics() -> str:
+    """Describe translation memory size, lookups and how matches were used."""
+    stats = translation_memory.get_statistics()
+    return (
+        f"\n\n📚 Translation Memory"
+        f"\n  • Segments: {stats.segments} ({stats.learned} learned from translations)"
+        f"\n  • Lookups: {stats.exact_hits} exact, {stats.fuzzy_hits} fuzzy, {stats.misses} misses"
+        f"\n  • Answered from memory: {gemini_client.memory_answers}, "
+        f"sent to the model with hints: {gemini_client.memory_hints}"
+    )
+
+
+def format_analyzer_statistics() -> str:
+    """Describe grammar analyzer load times and call latency."""
+    text = "\n\n🔬 Grammar Analyzers"
+    for stats in grammar_analyzers.get_statistics():
+        load = f"loaded in {stats.load_time_ms:.1f} ms" if stats.loaded else "not loaded"
+        latency = stats.latency
+        text += (
+            f"\n  • {stats.name}: {load}, {latency.count} calls, {latency.errors} errors, "
+            f"p50 {latency.p50_ms:.2f} ms, p99 {latency.p99_ms:.2f} ms, "
+            f"max {latency.max_ms:.2f} ms"
+        )
+    return text
+
+
+def format_gemini_statistics() -> str:
+    """Describe Gemini request counts, coalescing, admission and latency."""
+    flights = gemini_client.flights
+    if not flights.calls:
+        return ""
+    limits = gemini_client.limiter.get_statistics()
+    circuit = gemini_client.breaker.get_statistics()
+    first_token = gemini_client.first_token.get_statistics()
+    return (
+        f"\n\n🤖 Gemini Requests"
+        f"\n  • Sent: {flights.calls}, coalesced into in-flight requests: {flights.coalesced}"
+        f"\n  • In flight: {limits.in_flight}/{limits.max_in_flight}, queued: {limits.queued}"
+        f"\n  • Queue wait: mean {limits.mean_wait_ms:.1f} ms, p99 {limits.p99_wait_ms:.1f} ms"
+        f"\n  • Rate-limited: {limits.throttled}, retries: {limits.retries}, "
+        f"failed: {limits.failed}"
+        f"\n  • Circuit: {circuit.state.value} (opened {circuit.times_opened} times, "
+        f"{circuit.rejected} calls refused), over latency budget: {gemini_client.budget_exceeded}"
+        f"\n  • Vedic AI insights: {insight_outcomes['used']} used, "
+        f"{insight_outcomes['unavailable']} unavailable; "
+        f"{insight_outcomes['speculated']} sent speculatively, "
+        f"{insight_outcomes['cancelled']} cancelled, "
+        f"{insight_outcomes['discarded']} finished unused"
+        f"{format_latency_statistics('⏱️ Gemini Latency', gemini_client.latency.get_statistics())}"
+        f"{format_latency_statistics('⚡ Gemini Time to First Token', first_token)}"
+    )
+
+
+def format_token_usage(usage: TokenUsage) -> str:
+    """Describe one line of token counts and cost."""
+    return (
+        f"{usage.calls} calls, {usage.prompt_tokens:,} prompt tokens "
+        f"(estimated {usage.estimated_prompt_tokens:,}), {usage.output_tokens:,} output tokens, "
+        f"${usage.cost_usd:.6f}"
+    )
+
+
+def format_token_statistics() -> str:
+    """Describe model token usage and cost, in total and per tool."""
+    total = gemini_client.usage.get_total()
+    if not total.calls:
+        return ""
+    text = f"\n\n🪙 Model Tokens\n  • Total: {format_token_usage(total)}"
+    for usage in gemini_client.usage.get_tools():
+        text += f"\n  • {usage.name}: {format_token_usage(usage)}"
+    return text
+
+
+def format_latency_statistics(title: str, statistics: list[LatencyStatistics]) -> str:
+    """Describe call counts, errors and latency percentiles."""
+    if not statistics:
+        return ""
+    text = f"\n\n{title}"
+    for stats in statistics:
+        text += (
+            f"\n  • {stats.name}: {stats.count} calls, {stats.errors} errors, "
+            f"p50 {stats.p50_ms:.2f} ms, p90 {stats.p90_ms:.2f} ms, "
+            f"p99 {stats.p99_ms:.2f} ms, max {stats.max_ms:.2f} ms"
+        )
+    return text
+
+
 async def handle_analyze_conversation(args: dict[str, Any]) -> list[TextContent]:
     """Analyze conversation patterns."""
     session_id = args["sessionId"]
+    summary = communication_log.get_summary(session_id)
+    if summary is None:
+        return [TextContent(type="text", text=f"No messages recorded for session: {session_id}")]
 
-    return [
-        TextContent(
-            type="text",
-            text=f"📈 Conversation Analysis for session: {session_id}\n\n"
-            "(Analysis placeholder - would show message flow, patterns, etc.)",
+    first, last = summary.first_message, summary.last_message
+    duration = (last - first).total_seconds() if first and last else 0.0
+    response = f"📈 Conversation Analysis for session: {session_id}\n\n"
+    response += (
+        f"Messages: {summary.message_count} ({summary.failed_count} with validation issues)\n"
+    )
+    response += f"Participants: {', '.join(summary.participants)}\n"
+    response += f"Duration: {duration:.1f}s\n"
+
+    response += "\n🔀 Message flow:\n"
+    for (sender, receiver), count in sorted(summary.flow.items(), key=lambda item: -item[1]):
+        response += f"  • {sender} → {receiver}: {count}\n"
+
+    response += "\n⏱️ Response times:\n"
+    if summary.response_count:
+        response += (
+            f"  • Replies: {summary.response_count}, mean {summary.mean_response_time:.2f}s, "
+            f"max {summary.max_response_time:.2f}s\n"
         )
-    ]
+    else:
+        response += "  • No replies yet\n"
+
+    response += "\n📊 Grammar patterns:\n"
+    response += f"  • Sandhi: {summary.sandhi}\n"
+    response += f"  • Samāsa: {summary.samasa}\n"
+    response += f"  • Vibhakti: {summary.vibhakti}\n"
+    response += f"  • Dhātu: {summary.dhatu}\n"
+
+    recent = communication_log.session_entries(session_id, limit=5)
+    if recent:
+        response += "\n💬 Recent messages:\n"
+        for entry in recent:
+            response += (
+                f"  • [{entry.timestamp:%H:%M:%S}] {entry.from_agent} → {entry.to_agent}: "
+                f"{entry.message.content}\n"
+            )
+
+    return [TextContent(type="text", text=response)]
 
 
 async def handle_query_vedic_knowledge(args: dict[str, Any]) -> list[TextContent]:
-    """Query Vedic knowledge base."""
+    """
+    Query Vedic knowledge base.
+
+    When a cheap estimate predicts a low-confidence corpus answer, the AI
+    insight request is sent first and travels while the corpus is
+    searched in a worker thread; it is cancelled if the corpus answer
+    turns out confident.
+    Otherwise it is sent after the search, with the corpus answer as
+    context, only if needed. Either way the tool's latency budget, counted
+    from the start, bounds the wait before the corpus-only answer is returned.
+    """
     query = args["query"]
+    deadline = time.monotonic() + latency_budgets["query_vedic_knowledge"]
+    searched = asyncio.Event()
+    report = progress_reporter()
 
-    result = await vedic_corpus.query_vedic_knowledge(query)
+    async def stream_insight(chunk: str) -> None:
+        # Hold back a speculative insight until the corpus answer shows it is wanted
+        await searched.wait()
+        if report is not None:
+            await report(chunk)
+
+    def request_insight(prompt: str) -> asyncio.Task:
+        return asyncio.ensure_future(
+            gemini_client.generate_content(
+                prompt,
+                on_chunk=stream_insight if report else None,
+                budget=max(0.0, deadline - time.monotonic()),
+                cancellable=True,
+            )
+        )
+
+    insight = None
+    if gemini_client.backend and vedic_corpus.estimate_confidence(query) < INSIGHT_CONFIDENCE:
+        insight = request_insight(
+            f"Provide a brief scholarly insight on this Vedic topic: {query}."
+        )
+        insight_outcomes["speculated"] += 1
+        # Search in a worker thread so the event loop sends the request meanwhile
+        result = await asyncio.to_thread(vedic_corpus.search, query, args.get("meter"))
+    else:
+        result = await vedic_corpus.query_vedic_knowledge(query, meter=args.get("meter"))
+    searched.set()
 
-    response = f"🕉️ Vedic Knowledge Query Results\n\n"
+    response = "🕉️ Vedic Knowledge Query Results\n\n"
     response += f"Query: {query}\n\n"
     response += f"{result.synthesized_answer}\n\n"
-    response += f"📊 Metrics:\n"
+    response += "📊 Metrics:\n"
     response += f"  • Confidence: {result.confidence * 100:.1f}%\n"
     response += f"  • Hallucination risk: {result.hallucination_risk}\n"
     response += f"  • Sources found: {len(result.passages)}\n"
 
     if result.warnings:
-        response += f"\n⚠️ Warnings:\n"
+        response += "\n⚠️ Warnings:\n"
         for warning in result.warnings:
             response += f"  • {warning}\n"
 
     # Enhance with Gemini if available
-    if gemini_client.model and result.confidence < 0.8:
-        gemini_insight = await gemini_client.generate_content(
-            f"Provide a brief scholarly insight on this Vedic topic: {query}. "
-            f"Context from corpus: {result.synthesized_answer}"
-        )
-        response += f"\n🤖 AI Insight:\n{gemini_insight}\n"
+    if result.confidence >= INSIGHT_CONFIDENCE:
+        if insight is not None:
+            if insight.cancel():
+                insight_outcomes["cancelled"] += 1
+            else:
+                # Already finished: the answer goes unused; mark any error retrieved
+                insight_outcomes["discarded"] += 1
+                if not insight.cancelled():
+                    insight.exception()
+    elif gemini_client.backend:
+        if insight is None:
+            passages = vedic_corpus.prompt_context(query, result.passages, insight_context_tokens)
+            insight = request_insight(
+                f"Provide a brief scholarly insight on this Vedic topic: {query}. "
+                f"Context from corpus:\n{passages}"
+            )
+        try:
+            gemini_insight = await insight
+            insight_outcomes["used"] += 1
+            response += f"\n🤖 AI Insight:\n{gemini_insight}\n"
+        except GeminiUnavailable as e:
+            insight_outcomes["unavailable"] += 1
+            response += (
+                f"\n⚠️ Degraded answer: AI insight skipped, Gemini is unavailable ({e}). "
+                f"Corpus sources only.\n"
+            )
 
     return [TextContent(type="text", text=response)]
 
@@ -399,20 +1315,7 @@ async def read_resource(uri: str) -> str:
         stats = vedic_corpus.get_corpus_statistics()
         return f"Vedic Corpus Statistics:\n{stats}"
     elif uri == "sanskrit://vocabulary":
-        import json
-        vocab = [
-            {"word": "Dharma", "meaning": "Duty, righteousness, moral order", "grammar": "Noun, Masculine, Nominative, Singular", "context": "Central concept in Indian philosophy"},
-            {"word": "Karma", "meaning": "Action, deed, causality", "grammar": "Noun, Neuter, Nominative, Singular", "context": "Law of cause and effect"},
-            {"word": "Yoga", "meaning": "Union, discipline", "grammar": "Noun, Masculine, Nominative, Singular", "context": "Path to liberation"},
-            {"word": "Atman", "meaning": "Self, Soul", "grammar": "Noun, Masculine, Nominative, Singular", "context": "The true self"},
-            {"word": "Brahman", "meaning": "The Ultimate Reality", "grammar": "Noun, Neuter, Nominative, Singular", "context": "The absolute"},
-            {"word": "Satya", "meaning": "Truth", "grammar": "Noun, Neuter, Nominative, Singular", "context": "Truthfulness"},
-            {"word": "Ahimsa", "meaning": "Non-violence", "grammar": "Noun, Feminine, Nominative, Singular", "context": "Fundamental virtue"},
-            {"word": "Moksha", "meaning": "Liberation", "grammar": "Noun, Masculine, Nominative, Singular", "context": "Freedom from samsara"},
-            {"word": "Guru", "meaning": "Teacher, dispeller of darkness", "grammar": "Noun, Masculine, Nominative, Singular", "context": "Spiritual guide"},
-            {"word": "Shanti", "meaning": "Peace", "grammar": "Noun, Feminine, Nominative, Singular", "context": "Inner and outer peace"}
-        ]
-        return json.dumps(vocab)
+        return json.dumps(VOCABULARY)
     else:
         return f"Unknown resource: {uri}"
 
@@ -421,13 +1324,35 @@ async def main() -> None:
     """Run the MCP server."""
     logger.info("🕉️ Sanskrit Agent MCP Server starting...")
     logger.info(f"Server Info: {app.name} v1.0.0")
-    logger.info("✅ Available Tools: register_agent, send_sanskrit_message, translate_sanskrit, "
-                "get_agent_status, analyze_conversation, query_vedic_knowledge")
+    logger.info(
+        "✅ Available Tools: register_agent, send_sanskrit_message, "
+        "broadcast_sanskrit_message, receive_messages, translate_sanskrit, "
+        "translate_sanskrit_batch, get_agent_status, analyze_conversation, "
+        "query_vedic_knowledge, validate_grammar, transliterate_sanskrit, "
+        "analyze_meter, find_agents"
+    )
     logger.info("📚 Available Resources: sanskrit://agents, sanskrit://corpus, sanskrit://vocabulary")
+
+    load_times = grammar_analyzers.preload()
+    for name, seconds in load_times.items():
+        logger.info(f"🔬 Grammar analyzer '{name}' loaded in {seconds * 1000:.1f} ms")
     logger.info("✅ Sanskrit Agent MCP Server running and ready for connections...")
 
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    if registry_db:
+        restored = len(agent_registry.get_all_agents())
+        logger.info(f"💾 Agent registry persisted to {registry_db} ({restored} agents restored)")
+    if shared_registry:
+        logger.info(f"🔗 Agent registry shared with other processes through '{shared_registry}'")
+    if llm_backend:
+        logger.info("🧪 Using the fake LLM backend: model calls are simulated locally")
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        agent_registry.close()
+        communication_log.close()
+        gemini_client.close()
 
 
 if __name__ == "__main__":
@@ -1,27 +1,362 @@
-"""Agent registry for managing Sanskrit-capable agents."""
+"""
+Agent registry for managing Sanskrit-capable agents.
 
+The registry is safe to share between asyncio tasks and thread-pool
+workers. Membership, activation and the registry-wide counters are
+guarded by one registry lock; per-agent statistics are guarded by a fixed set of striped
+locks chosen by agent ID, so updates to different agents rarely contend.
+No lock is held across an await or while taking another lock.
+
+With a RegistryStore attached, agents are loaded from it at start-up and
+every change is handed to it for write-behind persistence.
+
+Registry statistics are kept as running counters, updated by every
+registration and (de)activation, so reading them is constant time.
+
+For discovery, every agent holds a slot number and each searchable
+attribute value (a capability, a formality, a comprehension level, read
+and write ability, being active) maps to a bitset of slots stored as an
+int. Queries combine bitsets with & and |, and pages are read off the set
+bits in slot order.
+
+With an idle TTL configured, each agent has a timer in a hierarchical
+timer wheel. When it fires the agent's last_seen is checked: agents seen
+since are rescheduled, idle ones are evicted (and archived to the store
+if there is one). Timers are advanced lazily by registry reads, so the
+message path never touches the wheel.
+
+Each agent also has a latency histogram of its reply times, which keeps
+AgentStatistics.average_response_time current and provides percentiles.
+
+With a SharedRegistryTable attached, several processes share one agent
+table: statistics and counters are read from and written to shared
+memory, while each process keeps its own copy of agent profiles and the
+discovery indexes, rebuilt whenever the table's generation moves.
+Sessions, latency percentiles and eviction counts stay per process.
+"""
+
+import itertools
+import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterable, Optional
+
+from .latency import LatencyHistogram
+from .registry_store import RegistryStore
+from .shared_registry import SharedRegistryBusy, SharedRegistryTable
+from .timer_wheel import TimerWheel
+from .types import (
+    Agent,
+    AgentQueryResult,
+    ComprehensionLevel,
+    Formality,
+    LatencyStatistics,
+    RegistryStatistics,
+)
+
+# Number of striped locks guarding per-agent statistics
+LOCK_STRIPES = 64
+# Seconds without a message after which a session stops counting as active
+SESSION_TIMEOUT = 1800.0
+
+
+def _is_sanskrit_capable(agent: Agent) -> bool:
+    return agent.sanskrit_capabilities.can_read or agent.sanskrit_capabilities.can_write
+
+
+# Agents per find_agents page unless a limit is given
+DEFAULT_PAGE_SIZE = 20
+# Seconds per timer wheel tick, the resolution of idle eviction
+EVICTION_TICK = 1.0
+
+_SET_BIT = re.compile("1")
 
-from .types import Agent, RegistryStatistics
+
+def _index_keys(agent: Agent) -> list[tuple[str, str]]:
+    """Searchable attribute values of an agent, as bitset keys."""
+    caps = agent.sanskrit_capabilities
+    keys = [("capability", capability.lower()) for capability in agent.capabilities]
+    keys.append(("formality", caps.formality.value))
+    if caps.comprehension_level:
+        keys.append(("level", caps.comprehension_level.value))
+    if caps.can_read:
+        keys.append(("can_read", ""))
+    if caps.can_write:
+        keys.append(("can_write", ""))
+    if agent.is_active:
+        keys.append(("active", ""))
+    return keys
+
+
+def _profile_key(agent: Agent) -> tuple:
+    """Fields that, when changed in the shared table, require re-indexing an agent."""
+    return (
+        agent.name,
+        agent.description,
+        agent.capabilities,
+        agent.sanskrit_capabilities,
+        agent.is_active,
+    )
+
+
+def session_key(from_agent_id: str, to_agent_id: str) -> str:
+    """Default session ID for a conversation between two agents."""
+    return "+".join(sorted((from_agent_id, to_agent_id)))
 
 
 class AgentRegistry:
     """Registry for managing Sanskrit-capable agents."""
 
-    def __init__(self) -> None:
-        """Initialize empty agent registry."""
+    def __init__(
+        self,
+        store: Optional[RegistryStore] = None,
+        lock_stripes: int = LOCK_STRIPES,
+        session_timeout: float = SESSION_TIMEOUT,
+        idle_ttl: Optional[float] = None,
+        archive_evicted: bool = True,
+        on_evict: Optional[Callable[[Agent], None]] = None,
+        shared: Optional[SharedRegistryTable] = None,
+    ) -> None:
+        """
+        Initialize agent registry, restoring agents from the store if given.
+
+        Args:
+            store: Optional persistent store for agents and statistics
+            lock_stripes: Number of locks guarding per-agent statistics
+            session_timeout: Idle seconds before a session is no longer active
+            idle_ttl: Seconds since last_seen after which an agent is
+                evicted; agents are kept forever when omitted
+            archive_evicted: Keep evicted agents in the store (flagged as
+                archived) rather than deleting them
+            on_evict: Called with each evicted agent, outside the lock
+            shared: Shared-memory table holding the agents and counters of
+                every process attached to it
+        """
         self._agents: dict[str, Agent] = {}
         self._total_messages = 0
+        self._active_count = 0
+        self._sanskrit_capable_count = 0
+        # Session ID -> time of its last message, least recently used first
+        self._sessions: OrderedDict[str, float] = OrderedDict()
+        self.session_timeout = session_timeout
+        self._lock = threading.Lock()
+        self._stripes = [threading.Lock() for _ in range(lock_stripes)]
+        # Agent ID -> reply latency histogram, guarded by the agent's stripe
+        self._latency: dict[str, LatencyHistogram] = {}
+
+        # Discovery indexes: agent slots and attribute bitsets over them
+        self._slots: dict[str, int] = {}
+        self._slot_agents: list[Optional[Agent]] = []
+        self._free_slots: list[int] = []
+        self._bitsets: dict[tuple[str, str], int] = {}
+        self._all_slots = 0
+
+        self.idle_ttl = idle_ttl
+        self.archive_evicted = archive_evicted
+        self.on_evict = on_evict
+        self._evicted_count = 0
+        self._wheel = TimerWheel(EVICTION_TICK, start=time.monotonic()) if idle_ttl else None
+
+        self._store = store
+        if store is not None:
+            agents, self._total_messages = store.load()
+            for agent in agents:
+                self._add(agent)
+
+        self._shared = shared
+        # Shared table generation the local agents and indexes reflect
+        self._generation = -1
+        if shared is not None:
+            if not shared.statistics()[0]:
+                # First process attached: publish what the store restored
+                for agent in self._agents.values():
+                    shared.put(agent)
+                shared.raise_total_messages(self._total_messages)
+            self._sync()
+
+    def _sync(self) -> None:
+        """Bring local agents and indexes up to date with the shared table."""
+        if self._shared is None:
+            return
+        try:
+            generation = self._shared.generation
+            if generation == self._generation:
+                return
+            changes = self._shared.changes(self._generation)
+            if changes is None:
+                # Too far behind for the change log: read every agent
+                agents = self._shared.agents()
+            else:
+                generation, agents, removed = changes
+        except SharedRegistryBusy:
+            # Serve the local copy this time; the next read catches up
+            self._shared.repair()
+            return
+        with self._lock:
+            if changes is None:
+                shared_ids = {agent.id for agent in agents}
+                removed = [agent_id for agent_id in self._agents if agent_id not in shared_ids]
+            for agent_id in removed:
+                gone = self._agents.get(agent_id)
+                if gone is not None:
+                    self._remove(gone)
+            for agent in agents:
+                local = self._agents.get(agent.id)
+                if local is not None and _profile_key(local) == _profile_key(agent):
+                    local.statistics, local.last_seen = agent.statistics, agent.last_seen
+                else:
+                    histogram = self._latency.get(agent.id)
+                    self._add(agent)
+                    if histogram is not None:
+                        self._latency[agent.id] = histogram
+            self._generation = generation
+
+    def _adopt(self, generation: Optional[int]) -> None:
+        """Record a shared change this process already applied locally; caller holds the lock."""
+        # Only if no other change came in between, else the next read catches up
+        if generation is not None and generation == self._generation + 1:
+            self._generation = generation
+
+    def _refresh(self, agent: Agent) -> bool:
+        """Re-read an agent's statistics from the shared table; False if it is gone there."""
+        if self._shared is None:
+            return True
+        try:
+            return self._shared.refresh(agent)
+        except SharedRegistryBusy:
+            # Keep the local statistics and let the lock holder fix the record
+            self._shared.repair()
+            return True
+
+    def _refreshed(self, *agent_ids: str) -> list[Agent]:
+        """Local agents with statistics re-read from the shared table."""
+        agents = [self._agents.get(agent_id) for agent_id in agent_ids]
+        return [agent for agent in agents if agent is not None and self._refresh(agent)]
+
+    def _add(self, agent: Agent) -> None:
+        """Add or replace an agent in the table, counters and indexes; caller holds the lock."""
+        previous = self._agents.get(agent.id)
+        if previous is not None:
+            self._count(previous, -1)
+            self._latency.pop(agent.id, None)
+            slot = self._slots[agent.id]
+            self._set_bits(slot, _index_keys(previous), False)
+        elif self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_agents)
+            self._slot_agents.append(None)
+
+        self._agents[agent.id] = agent
+        self._slots[agent.id] = slot
+        self._slot_agents[slot] = agent
+        self._all_slots |= 1 << slot
+        self._count(agent, 1)
+        self._set_bits(slot, _index_keys(agent), True)
+        if self._wheel is not None:
+            self._schedule_eviction(agent)
+
+    def _remove(self, agent: Agent) -> None:
+        """Take an agent out of the table, counters and indexes; caller holds the lock."""
+        slot = self._slots.pop(agent.id)
+        del self._agents[agent.id]
+        self._count(agent, -1)
+        self._set_bits(slot, _index_keys(agent), False)
+        self._all_slots &= ~(1 << slot)
+        self._slot_agents[slot] = None
+        self._free_slots.append(slot)
+        self._latency.pop(agent.id, None)
+        if self._wheel is not None:
+            self._wheel.cancel(agent.id)
+
+    def _schedule_eviction(self, agent: Agent) -> None:
+        """Set an agent's timer to fire when it will have been idle for the TTL."""
+        if self._wheel is None or self.idle_ttl is None:
+            return
+        idle = (datetime.now() - agent.last_seen).total_seconds()
+        self._wheel.schedule(agent.id, time.monotonic() + self.idle_ttl - idle)
+
+    def evict_idle_agents(self) -> list[Agent]:
+        """
+        Evict agents idle for longer than the TTL.
+
+        Only agents whose timers fired are examined, so this is cheap to
+        call often; registry reads call it automatically.
+
+        Returns:
+            The evicted agents
+        """
+        if self._wheel is None or self.idle_ttl is None:
+            return []
+        evicted = []
+        with self._lock:
+            for agent_id in self._wheel.advance(time.monotonic()):
+                agent = self._agents.get(str(agent_id))
+                if agent is None:
+                    continue
+                self._refresh(agent)  # may have been seen by another process
+                if (datetime.now() - agent.last_seen).total_seconds() < self.idle_ttl:
+                    self._schedule_eviction(agent)  # seen since the timer was set
+                else:
+                    self._remove(agent)
+                    evicted.append(agent)
+            self._evicted_count += len(evicted)
+
+        if self._shared is not None:
+            for agent in evicted:
+                self._shared.remove(agent.id)
+        if self._store is not None:
+            for agent in evicted:
+                if self.archive_evicted:
+                    self._store.archive(agent)
+                else:
+                    self._store.delete(agent.id)
+        if self.on_evict is not None:
+            for agent in evicted:
+                self.on_evict(agent)
+        return evicted
+
+    def _set_bits(self, slot: int, keys: Iterable[tuple[str, str]], value: bool) -> None:
+        """Set or clear one slot in several bitsets; caller holds the lock."""
+        bit = 1 << slot
+        for key in keys:
+            if value:
+                self._bitsets[key] = self._bitsets.get(key, 0) | bit
+            else:
+                remaining = self._bitsets.get(key, 0) & ~bit
+                if remaining:
+                    self._bitsets[key] = remaining
+                else:
+                    self._bitsets.pop(key, None)
+
+    def _count(self, agent: Agent, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) an agent from the counters; caller holds the lock."""
+        if agent.is_active:
+            self._active_count += sign
+        if _is_sanskrit_capable(agent):
+            self._sanskrit_capable_count += sign
+
+    def _stripe(self, agent_id: str) -> threading.Lock:
+        """Get the lock guarding an agent's statistics."""
+        return self._stripes[hash(agent_id) % len(self._stripes)]
 
     def register_agent(self, agent: Agent) -> None:
         """
-        Register a new agent.
+        Register a new agent, replacing any agent with the same ID.
 
         Args:
             agent: Agent to register
         """
-        self._agents[agent.id] = agent
+        self.evict_idle_agents()
+        self._sync()
+        generation = self._shared.put(agent) if self._shared is not None else None
+        with self._lock:
+            self._add(agent)
+            self._adopt(generation)
+        if self._store is not None:
+            self._store.mark_dirty(agent)
 
     def get_agent(self, agent_id: str) -> Optional[Agent]:
         """
@@ -33,7 +368,11 @@ class AgentRegistry:
         Returns:
             Agent if found, None otherwise
         """
-        return self._agents.get(agent_id)
+        if self._shared is None:
+            return self._agents.get(agent_id)
+        self._sync()
+        agents = self._refreshed(agent_id)
+        return agents[0] if agents else None
 
     def get_all_agents(self) -> list[Agent]:
         """
@@ -42,54 +381,303 @@ class AgentRegistry:
         Returns:
             List of all agents
         """
-        return list(self._agents.values())
+        self.evict_idle_agents()
+        self._sync()
+        with self._lock:
+            agents = list(self._agents.values())
+        if self._shared is not None:
+            agents = self._refreshed(*(agent.id for agent in agents))
+        return agents
 
-    def record_message(self, from_agent_id: str, to_agent_id: str) -> None:
+    def find_agents(
+        self,
+        capabilities: Optional[list[str]] = None,
+        any_capabilities: Optional[list[str]] = None,
+        formality: Optional[list[Formality]] = None,
+        comprehension_level: Optional[list[ComprehensionLevel]] = None,
+        can_read: Optional[bool] = None,
+        can_write: Optional[bool] = None,
+        include_inactive: bool = False,
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> AgentQueryResult:
+        """
+        Find agents by capability and Sanskrit profile.
+
+        Different filters are combined with AND; values within
+        any_capabilities, formality and comprehension_level with OR.
+
+        Args:
+            capabilities: Capabilities an agent must all have
+            any_capabilities: Capabilities an agent must have at least one of
+            formality: Accepted formality levels
+            comprehension_level: Accepted comprehension levels
+            can_read: Required Sanskrit reading ability
+            can_write: Required Sanskrit writing ability
+            include_inactive: Also return deactivated agents
+            offset: Matches to skip, in registration order
+            limit: Maximum agents to return
+
+        Returns:
+            AgentQueryResult with one page of agents and the total match count
+        """
+        self.evict_idle_agents()
+        self._sync()
+        with self._lock:
+            bitsets = self._bitsets
+            matches = self._all_slots if include_inactive else bitsets.get(("active", ""), 0)
+            for capability in capabilities or []:
+                matches &= bitsets.get(("capability", capability.lower()), 0)
+            if any_capabilities:
+                matches &= self._union(("capability", c.lower()) for c in any_capabilities)
+            if formality:
+                matches &= self._union(("formality", Formality(f).value) for f in formality)
+            if comprehension_level:
+                matches &= self._union(
+                    ("level", ComprehensionLevel(c).value) for c in comprehension_level
+                )
+            for key, required in (("can_read", can_read), ("can_write", can_write)):
+                if required is not None:
+                    bits = bitsets.get((key, ""), 0)
+                    matches &= bits if required else self._all_slots & ~bits
+
+            # Bit string with slot 0 first; pages come from the positions of its ones
+            bit_string = bin(matches)[:1:-1]
+            slots = itertools.islice(
+                (m.start() for m in _SET_BIT.finditer(bit_string)), offset, offset + limit
+            )
+            # Every set bit is an occupied slot
+            agents = [agent for slot in slots if (agent := self._slot_agents[slot]) is not None]
+
+        for agent in agents:
+            self._refresh(agent)
+        return AgentQueryResult(
+            agents=agents, total=matches.bit_count(), offset=offset, limit=limit
+        )
+
+    def _union(self, keys: Iterable[tuple[str, str]]) -> int:
+        """OR together several bitsets; caller holds the lock."""
+        result = 0
+        for key in keys:
+            result |= self._bitsets.get(key, 0)
+        return result
+
+    def record_message(
+        self, from_agent_id: str, to_agent_id: str, session_id: Optional[str] = None
+    ) -> str:
         """
         Record a message between agents.
 
         Args:
             from_agent_id: Sender agent ID
             to_agent_id: Receiver agent ID
+            session_id: Conversation the message belongs to; defaults to
+                one session per pair of agents
+
+        Returns:
+            The session ID the message was recorded under
         """
-        self._total_messages += 1
+        now = datetime.now()
+        session_id = session_id or session_key(from_agent_id, to_agent_id)
+        with self._lock:
+            self._total_messages += 1
+            total_messages = self._total_messages
+            self._sessions[session_id] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            self._expire_sessions()
+
+        if self._shared is not None:
+            total_messages = self._shared.add_message(from_agent_id, [to_agent_id])
+            if self._store is not None:
+                self._store.mark_dirty(
+                    *self._refreshed(from_agent_id, to_agent_id), total_messages=total_messages
+                )
+            return session_id
 
         # Update sender statistics
         from_agent = self._agents.get(from_agent_id)
         if from_agent:
-            from_agent.statistics.messages_sent += 1
-            from_agent.statistics.last_active = datetime.now()
-            from_agent.last_seen = datetime.now()
+            with self._stripe(from_agent_id):
+                from_agent.statistics.messages_sent += 1
+                from_agent.statistics.last_active = now
+                from_agent.last_seen = now
 
         # Update receiver statistics
         to_agent = self._agents.get(to_agent_id)
         if to_agent:
-            to_agent.statistics.messages_received += 1
-            to_agent.statistics.last_active = datetime.now()
-            to_agent.last_seen = datetime.now()
+            with self._stripe(to_agent_id):
+                to_agent.statistics.messages_received += 1
+                to_agent.statistics.last_active = now
+                to_agent.last_seen = now
+
+        if self._store is not None:
+            agents = [agent for agent in (from_agent, to_agent) if agent]
+            self._store.mark_dirty(*agents, total_messages=total_messages)
+        return session_id
+
+    def record_broadcast(
+        self, from_agent_id: str, to_agent_ids: list[str], session_id: Optional[str] = None
+    ) -> str:
+        """
+        Record one message sent to several agents.
+
+        Args:
+            from_agent_id: Sender agent ID
+            to_agent_ids: Receiver agent IDs
+            session_id: Conversation the message belongs to; defaults to
+                one broadcast session per sender
+
+        Returns:
+            The session ID the message was recorded under
+        """
+        now = datetime.now()
+        session_id = session_id or f"broadcast:{from_agent_id}"
+        with self._lock:
+            self._total_messages += 1
+            total_messages = self._total_messages
+            self._sessions[session_id] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            self._expire_sessions()
+
+        if self._shared is not None:
+            total_messages = self._shared.add_message(
+                from_agent_id, to_agent_ids, touch_receivers=False
+            )
+            if self._store is not None:
+                self._store.mark_dirty(
+                    *self._refreshed(from_agent_id, *to_agent_ids), total_messages=total_messages
+                )
+            return session_id
+
+        agents = []
+        from_agent = self._agents.get(from_agent_id)
+        if from_agent:
+            with self._stripe(from_agent_id):
+                from_agent.statistics.messages_sent += 1
+                from_agent.statistics.last_active = now
+                from_agent.last_seen = now
+            agents.append(from_agent)
+        for to_agent_id in to_agent_ids:
+            to_agent = self._agents.get(to_agent_id)
+            if to_agent:
+                with self._stripe(to_agent_id):
+                    to_agent.statistics.messages_received += 1
+                agents.append(to_agent)
+
+        if self._store is not None:
+            self._store.mark_dirty(*agents, total_messages=total_messages)
+        return session_id
+
+    def mark_seen(self, agent_id: str) -> bool:
+        """
+        Note that an agent is still around, postponing its idle eviction.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            True if the agent is registered
+        """
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            return False
+        with self._stripe(agent_id):
+            agent.last_seen = datetime.now()
+        if self._shared is not None:
+            self._shared.touch(agent_id)
+        if self._store is not None:
+            self._store.mark_dirty(agent)
+        return True
+
+    def record_response(self, agent_id: str, seconds: Optional[float], error: bool = False) -> None:
+        """
+        Record how long an agent took to reply, or that its message failed.
+
+        Args:
+            agent_id: Replying agent
+            seconds: Reply latency, or None when only recording an error
+            error: Whether the message failed validation or delivery
+        """
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            return
+        with self._stripe(agent_id):
+            histogram = self._latency.get(agent_id)
+            if histogram is None:
+                histogram = self._latency[agent_id] = LatencyHistogram()
+            if seconds is not None:
+                histogram.record(seconds)
+            if error:
+                histogram.errors += 1
+            if self._shared is None:
+                if seconds is not None:
+                    agent.statistics.average_response_time = histogram.mean
+                if error:
+                    agent.statistics.error_count += 1
+        if self._shared is not None:
+            # The mean and error count cover replies seen by every process
+            totals = self._shared.add_response(agent_id, seconds, error)
+            if totals is not None:
+                agent.statistics.average_response_time, agent.statistics.error_count = totals
+        if self._store is not None:
+            self._store.mark_dirty(agent)
+
+    def get_agent_latency(self, agent_id: str) -> Optional[LatencyStatistics]:
+        """
+        Get an agent's reply latency percentiles.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            LatencyStatistics, or None if the agent has not replied yet
+        """
+        with self._stripe(agent_id):
+            histogram = self._latency.get(agent_id)
+            return histogram.statistics(agent_id) if histogram else None
+
+    def _expire_sessions(self) -> None:
+        """Drop sessions idle past the timeout, oldest first; caller holds the lock."""
+        cutoff = time.monotonic() - self.session_timeout
+        while self._sessions:
+            session_id, last_message = next(iter(self._sessions.items()))
+            if last_message > cutoff:
+                break
+            del self._sessions[session_id]
 
     def get_statistics(self) -> RegistryStatistics:
         """
-        Get registry statistics.
+        Get registry statistics from running counters.
 
         Returns:
             RegistryStatistics with current metrics
         """
-        total = len(self._agents)
-        active = sum(1 for agent in self._agents.values() if agent.is_active)
-        sanskrit_capable = sum(
-            1
-            for agent in self._agents.values()
-            if agent.sanskrit_capabilities.can_read or agent.sanskrit_capabilities.can_write
-        )
-
-        return RegistryStatistics(
-            total_agents=total,
-            active_agents=active,
-            sanskrit_capable_agents=sanskrit_capable,
-            total_messages=self._total_messages,
-            active_sessions=0,  # Placeholder
-        )
+        self.evict_idle_agents()
+        shared = None
+        if self._shared is not None:
+            try:
+                shared = self._shared.statistics()
+            except SharedRegistryBusy:
+                self._shared.repair()
+        with self._lock:
+            self._expire_sessions()
+            if shared is not None:
+                total_agents, active, sanskrit_capable, total_messages = shared
+            else:
+                total_agents, active, sanskrit_capable, total_messages = (
+                    len(self._agents),
+                    self._active_count,
+                    self._sanskrit_capable_count,
+                    self._total_messages,
+                )
+            return RegistryStatistics(
+                total_agents=total_agents,
+                active_agents=active,
+                sanskrit_capable_agents=sanskrit_capable,
+                total_messages=total_messages,
+                active_sessions=len(self._sessions),
+                evicted_agents=self._evicted_count,
+            )
 
     def deactivate_agent(self, agent_id: str) -> bool:
         """
@@ -101,11 +689,20 @@ class AgentRegistry:
         Returns:
             True if agent was deactivated, False if not found
         """
-        agent = self._agents.get(agent_id)
-        if agent:
-            agent.is_active = False
-            return True
-        return False
+        with self._lock:
+            slot = self._slots.get(agent_id)
+            if slot is None:
+                return False
+            agent = self._agents[agent_id]
+            if agent.is_active:
+                agent.is_active = False
+                self._active_count -= 1
+                self._set_bits(slot, [("active", "")], False)
+            if self._shared is not None:
+                self._adopt(self._shared.set_active(agent_id, False))
+        if self._store is not None:
+            self._store.mark_dirty(agent)
+        return True
 
     def activate_agent(self, agent_id: str) -> bool:
         """
@@ -117,9 +714,28 @@ class AgentRegistry:
         Returns:
             True if agent was activated, False if not found
         """
-        agent = self._agents.get(agent_id)
-        if agent:
-            agent.is_active = True
+        with self._lock:
+            slot = self._slots.get(agent_id)
+            if slot is None:
+                return False
+            agent = self._agents[agent_id]
+            if not agent.is_active:
+                agent.is_active = True
+                self._active_count += 1
+                self._set_bits(slot, [("active", "")], True)
+            if self._shared is not None:
+                self._adopt(self._shared.set_active(agent_id, True))
+        with self._stripe(agent_id):
             agent.last_seen = datetime.now()
-            return True
-        return False
+        if self._shared is not None:
+            self._shared.touch(agent_id)
+        if self._store is not None:
+            self._store.mark_dirty(agent)
+        return True
+
+    def close(self) -> None:
+        """Flush pending changes to the store, if any, close it and detach from the shared table."""
+        if self._store is not None:
+            self._store.close()
+        if self._shared is not None:
+            self._shared.close()
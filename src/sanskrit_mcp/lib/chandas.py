@@ -0,0 +1,242 @@
+"""
+Metrical (chandas) analysis of Sanskrit verse.
+
+Each line of a verse is reduced to laghu/guru syllable weights, packed
+into an integer bitmask (bit i set = syllable i is guru). Pādas are then
+classified with constant-time table lookups on (length, mask) for the
+fixed-pattern meters, and with bitmask tests for the anuṣṭubh śloka, so
+a whole corpus is annotated with a handful of integer operations per
+pāda. Syllable properties are memoized per akshara.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from .tokenizer import AKSHARA_RE
+from .types import MeterAnalysis
+
+LAGHU = "L"
+GURU = "G"
+
+_LONG_VOWELS = frozenset("आईऊॠॡएऐओऔाीूॄॣेैोौ")
+_SHORT_VOWELS = frozenset("अइउऋऌिुृॢ")
+_HEAVY_MARKS = frozenset("ंः")
+_CONSONANTS = frozenset(chr(c) for c in range(0x0915, 0x093A)) | frozenset("क़ख़ग़ज़ड़ढ़फ़य़")
+_VIRAMA = "्"
+_NUKTA = "़"
+_LINE_BREAKS = "।॥|\n"
+
+# Fixed-pattern (vṛtta) meters per pāda; the last syllable is anceps
+_PATTERNS: dict[str, str] = {
+    "indravajrā": "GGLGGLLGLGG",
+    "upendravajrā": "LGLGGLLGLGG",
+    "vaṃśastha": "LGLGGLLGLGLG",
+    "indravaṃśā": "GGLGGLLGLGLG",
+    "vasantatilakā": "GGLGLLLGLLGLGG",
+    "mālinī": "LLLLLLGGGLGGLGG",
+    "mandākrāntā": "GGGGLLLLLGGLGGLGG",
+    "śārdūlavikrīḍita": "GGGLLGLGLLLGGGLGGLG",
+}
+
+# Syllable-count families, used when no fixed pattern matches:
+# pāda length -> (name, cadence mask, cadence bits)
+_FAMILIES = {
+    8: ("anuṣṭubh", 0, 0),
+    11: ("triṣṭubh", 0b111 << 7, 0b101 << 7),  # – ⏑ – x
+    12: ("jagatī", 0b111 << 8, 0b010 << 8),  # ⏑ – ⏑ x
+}
+# Mixed upajāti lines combine these
+_UPAJATI_MEMBERS = frozenset({"indravajrā", "upendravajrā"})
+
+
+def _pack(weights: str) -> int:
+    """Pack a weight string into a bitmask, bit i set for a guru syllable."""
+    mask = 0
+    for i, weight in enumerate(weights):
+        if weight == GURU:
+            mask |= 1 << i
+    return mask
+
+
+def _anceps(length: int) -> int:
+    """Mask clearing the final (anceps) syllable of a pāda."""
+    return ~(1 << (length - 1))
+
+
+# (pāda length, mask without final syllable) -> meter
+_PATTERN_TABLE: dict[tuple[int, int], str] = {
+    (len(p), _pack(p) & _anceps(len(p))): name for name, p in _PATTERNS.items()
+}
+_PADA_LENGTHS = sorted({len(p) for p in _PATTERNS.values()} | set(_FAMILIES), reverse=True)
+
+# Śloka even pāda ends ⏑ – ⏑ x in classical verse; Vedic verse is looser
+# about the 5th syllable, so only the 6th (guru) and 7th (laghu) are required
+_SLOKA_EVEN_MASK = 0b1100000
+_SLOKA_EVEN_BITS = 0b0100000
+# No śloka pāda has both its 2nd and 3rd syllables laghu
+_SLOKA_OPENING_MASK = 0b110
+
+
+@lru_cache(maxsize=4096)
+def _akshara_profile(akshara: str) -> tuple[bool, bool, bool]:
+    """
+    Describe an akshara for scansion.
+
+    Returns:
+        (is a syllable, heavy by itself, starts with a consonant cluster)
+    """
+    if akshara.isspace():
+        return False, False, False
+    if akshara == "ॐ":
+        return True, True, False
+    has_vowel = False
+    heavy = False
+    for char in akshara:
+        if char in _LONG_VOWELS:
+            has_vowel = heavy = True
+        elif char in _HEAVY_MARKS:
+            heavy = True
+        elif char in _SHORT_VOWELS:
+            has_vowel = True
+    if not has_vowel:
+        # Inherent a: some consonant is not followed by virama
+        has_vowel = any(
+            char in _CONSONANTS and akshara[i + 1 :].lstrip(_NUKTA)[:1] != _VIRAMA
+            for i, char in enumerate(akshara)
+        )
+    if akshara[-1] == _VIRAMA:
+        heavy = True  # closed by a final consonant
+    cluster = akshara[0] in _CONSONANTS and akshara[1:].lstrip(_NUKTA)[:1] == _VIRAMA
+    return has_vowel, heavy, cluster
+
+
+def scan_lines(text: str) -> list[str]:
+    """
+    Scan a verse into laghu/guru weights, one string per line.
+
+    A syllable is guru when its vowel is long, it carries anusvāra or
+    visarga, or it is followed by a consonant cluster or final consonant.
+    Lines end at daṇḍas and newlines.
+
+    Args:
+        text: Devanagari verse
+
+    Returns:
+        Weight strings of "L" and "G", one per non-empty line
+    """
+    lines: list[str] = []
+    weights: list[bool] = []
+    for akshara in AKSHARA_RE.findall(text):
+        if akshara in _LINE_BREAKS:
+            if weights:
+                lines.append("".join(GURU if heavy else LAGHU for heavy in weights))
+                weights = []
+            continue
+        is_syllable, heavy, cluster = _akshara_profile(akshara)
+        if cluster and weights:
+            weights[-1] = True
+        if is_syllable:
+            weights.append(heavy)
+    if weights:
+        lines.append("".join(GURU if heavy else LAGHU for heavy in weights))
+    return lines
+
+
+def _classify_pada(length: int, mask: int, even: bool) -> Optional[str]:
+    """Classify one pāda from its packed weights."""
+    meter = _PATTERN_TABLE.get((length, mask & _anceps(length)))
+    if meter:
+        return meter
+    if length not in _FAMILIES:
+        return None
+    name, cadence_mask, cadence_bits = _FAMILIES[length]
+    if length == 8:
+        if not mask & _SLOKA_OPENING_MASK:
+            return None
+        # Odd pādas admit the vipulā variants, so only even pādas are constrained
+        if even:
+            cadence_mask, cadence_bits = _SLOKA_EVEN_MASK, _SLOKA_EVEN_BITS
+    return name if mask & cadence_mask == cadence_bits else None
+
+
+def _classify_line(weights: str) -> list[str]:
+    """Split a line into equal pādas and classify each; empty if no split fits."""
+    count = len(weights)
+    mask = _pack(weights)
+    for length in _PADA_LENGTHS:
+        if count % length or count // length not in (1, 2, 3):
+            continue
+        meters = []
+        for index in range(count // length):
+            pada_mask = (mask >> (index * length)) & ((1 << length) - 1)
+            meter = _classify_pada(length, pada_mask, even=index % 2 == 1)
+            if meter is None:
+                break
+            meters.append(meter)
+        else:
+            return meters
+    return []
+
+
+def _combine(padas: list[str]) -> Optional[str]:
+    """Name the meter of a verse from the meters of its pādas."""
+    if not padas:
+        return None
+    names = set(padas)
+    if len(padas) == 1 and padas[0] not in _PATTERNS:
+        # A lone pāda is only identifiable by a fixed pattern
+        return None
+    if len(padas) == 3 and names == {"anuṣṭubh"}:
+        return "gāyatrī"
+    if len(names) == 1:
+        return names.pop()
+    if names <= _UPAJATI_MEMBERS:
+        return "upajāti"
+    if names <= _UPAJATI_MEMBERS | {"triṣṭubh"}:
+        return "triṣṭubh"
+    return None
+
+
+def analyze_meter(text: str) -> MeterAnalysis:
+    """
+    Identify the meter of a Devanagari verse.
+
+    Args:
+        text: Verse with lines separated by daṇḍas or newlines
+
+    Returns:
+        MeterAnalysis with the meter name (None if unrecognised) and the
+        weight pattern of each line
+    """
+    return analyze_meters([text])[0]
+
+
+def analyze_meters(texts: list[str]) -> list[MeterAnalysis]:
+    """
+    Identify the meters of many verses in one batch.
+
+    Args:
+        texts: Devanagari verses
+
+    Returns:
+        One MeterAnalysis per verse, in input order
+    """
+    results: list[MeterAnalysis] = []
+    for text in texts:
+        lines = scan_lines(text)
+        padas: list[str] = []
+        recognised = bool(lines)
+        for line in lines:
+            line_padas = _classify_line(line)
+            if not line_padas:
+                recognised = False
+                break
+            padas.extend(line_padas)
+        results.append(
+            MeterAnalysis(
+                meter=_combine(padas) if recognised else None,
+                lines=lines,
+                syllables=[len(line) for line in lines],
+            )
+        )
+    return results
@@ -0,0 +1,121 @@
+"""
+Circuit breaker for calls to an unreliable upstream.
+
+The breaker counts failed upstream calls in a sliding window. Too many
+open the circuit: calls are refused at once, so callers can answer from
+local resources instead of waiting on an upstream that is down. After a cooling-off period the circuit is half
+open and lets one probe call through; its success closes the circuit,
+its failure opens it again. A probe that never reports back is replaced
+after another cooling-off period, so the breaker cannot stick half open.
+
+All state belongs to one event loop.
+"""
+
+import time
+from collections import deque
+
+from .types import CircuitState, CircuitStatistics
+
+# Failures within FAILURE_WINDOW that open the circuit
+FAILURE_THRESHOLD = 5
+# Seconds a failure counts towards opening the circuit
+FAILURE_WINDOW = 60.0
+# Seconds the circuit stays open before a probe call is let through
+RESET_TIMEOUT = 30.0
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding failure window."""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        failure_window: float = FAILURE_WINDOW,
+        reset_timeout: float = RESET_TIMEOUT,
+    ) -> None:
+        """
+        Initialize a closed circuit.
+
+        Args:
+            failure_threshold: Failures within the window that open the circuit
+            failure_window: Seconds a failure counts
+            reset_timeout: Seconds the circuit stays open before a probe
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures: deque[float] = deque()
+        # While open: when the next probe may go;
+        # while half open: when the current probe is given up on
+        self._retry_at = 0.0
+        self._opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half open once the timeout has passed."""
+        if self._state == CircuitState.OPEN and time.monotonic() >= self._retry_at:
+            self._state = CircuitState.HALF_OPEN
+            self._retry_at = 0.0
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Ask whether a call may go upstream.
+
+        Returns:
+            True if it may; the caller must then report its outcome
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        now = time.monotonic()
+        if state == CircuitState.HALF_OPEN and now >= self._retry_at:
+            self._retry_at = now + self.reset_timeout
+            return True
+        self._rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Report a call that succeeded; closes a half-open circuit."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._state = CircuitState.CLOSED
+            self._failures.clear()
+
+    def record_failure(self) -> None:
+        """Report a call that failed upstream; may open the circuit."""
+        now = time.monotonic()
+        if self._state == CircuitState.HALF_OPEN:
+            self._open(now)
+            return
+        if self._state == CircuitState.OPEN:
+            return
+        self._failures.append(now)
+        while self._failures and self._failures[0] <= now - self.failure_window:
+            self._failures.popleft()
+        if len(self._failures) >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._retry_at = now + self.reset_timeout
+        self._failures.clear()
+        self._opened += 1
+
+    def get_statistics(self) -> CircuitStatistics:
+        """
+        Get the circuit state and counters.
+
+        Returns:
+            CircuitStatistics
+        """
+        now = time.monotonic()
+        return CircuitStatistics(
+            state=self.state,
+            recent_failures=sum(
+                1 for failed in self._failures if failed > now - self.failure_window
+            ),
+            times_opened=self._opened,
+            rejected=self._rejected,
+        )
@@ -0,0 +1,362 @@
+"""
+Append-only log of agent communication.
+
+Entries live in a fixed-size ring buffer addressed by sequence number, so
+memory stays bounded however long the server runs. Entries pushed out of
+the ring can be spilled to numbered JSON-lines segment files. Sequence
+numbers grow with time, which makes every index sorted for free:
+
+- by session and by agent pair, as deques of sequence numbers that are
+  trimmed from the left as entries leave the ring;
+- by time, with a binary search over the ring itself.
+
+Each session also keeps a running summary (message flow, response times,
+grammar-pattern totals) updated on append, so analysing a conversation
+never rescans its history. All methods are safe to call from threads.
+"""
+
+import json
+import threading
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional, TextIO, TypeVar
+
+from .types import CommunicationLog, SanskritMessage, SessionSummary
+
+# Entries kept in memory
+LOG_CAPACITY = 10000
+# Entries per spill segment file
+SEGMENT_SIZE = 5000
+# Session summaries kept, least recently active dropped first
+MAX_SESSIONS = 10000
+
+
+K = TypeVar("K")
+
+
+def _pair(a: str, b: str) -> tuple[str, str]:
+    return (a, b) if a <= b else (b, a)
+
+
+def _pop_oldest(index: dict[K, deque[int]], key: K) -> None:
+    """Drop the oldest sequence number of a key, and the key once it has none."""
+    seqs = index[key]
+    seqs.popleft()
+    if not seqs:
+        del index[key]
+
+
+class ConversationLog:
+    """Bounded, indexed, append-only communication log."""
+
+    def __init__(
+        self,
+        capacity: int = LOG_CAPACITY,
+        spill_dir: Optional[str | Path] = None,
+        segment_size: int = SEGMENT_SIZE,
+        max_sessions: int = MAX_SESSIONS,
+    ) -> None:
+        """
+        Initialize an empty log.
+
+        Args:
+            capacity: Entries kept in memory
+            spill_dir: Directory for segment files of entries leaving memory;
+                entries are dropped when omitted
+            segment_size: Entries per segment file
+            max_sessions: Session summaries kept
+        """
+        self.capacity = capacity
+        self._ring: list[Optional[CommunicationLog]] = [None] * capacity
+        self._next_seq = 0
+        self._by_session: dict[str, deque[int]] = {}
+        self._by_pair: dict[tuple[str, str], deque[int]] = {}
+        self._summaries: OrderedDict[str, SessionSummary] = OrderedDict()
+        self.max_sessions = max_sessions
+
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.segment_size = segment_size
+        self._segment: Optional[int] = None
+        self._segment_file: Optional[TextIO] = None
+        self._segment_count = 0
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._next_seq - self._oldest_seq
+
+    def record(
+        self,
+        from_agent: str,
+        to_agent: str,
+        message: SanskritMessage,
+        session_id: str,
+        success: bool = True,
+        translated_message: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+        broadcast: bool = False,
+    ) -> CommunicationLog:
+        """
+        Log a message.
+
+        A message answering the previous message of its session is logged
+        as a response, with the seconds since that message as its
+        response time.
+
+        Args:
+            from_agent: Sender agent ID
+            to_agent: Receiver agent ID
+            message: The message sent
+            session_id: Conversation the message belongs to
+            success: Whether the message was valid and delivered
+            translated_message: Translation sent alongside, if any
+            metadata: Extra details to keep with the entry
+            broadcast: Whether the message went to a group of agents, with
+                to_agent naming the group
+
+        Returns:
+            The new log entry
+        """
+        with self._lock:
+            previous = self._last_entry(session_id)
+            is_reply = (
+                not broadcast
+                and previous is not None
+                and previous.from_agent == to_agent
+                and previous.to_agent == from_agent
+            )
+            # Keep the ring in time order even if callers race
+            newest = self._ring[(self._next_seq - 1) % self.capacity] if self._next_seq else None
+            timestamp = max(message.timestamp, newest.timestamp) if newest else message.timestamp
+            entry = CommunicationLog(
+                id=str(uuid.uuid4()),
+                timestamp=timestamp,
+                from_agent=from_agent,
+                to_agent=to_agent,
+                message=message,
+                translated_message=translated_message,
+                communication_type=(
+                    "broadcast" if broadcast else "response" if is_reply else "direct"
+                ),
+                session_id=session_id,
+                success=success,
+                response_time=(
+                    (timestamp - previous.timestamp).total_seconds()
+                    if previous and is_reply
+                    else None
+                ),
+                metadata=metadata,
+            )
+            self._append(entry)
+            return entry
+
+    def _append(self, entry: CommunicationLog) -> None:
+        """Add an entry, evicting (and spilling) the oldest when full."""
+        seq = self._next_seq
+        slot = seq % self.capacity
+        evicted = self._ring[slot]
+        if evicted is not None:
+            self._evict(evicted)
+
+        self._ring[slot] = entry
+        self._next_seq += 1
+        self._by_session.setdefault(entry.session_id, deque()).append(seq)
+        self._by_pair.setdefault(_pair(entry.from_agent, entry.to_agent), deque()).append(seq)
+        self._summarize(entry)
+
+    def _evict(self, entry: CommunicationLog) -> None:
+        """Remove an entry leaving the ring from the indexes."""
+        # The evicted entry is always the oldest in its indexes
+        _pop_oldest(self._by_session, entry.session_id)
+        _pop_oldest(self._by_pair, _pair(entry.from_agent, entry.to_agent))
+        if self.spill_dir:
+            self._spill(entry, self.spill_dir)
+
+    def _summarize(self, entry: CommunicationLog) -> None:
+        """Fold an entry into its session summary."""
+        summary = self._summaries.get(entry.session_id)
+        if summary is None:
+            summary = self._summaries[entry.session_id] = SessionSummary(entry.session_id)
+            if len(self._summaries) > self.max_sessions:
+                self._summaries.popitem(last=False)
+        else:
+            self._summaries.move_to_end(entry.session_id)
+
+        summary.message_count += 1
+        if not entry.success:
+            summary.failed_count += 1
+        summary.first_message = summary.first_message or entry.timestamp
+        summary.last_message = entry.timestamp
+        route = (entry.from_agent, entry.to_agent)
+        summary.flow[route] = summary.flow.get(route, 0) + 1
+        if entry.response_time is not None:
+            summary.response_count += 1
+            summary.total_response_time += entry.response_time
+            summary.max_response_time = max(summary.max_response_time, entry.response_time)
+
+        metadata = entry.message.metadata
+        validation = metadata.validation_result if metadata else None
+        patterns = validation.grammar_patterns if validation else None
+        if patterns:
+            summary.sandhi += patterns.sandhi
+            summary.samasa += patterns.samasa
+            summary.vibhakti += patterns.vibhakti
+            summary.dhatu += patterns.dhatu
+
+    def _spill(self, entry: CommunicationLog, spill_dir: Path) -> None:
+        """Append an evicted entry to the current segment file."""
+        segment_file = self._segment_file
+        if segment_file is None or self._segment_count >= self.segment_size:
+            if segment_file is not None:
+                segment_file.close()
+            self._segment = 0 if self._segment is None else self._segment + 1
+            while (spill_dir / f"segment-{self._segment:06d}.jsonl").exists():
+                self._segment += 1
+            path = spill_dir / f"segment-{self._segment:06d}.jsonl"
+            segment_file = path.open("a", encoding="utf-8")
+            self._segment_file = segment_file
+            self._segment_count = 0
+
+        record = {
+            "id": entry.id,
+            "timestamp": entry.timestamp.isoformat(),
+            "from_agent": entry.from_agent,
+            "to_agent": entry.to_agent,
+            "session_id": entry.session_id,
+            "communication_type": entry.communication_type,
+            "content": entry.message.content,
+            "translated_message": entry.translated_message,
+            "success": entry.success,
+            "response_time": entry.response_time,
+        }
+        segment_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._segment_count += 1
+
+    def iter_spilled(self, session_id: Optional[str] = None) -> Iterator[dict]:
+        """
+        Read spilled entries back, oldest first.
+
+        Args:
+            session_id: Only entries of this session
+
+        Returns:
+            Iterator of spilled entry records
+        """
+        if not self.spill_dir:
+            return
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.flush()
+        for path in sorted(self.spill_dir.glob("segment-*.jsonl")):
+            with open(path, encoding="utf-8") as segment:
+                for line in segment:
+                    record = json.loads(line)
+                    if session_id is None or record["session_id"] == session_id:
+                        yield record
+
+    def _entries(self, index: dict, key: Any, limit: Optional[int]) -> list[CommunicationLog]:
+        with self._lock:
+            seqs = index.get(key)
+            if not seqs:
+                return []
+            selected = list(seqs)[-limit:] if limit else seqs
+            return [self._at(seq) for seq in selected]
+
+    def session_entries(
+        self, session_id: str, limit: Optional[int] = None
+    ) -> list[CommunicationLog]:
+        """
+        Get a session's entries still in memory, oldest first.
+
+        Args:
+            session_id: Session to read
+            limit: Only the most recent entries
+
+        Returns:
+            Log entries
+        """
+        return self._entries(self._by_session, session_id, limit)
+
+    def pair_entries(
+        self, agent_a: str, agent_b: str, limit: Optional[int] = None
+    ) -> list[CommunicationLog]:
+        """
+        Get the entries exchanged between two agents, in either direction.
+
+        Args:
+            agent_a: One agent ID
+            agent_b: The other agent ID
+            limit: Only the most recent entries
+
+        Returns:
+            Log entries, oldest first
+        """
+        return self._entries(self._by_pair, _pair(agent_a, agent_b), limit)
+
+    def _first_seq_at(self, moment: datetime) -> int:
+        """Binary search for the first in-memory entry at or after a time."""
+        low, high = self._oldest_seq, self._next_seq
+        while low < high:
+            mid = (low + high) // 2
+            if self._at(mid).timestamp < moment:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def entries_between(self, start: datetime, end: datetime) -> list[CommunicationLog]:
+        """
+        Get in-memory entries with start <= timestamp < end.
+
+        Args:
+            start: Range start
+            end: Range end
+
+        Returns:
+            Log entries, oldest first
+        """
+        with self._lock:
+            first, last = self._first_seq_at(start), self._first_seq_at(end)
+            return [self._at(seq) for seq in range(first, last)]
+
+    def _last_entry(self, session_id: str) -> Optional[CommunicationLog]:
+        """Get the most recent in-memory entry of a session; caller holds the lock."""
+        seqs = self._by_session.get(session_id)
+        return self._at(seqs[-1]) if seqs else None
+
+    def _at(self, seq: int) -> CommunicationLog:
+        """Get the entry with a sequence number still in memory; caller holds the lock."""
+        entry = self._ring[seq % self.capacity]
+        if entry is None:
+            raise IndexError(f"Log entry {seq} is no longer in memory")
+        return entry
+
+    def get_summary(self, session_id: str) -> Optional[SessionSummary]:
+        """
+        Get the running summary of a session.
+
+        Args:
+            session_id: Session to describe
+
+        Returns:
+            Snapshot of the SessionSummary, or None for an unknown session
+        """
+        with self._lock:
+            summary = self._summaries.get(session_id)
+            return replace(summary, flow=dict(summary.flow)) if summary else None
+
+    def close(self) -> None:
+        """Close the current spill segment."""
+        with self._lock:
+            if self._segment_file is not None:
+                self._segment_file.close()
+                self._segment_file = None
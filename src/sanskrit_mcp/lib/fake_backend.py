@@ -0,0 +1,132 @@
+"""
+Offline stand-in for the Gemini API.
+
+FakeBackend answers prompts locally after a simulated delay, so the whole
+server (limiter, breaker, cache, batching, streaming) can run and be
+benchmarked without a network or an API key. Latency is drawn from a
+log-normal distribution fitted to a median and a 99th percentile, a share
+of calls fail with a retryable error, and responses are either canned
+(the first entry whose substring occurs in the prompt) or an echo of the
+prompt. Batched JSON prompts are echoed item by item as the JSON array
+they ask for. With a seed, runs are reproducible.
+"""
+
+import asyncio
+import json
+import math
+import random
+import re
+from typing import Optional
+
+from .llm_backend import ChunkCallback, LLMBackend, TransientBackendError
+from .token_usage import estimate_tokens
+from .types import Completion
+
+# Median simulated latency in seconds
+FAKE_MEDIAN_LATENCY = 0.05
+# Streamed completions are sent in chunks of this many words
+CHUNK_WORDS = 4
+# z-score of the 99th percentile of a normal distribution
+_Z99 = 2.326
+
+_JSON_ITEMS = re.compile(r"\[\s*\{.*\}\s*\]", re.DOTALL)
+_QUOTED = re.compile(r'"([^"]*)"')
+
+
+class FakeBackend(LLMBackend):
+    """Local fake model with configurable latency, errors and responses."""
+
+    name = "fake"
+
+    def __init__(
+        self,
+        median_latency: float = FAKE_MEDIAN_LATENCY,
+        p99_latency: Optional[float] = None,
+        error_rate: float = 0.0,
+        responses: Optional[dict[str, str]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the fake.
+
+        Args:
+            median_latency: Median seconds per completion
+            p99_latency: 99th percentile seconds; every call takes the median when omitted
+            error_rate: Share of calls failing with TransientBackendError
+            responses: Canned responses keyed by a substring of the prompt;
+                prompts matching none are echoed
+            seed: Seed for reproducible latencies and errors
+        """
+        self.median_latency = median_latency
+        self.error_rate = error_rate
+        self.responses = responses or {}
+        self._random = random.Random(seed)
+        # Log-normal with the given median and p99
+        p99 = p99_latency if p99_latency is not None else median_latency
+        self._mu = math.log(median_latency) if median_latency > 0 else None
+        self._sigma = (
+            math.log(p99 / median_latency) / _Z99
+            if median_latency > 0 and p99 > median_latency
+            else 0.0
+        )
+        self.calls = 0
+        self.errors = 0
+
+    def latency(self) -> float:
+        """Draw one simulated latency, in seconds."""
+        if self._mu is None:
+            return 0.0
+        return (
+            math.exp(self._random.gauss(self._mu, self._sigma))
+            if self._sigma
+            else self.median_latency
+        )
+
+    async def complete(
+        self, prompt: str, json_output: bool = False, on_chunk: Optional[ChunkCallback] = None
+    ) -> Completion:
+        self.calls += 1
+        delay = self.latency()
+        failed = self._random.random() < self.error_rate
+        text = self._respond(prompt, json_output)
+
+        if on_chunk is None:
+            await asyncio.sleep(delay)
+        else:
+            words = text.split(" ")
+            chunks = [
+                " ".join(words[i : i + CHUNK_WORDS]) for i in range(0, len(words), CHUNK_WORDS)
+            ]
+            # Spread the delay: a first-token wait, then the chunks
+            await asyncio.sleep(delay / 2)
+            for i, chunk in enumerate(chunks):
+                if failed:
+                    break
+                await on_chunk(chunk if i == len(chunks) - 1 else chunk + " ")
+                await asyncio.sleep(delay / 2 / len(chunks))
+        if failed:
+            self.errors += 1
+            raise TransientBackendError("Fake backend failure")
+        return Completion(
+            text=text, prompt_tokens=estimate_tokens(prompt), output_tokens=estimate_tokens(text)
+        )
+
+    def _respond(self, prompt: str, json_output: bool) -> str:
+        for substring, response in self.responses.items():
+            if substring in prompt:
+                return response
+        if json_output:
+            match = _JSON_ITEMS.search(prompt)
+            try:
+                items = json.loads(match.group(0)) if match else []
+            except ValueError:
+                items = []
+            return json.dumps(
+                [
+                    {"id": item.get("id"), "translation": f"Echo: {item.get('text')}"}
+                    for item in items
+                ],
+                ensure_ascii=False,
+            )
+        quoted = _QUOTED.search(prompt)
+        return f"Echo: {quoted.group(1) if quoted else ' '.join(prompt.split())}"
@@ -5,49 +5,178 @@ Handles interactions with Google's Gemini Pro model for translation
 and knowledge synthesis.
 """
 
-import os
+import asyncio
+import json
 import logging
-from typing import Optional
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+import os
+import re
+import time
+from typing import Awaitable, Callable, Optional, Sequence
+
+from google.api_core import exceptions as google_exceptions
+
+from .circuit_breaker import CircuitBreaker
+from .latency import LatencyTracker
+from .llm_backend import ChunkCallback, GeminiBackend, LLMBackend, TransientBackendError
+from .request_limiter import RequestLimiter
+from .single_flight import SingleFlight
+from .token_usage import TokenLedger, estimate_tokens
+from .translation_cache import TranslationCache, cache_key
+from .translation_memory import LEARNED, MATCH_THRESHOLD, TranslationMemory
+from .transliteration import DEVANAGARI, IAST, transliterate
+from .types import MemoryMatch
 
 logger = logging.getLogger(__name__)
 
+# Largest prompt sent to the model, in estimated tokens
+MAX_PROMPT_TOKENS = 8000
+# Texts per batched translation prompt
+BATCH_MAX_ITEMS = 20
+# Characters of text per batched translation prompt
+BATCH_MAX_CHARS = 6000
+
+# Failures worth retrying: quota, overload and timeouts
+_TRANSIENT_ERRORS = (
+    google_exceptions.TooManyRequests,
+    google_exceptions.InternalServerError,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.GatewayTimeout,
+    google_exceptions.DeadlineExceeded,
+    TransientBackendError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def _is_transient(error: BaseException) -> bool:
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+class GeminiUnavailable(Exception):
+    """Gemini was not asked or did not answer: circuit open, upstream failing or budget spent."""
+
+
+class PromptTooLarge(ValueError):
+    """A prompt is over the client's token budget and was not sent."""
+
+
 class GeminiClient:
     """Client for interacting with Google's Gemini Pro model."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize Gemini client."""
-        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            logger.warning("GEMINI_API_KEY not set. Gemini features will be disabled.")
-            self.model = None
-            return
+    MODEL_NAME = "gemini-2.0-flash"
 
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-        logger.info("Gemini Client initialized successfully.")
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[TranslationCache] = None,
+        limiter: Optional[RequestLimiter] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        backend: Optional[LLMBackend] = None,
+        usage: Optional[TokenLedger] = None,
+        max_prompt_tokens: int = MAX_PROMPT_TOKENS,
+        memory: Optional[TranslationMemory] = None,
+        memory_threshold: float = MATCH_THRESHOLD,
+    ):
+        """
+        Initialize Gemini client.
+
+        Args:
+            api_key: Gemini API key; read from GEMINI_API_KEY when omitted
+            cache: Cache for translations; every call goes to the model when omitted
+            limiter: Concurrency, rate limits and retries for model calls;
+                defaults to RequestLimiter's defaults with no rate limits
+            breaker: Circuit breaker failing calls fast while Gemini is down;
+                defaults to CircuitBreaker's defaults
+            backend: Model to send prompts to; Gemini (given an API key)
+                when omitted
+            usage: Ledger of tokens and cost per call; a new one when omitted
+            max_prompt_tokens: Largest prompt sent, in estimated tokens
+            memory: Translation memory consulted before the model and taught
+                its translations; not used when omitted
+            memory_threshold: Similarity at which a memory match is returned
+                as the translation; weaker matches are hints in the prompt
+        """
+        # Round-trip latency per client method
+        self.latency = LatencyTracker()
+        # Time to the first chunk of streamed responses, per client method
+        self.first_token = LatencyTracker()
+        self.cache = cache
+        # Identical concurrent requests share one model call
+        self.flights = SingleFlight()
+        self.limiter = limiter or RequestLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        # Calls given up on because their latency budget ran out; not breaker failures
+        self.budget_exceeded = 0
+        self.usage = usage or TokenLedger()
+        self.max_prompt_tokens = max_prompt_tokens
+        self.memory = memory
+        self.memory_threshold = memory_threshold
+        # Translations answered from memory, and prompts given memory hints
+        self.memory_answers = 0
+        self.memory_hints = 0
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.backend = backend
+        if self.backend is None:
+            if not self.api_key:
+                logger.warning("GEMINI_API_KEY not set. Gemini features will be disabled.")
+            else:
+                self.backend = GeminiBackend(self.api_key, self.MODEL_NAME)
+                logger.info("Gemini Client initialized successfully.")
+        # Cache keys name the model, so different backends never share entries
+        self.model_name = self.backend.name if self.backend is not None else self.MODEL_NAME
 
     async def translate_text(
-        self, 
-        text: str, 
-        direction: str, 
+        self,
+        text: str,
+        direction: str,
         include_transliteration: bool = False,
-        cultural_context: bool = False
+        cultural_context: bool = False,
+        on_chunk: Optional[ChunkCallback] = None,
+        budget: Optional[float] = None,
     ) -> str:
         """
         Translate text using Gemini Pro.
-        
+
         Args:
             text: Text to translate
             direction: 'sanskrit-to-english' or 'english-to-sanskrit'
-            include_transliteration: Whether to include transliteration (IAST)
+            include_transliteration: Whether to include transliteration (IAST),
+                computed locally rather than by the model
             cultural_context: Whether to include cultural notes
-            
+            on_chunk: Streams the translation to this callback as it is
+                generated; not called for cached translations or memory
+                matches, nor when an identical request already in flight is joined
+            budget: Seconds to wait for the model; unbounded when omitted.
+                The request carries on after the budget runs out and its
+                translation is cached for next time.
+
         Returns:
             Translated text with optional extras
+
+        Raises:
+            GeminiUnavailable: If the circuit is open, the model keeps failing
+                or the budget runs out
         """
-        if not self.model:
+        key = cache_key(
+            self.model_name,
+            "translate_text",
+            text,
+            direction,
+            include_transliteration,
+            cultural_context,
+        )
+        if self.cache is not None:
+            cached = await self.cache.get_async(key)
+            if cached is not None:
+                return cached
+
+        answer, hints = self._from_memory(
+            text, direction, include_transliteration, cultural_context
+        )
+        if answer is not None:
+            return answer
+
+        if not self.backend:
             return f"Error: Gemini API key not configured. Cannot translate: {text}"
 
         prompt = f"""
@@ -58,38 +187,429 @@ class GeminiClient:
         Requirements:
         1. Provide a precise and academic translation.
         """
-        
-        if include_transliteration:
-            prompt += "2. Include IAST transliteration for any Sanskrit terms.\n"
-            
+
         if cultural_context:
-            prompt += "3. Provide brief cultural or philosophical context if relevant.\n"
-            
+            prompt += "2. Provide brief cultural or philosophical context if relevant.\n"
+
+        if hints:
+            self.memory_hints += 1
+            prompt += (
+                "\nSimilar texts translated before, for reference; "
+                "adapt them to the differences:\n"
+            )
+            for match in hints:
+                prompt += f'- "{match.source}" -> "{match.target}" ({match.score:.0%} similar)\n'
+
         prompt += "\nFormat the output clearly."
 
+        async def translate() -> str:
+            translation = await self._generate("translate_text", prompt, on_chunk=on_chunk)
+            result = translation
+            if include_transliteration:
+                result += self._transliteration_note(text, translation)
+            if self.cache is not None:
+                self.cache.put(key, result)
+            if self.memory is not None and not cultural_context:
+                self.memory.add(text, translation, direction)
+            return result
+
         try:
-            response = await self.model.generate_content_async(prompt)
-            return response.text
+            return await self._within_budget(lambda: self.flights.run(key, translate), budget)
+        except GeminiUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Gemini translation error: {e}")
             return f"Error during translation: {str(e)}"
 
-    async def generate_content(self, prompt: str) -> str:
+    def _from_memory(
+        self, text: str, direction: str, include_transliteration: bool, cultural_context: bool
+    ) -> tuple[Optional[str], list[MemoryMatch]]:
+        """
+        Look a text up in the translation memory.
+
+        Returns:
+            The translation when the best match reaches memory_threshold (and
+            no cultural notes were asked for, which memory does not hold),
+            else None with the matches to give the model as hints
+        """
+        if self.memory is None:
+            return None, []
+        matches = self.memory.lookup(text, direction)
+        if not matches or matches[0].score < self.memory_threshold or cultural_context:
+            return None, matches
+        self.memory_answers += 1
+        match = matches[0]
+        origin = "earlier translation" if match.origin == LEARNED else match.origin
+        answer = match.target
+        if match.score < 1.0:
+            answer += (
+                f"\n\n📚 Translation memory ({origin}, "
+                f'{match.score:.0%} similar to "{match.source}")'
+            )
+        else:
+            answer += f"\n\n📚 Translation memory ({origin})"
+        if include_transliteration:
+            answer += self._transliteration_note(text, match.target)
+        return answer, matches
+
+    async def cached_translation(self, text: str, direction: str) -> Optional[str]:
+        """
+        Find a cached translation of a text made with any options.
+
+        Args:
+            text: Translated text
+            direction: 'sanskrit-to-english' or 'english-to-sanskrit'
+
+        Returns:
+            The cached translation, or None if there is none
+        """
+        if self.cache is None:
+            return None
+        for include_transliteration in (False, True):
+            for cultural_context in (False, True):
+                key = cache_key(
+                    self.model_name,
+                    "translate_text",
+                    text,
+                    direction,
+                    include_transliteration,
+                    cultural_context,
+                )
+                cached = await self.cache.get_async(key)
+                if cached is not None:
+                    return cached
+        return None
+
+    async def translate_many(
+        self,
+        texts: Sequence[str],
+        direction: str,
+        include_transliteration: bool = False,
+        cultural_context: bool = False,
+        budget: Optional[float] = None,
+    ) -> list[Optional[str]]:
+        """
+        Translate many texts, packing them into as few model calls as possible.
+
+        Texts with a strong translation memory match are answered from it;
+        the rest are sent in size-bounded batches asking for a JSON array of
+        translations. Texts missing from a batch's reply (or in a batch
+        that failed) are retried concurrently, each with translate_text(),
+        so the results match translating each text on its own.
+
+        Args:
+            texts: Texts to translate
+            direction: 'sanskrit-to-english' or 'english-to-sanskrit'
+            include_transliteration: Whether to include transliteration (IAST)
+            cultural_context: Whether to include cultural notes
+            budget: Seconds to wait for the model; unbounded when omitted.
+                Batches still running then carry on and cache their results.
+
+        Returns:
+            One translation (or error message) per text, in order; None for
+            texts Gemini was unavailable for or that ran over the budget
+        """
+        results: list[Optional[str]] = [None] * len(texts)
+        # Cache misses: key -> (text, positions); identical texts are translated once
+        pending: dict[str, tuple[str, list[int]]] = {}
+        for i, text in enumerate(texts):
+            key = cache_key(
+                self.model_name,
+                "translate_text",
+                text,
+                direction,
+                include_transliteration,
+                cultural_context,
+            )
+            cached = await self.cache.get_async(key) if self.cache is not None else None
+            if cached is None:
+                cached, _ = self._from_memory(
+                    text, direction, include_transliteration, cultural_context
+                )
+            if cached is not None:
+                results[i] = cached
+            elif key in pending:
+                pending[key][1].append(i)
+            else:
+                pending[key] = (text, [i])
+
+        async def translate_one(text: str) -> Optional[str]:
+            try:
+                return await self.translate_text(
+                    text, direction, include_transliteration, cultural_context
+                )
+            except GeminiUnavailable:
+                return None
+
+        async def translate_batch(batch: list[tuple[str, str]]) -> None:
+            translations: dict[int, str] = {}
+            if len(batch) > 1 and self.backend:
+                try:
+                    prompt = self._batch_prompt(
+                        [text for _, text in batch], direction, cultural_context
+                    )
+                    reply = await self._generate("translate_many", prompt, json_output=True)
+                    translations = self._split_batch(reply, len(batch))
+                except GeminiUnavailable as e:
+                    logger.warning(f"Gemini unavailable for a batch of {len(batch)} texts: {e}")
+                    return
+                except Exception as e:
+                    logger.warning(
+                        f"Gemini batch translation failed, "
+                        f"translating {len(batch)} texts one by one: {e}"
+                    )
+            missing = []
+            for n, (key, text) in enumerate(batch):
+                if n not in translations:
+                    missing.append((key, text))
+                    continue
+                result = translations[n]
+                if include_transliteration:
+                    result += self._transliteration_note(text, translations[n])
+                if self.cache is not None:
+                    self.cache.put(key, result)
+                if self.memory is not None and not cultural_context:
+                    self.memory.add(text, translations[n], direction)
+                for i in pending[key][1]:
+                    results[i] = result
+
+            retried = await asyncio.gather(*(translate_one(text) for _, text in missing))
+            for (key, _), retry in zip(missing, retried):
+                for i in pending[key][1]:
+                    results[i] = retry
+
+        batches = self._batches(pending)
+        if budget is not None and budget <= 0:
+            self.budget_exceeded += len(batches)
+            return list(results)
+        tasks = [asyncio.ensure_future(translate_batch(batch)) for batch in batches]
+        if tasks:
+            _, late = await asyncio.wait(tasks, timeout=budget)
+            self.budget_exceeded += len(late)
+        return list(results)
+
+    @staticmethod
+    def _batches(pending: dict[str, tuple[str, list[int]]]) -> list[list[tuple[str, str]]]:
+        """Pack (key, text) pairs into batches bounded by BATCH_MAX_ITEMS and BATCH_MAX_CHARS."""
+        batches: list[list[tuple[str, str]]] = []
+        batch: list[tuple[str, str]] = []
+        size = 0
+        for key, (text, _) in pending.items():
+            if batch and (len(batch) == BATCH_MAX_ITEMS or size + len(text) > BATCH_MAX_CHARS):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append((key, text))
+            size += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _batch_prompt(texts: list[str], direction: str, cultural_context: bool) -> str:
+        """Ask for one translation per numbered text as a JSON array."""
+        items = json.dumps(
+            [{"id": n, "text": text} for n, text in enumerate(texts)], ensure_ascii=False
+        )
+        prompt = f"""
+        Act as an expert Sanskrit scholar and translator.
+        Task: Translate each of the following texts from {direction.replace('-', ' ')}.
+        Texts (JSON): {items}
+
+        Requirements:
+        1. Provide a precise and academic translation of each text on its own.
+        """
+        if cultural_context:
+            prompt += (
+                "2. Provide brief cultural or philosophical context if relevant, "
+                "inside the translation.\n"
+            )
+        prompt += (
+            "\nRespond with only a JSON array holding one object per text, "
+            '{"id": <the text\'s id>, "translation": "<translation>"}.'
+        )
+        return prompt
+
+    @staticmethod
+    def _split_batch(reply: str, count: int) -> dict[int, str]:
+        """
+        Parse a batched reply into translations by id.
+
+        Args:
+            reply: Model reply, expected to be a JSON array (possibly fenced)
+            count: Number of texts sent
+
+        Returns:
+            Translations for the ids that were answered well; others are omitted
+        """
+        reply = re.sub(r"^\s*```(?:json)?\s*|\s*```\s*$", "", reply)
+        try:
+            items = json.loads(reply)
+        except ValueError:
+            return {}
+        if not isinstance(items, list):
+            return {}
+        translations: dict[int, str] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            n, translation = item.get("id"), item.get("translation")
+            if (
+                isinstance(n, int)
+                and 0 <= n < count
+                and isinstance(translation, str)
+                and translation.strip()
+            ):
+                translations.setdefault(n, translation.strip())
+        return translations
+
+    async def generate_content(
+        self,
+        prompt: str,
+        on_chunk: Optional[ChunkCallback] = None,
+        budget: Optional[float] = None,
+        cancellable: bool = False,
+    ) -> str:
         """
         Generate content using Gemini Pro.
-        
+
         Args:
             prompt: The prompt to send to the model
-            
+            on_chunk: Streams the response to this callback as it is generated;
+                not called when an identical request already in flight is joined
+            budget: Seconds to wait for the model; unbounded when omitted
+            cancellable: Whether cancelling this call (or running out of
+                budget) cancels the model request, once no other caller
+                shares it; otherwise the request runs to completion
+
         Returns:
             Generated text response
+
+        Raises:
+            GeminiUnavailable: If the circuit is open, the model keeps failing
+                or the budget runs out
         """
-        if not self.model:
+        if not self.backend:
             return "Error: Gemini API key not configured."
 
+        # Prompts differing only in whitespace are the same request
+        key = cache_key(self.model_name, "generate_content", " ".join(prompt.split()))
         try:
-            response = await self.model.generate_content_async(prompt)
-            return response.text
+            return await self._within_budget(
+                lambda: self.flights.run(
+                    key,
+                    lambda: self._generate("generate_content", prompt, on_chunk=on_chunk),
+                    cancellable,
+                ),
+                budget,
+            )
+        except GeminiUnavailable:
+            raise
         except Exception as e:
             logger.error(f"Gemini generation error: {e}")
             return f"Error generating content: {str(e)}"
+
+    async def _within_budget(
+        self, call: Callable[[], Awaitable[str]], budget: Optional[float]
+    ) -> str:
+        """
+        Await a coalesced model call for at most budget seconds.
+
+        A spent budget skips the call. Overruns are the caller's deadline,
+        not a sign Gemini is down, so they leave the circuit breaker alone.
+        """
+        if budget is None:
+            return await call()
+        if budget <= 0:
+            self.budget_exceeded += 1
+            raise GeminiUnavailable("Latency budget already spent")
+        try:
+            return await asyncio.wait_for(call(), budget)
+        except TimeoutError:
+            self.budget_exceeded += 1
+            raise GeminiUnavailable(f"No response within the {budget:g}s budget") from None
+
+    async def _generate(
+        self,
+        name: str,
+        prompt: str,
+        json_output: bool = False,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> str:
+        """
+        Send one prompt to the model through the limiter, timed under a client method name.
+
+        With on_chunk the response is streamed, each chunk passed on as it
+        arrives and the time to the first one recorded. A stream that fails
+        after its first chunk is not retried, since the caller has already
+        seen part of it.
+
+        Raises:
+            GeminiUnavailable: If no backend is configured or the circuit is open
+            PromptTooLarge: If the prompt is over max_prompt_tokens
+        """
+        backend = self.backend
+        if backend is None:
+            raise GeminiUnavailable("Gemini API key not configured")
+        estimate = estimate_tokens(prompt)
+        if estimate > self.max_prompt_tokens:
+            raise PromptTooLarge(
+                f"Prompt of about {estimate} tokens is over the "
+                f"{self.max_prompt_tokens}-token budget; send shorter text"
+            )
+        streamed = False
+
+        async def attempt() -> str:
+            start = time.perf_counter()
+
+            async def forward(chunk: str) -> None:
+                nonlocal streamed
+                if not streamed:
+                    streamed = True
+                    self.first_token.record(name, time.perf_counter() - start)
+                if on_chunk is not None:
+                    await on_chunk(chunk)
+
+            with self.latency.timed(name):
+                completion = await backend.complete(
+                    prompt,
+                    json_output=json_output,
+                    on_chunk=forward if on_chunk is not None else None,
+                )
+            prompt_tokens = completion.prompt_tokens or estimate
+            output_tokens = completion.output_tokens or estimate_tokens(completion.text)
+            self.limiter.charge_tokens(prompt_tokens + output_tokens - estimate)
+            self.usage.record(estimate, prompt_tokens, output_tokens)
+            return completion.text
+
+        if not self.breaker.allow():
+            raise GeminiUnavailable("Gemini circuit is open after repeated failures")
+        try:
+            text: str = await self.limiter.run(
+                attempt,
+                tokens=estimate,
+                retryable=lambda error: not streamed and _is_transient(error),
+            )
+        except Exception as e:
+            if _is_transient(e):
+                self.breaker.record_failure()
+                raise GeminiUnavailable(str(e)) from e
+            # The model answered, if only to refuse
+            self.breaker.record_success()
+            raise
+        self.breaker.record_success()
+        return text
+
+    @staticmethod
+    def _transliteration_note(source: str, translation: str) -> str:
+        """Build an IAST transliteration of the Devanagari in a request and its reply."""
+        segments = re.findall(r"[\u0900-\u097F][\u0900-\u097F\s]*", source + "\n" + translation)
+        segments = [s.strip() for s in segments if s.strip()]
+        if not segments:
+            return ""
+        lines = "\n".join(transliterate(s, IAST, DEVANAGARI) for s in segments)
+        return f"\n\nTransliteration (IAST):\n{lines}"
+
+    def close(self) -> None:
+        """Close the translation cache, if any."""
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,116 @@
+"""
+Shared, warm grammar analyzers.
+
+Building the morphological automaton and the sandhi lexicon is the
+expensive part of grammar analysis, so one instance of each is kept per
+process and shared by every request. Analyzers are built on first use, or
+up front when preloading is enabled, and their load time and per-call
+latency are recorded for reporting.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Optional, TypeVar
+
+from .latency import LatencyHistogram, LatencyTracker
+from .morphology import MorphologicalAnalyzer
+from .sandhi_splitter import SandhiSplitter, corpus_lexicon
+from .types import AnalyzerStatistics
+from .vedic_corpus_parser import VedicCorpusParser
+
+T = TypeVar("T")
+
+
+class GrammarAnalyzers:
+    """Process-wide grammar analyzers, built once and shared across requests."""
+
+    MORPHOLOGY = "morphology"
+    SANDHI = "sandhi"
+
+    def __init__(
+        self, corpus: Optional[VedicCorpusParser] = None, preload: Optional[bool] = None
+    ) -> None:
+        """
+        Initialize analyzer holder without building anything.
+
+        Args:
+            corpus: Corpus whose vocabulary extends the sandhi lexicon
+            preload: Whether preload() should build analyzers; defaults to
+                the SANSKRIT_PRELOAD_ANALYZERS environment variable (on)
+        """
+        self._corpus = corpus
+        if preload is None:
+            setting = os.getenv("SANSKRIT_PRELOAD_ANALYZERS", "true")
+            preload = setting.lower() not in ("0", "false", "no")
+        self.preload_enabled = preload
+
+        self._lock = threading.Lock()
+        self._instances: dict[str, object] = {}
+        self._load_times: dict[str, float] = {}
+        # Per-call latency, one histogram per analyzer
+        self.latency = LatencyTracker()
+
+    @property
+    def morphology(self) -> MorphologicalAnalyzer:
+        """The shared morphological analyzer."""
+        return self._get(self.MORPHOLOGY, MorphologicalAnalyzer)
+
+    @property
+    def sandhi(self) -> SandhiSplitter:
+        """The shared sandhi splitter, with the corpus vocabulary loaded."""
+        return self._get(self.SANDHI, self._build_sandhi)
+
+    def _build_sandhi(self) -> SandhiSplitter:
+        splitter = SandhiSplitter()
+        if self._corpus is not None:
+            passages = self._corpus.all_passages()
+            splitter.add_words(corpus_lexicon(p.transliteration for p in passages))
+        return splitter
+
+    def _get(self, name: str, build: Callable[[], T]) -> T:
+        """Return an analyzer, building it under the lock on first use."""
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    start = time.perf_counter()
+                    instance = build()
+                    self._load_times[name] = time.perf_counter() - start
+                    self._instances[name] = instance
+        return instance  # type: ignore[return-value]
+
+    def preload(self) -> dict[str, float]:
+        """
+        Build every analyzer now if preloading is enabled.
+
+        Returns:
+            Load time in seconds per analyzer built so far
+        """
+        if self.preload_enabled:
+            self._get(self.MORPHOLOGY, MorphologicalAnalyzer)
+            self._get(self.SANDHI, self._build_sandhi)
+        return dict(self._load_times)
+
+    def get_statistics(self) -> list[AnalyzerStatistics]:
+        """
+        Get load time and latency statistics.
+
+        Returns:
+            One AnalyzerStatistics per analyzer
+        """
+        latency = {stats.name: stats for stats in self.latency.get_statistics()}
+        with self._lock:
+            results = []
+            for name in (self.MORPHOLOGY, self.SANDHI):
+                load_time = self._load_times.get(name)
+                results.append(
+                    AnalyzerStatistics(
+                        name=name,
+                        loaded=name in self._instances,
+                        load_time_ms=load_time * 1000 if load_time is not None else None,
+                        latency=latency.get(name) or LatencyHistogram().statistics(name),
+                    )
+                )
+            return results
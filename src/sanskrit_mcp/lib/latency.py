@@ -0,0 +1,166 @@
+"""
+Fixed-memory latency histograms.
+
+Latencies are counted in logarithmic buckets, eight per power of two from
+1 µs to about 70 minutes, so every histogram is the same small array
+regardless of how many samples it holds, any two can be merged by adding
+counts, and percentiles are accurate to within about 9%.
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from .types import LatencyStatistics
+
+# Buckets per power of two, smallest latency resolved (seconds) and bucket count
+SUB_BUCKETS = 8
+MIN_LATENCY = 1e-6
+BUCKETS = SUB_BUCKETS * 32
+
+
+def _bucket(seconds: float) -> int:
+    if seconds <= MIN_LATENCY:
+        return 0
+    return min(int(math.log2(seconds / MIN_LATENCY) * SUB_BUCKETS), BUCKETS - 1)
+
+
+def _bucket_upper_bound(index: int) -> float:
+    return MIN_LATENCY * 2 ** ((index + 1) / SUB_BUCKETS)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with an error count."""
+
+    __slots__ = ("count", "counts", "errors", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one latency sample.
+
+        Args:
+            seconds: Observed latency
+        """
+        self.counts[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add another histogram's samples to this one.
+
+        Args:
+            other: Histogram to fold in
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.errors += other.errors
+
+    @property
+    def mean(self) -> float:
+        """Mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        Estimate a latency percentile.
+
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Upper bound of the bucket holding the percentile, in seconds
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self.max)
+        return self.max
+
+    def statistics(self, name: str) -> LatencyStatistics:
+        """
+        Summarize the histogram.
+
+        Args:
+            name: Label for the summary
+
+        Returns:
+            LatencyStatistics in milliseconds
+        """
+        return LatencyStatistics(
+            name=name,
+            count=self.count,
+            errors=self.errors,
+            mean_ms=self.mean * 1000,
+            p50_ms=self.percentile(50) * 1000,
+            p90_ms=self.percentile(90) * 1000,
+            p99_ms=self.percentile(99) * 1000,
+            max_ms=self.max * 1000,
+        )
+
+
+class LatencyTracker:
+    """Named latency histograms, safe to update from threads and tasks."""
+
+    def __init__(self) -> None:
+        """Initialize with no histograms."""
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: Optional[float], error: bool = False) -> None:
+        """
+        Record one call.
+
+        Args:
+            name: Histogram to update
+            seconds: Call latency, or None to count only an error
+            error: Whether the call failed
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            if seconds is not None:
+                histogram.record(seconds)
+            if error:
+                histogram.errors += 1
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record the latency of the enclosed block, counting exceptions as errors."""
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error)
+
+    def get_statistics(self) -> list[LatencyStatistics]:
+        """
+        Summarize every histogram.
+
+        Returns:
+            LatencyStatistics per name, sorted by name
+        """
+        with self._lock:
+            return [self._histograms[name].statistics(name) for name in sorted(self._histograms)]
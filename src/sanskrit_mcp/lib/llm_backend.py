@@ -0,0 +1,90 @@
+"""
+Language model backends for the Gemini client.
+
+A backend sends one prompt to a model and returns its completion,
+optionally streaming it chunk by chunk. Admission control, retries,
+caching and coalescing stay in GeminiClient, so every backend gets them:
+the Gemini API in production, and FakeBackend (fake_backend.py) for
+running and benchmarking the server offline.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional
+
+import google.generativeai as genai
+
+from .types import Completion
+
+# Receives each piece of a streamed completion as it arrives
+ChunkCallback = Callable[[str], Awaitable[None]]
+
+
+class TransientBackendError(Exception):
+    """A failure worth retrying, for backends without their own error types."""
+
+
+class LLMBackend(ABC):
+    """One language model behind a prompt-in, text-out interface."""
+
+    # Model identity; part of every cache key, so backends never share entries
+    name: str
+
+    @abstractmethod
+    async def complete(
+        self, prompt: str, json_output: bool = False, on_chunk: Optional[ChunkCallback] = None
+    ) -> Completion:
+        """
+        Complete a prompt.
+
+        Args:
+            prompt: Prompt to send
+            json_output: Whether to ask for a JSON response
+            on_chunk: Streams the completion to this callback as it is generated
+
+        Returns:
+            The whole completion
+        """
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through google.generativeai."""
+
+    def __init__(self, api_key: str, model_name: str) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            api_key: Gemini API key
+            model_name: Gemini model to use
+        """
+        self.name = model_name
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    async def complete(
+        self, prompt: str, json_output: bool = False, on_chunk: Optional[ChunkCallback] = None
+    ) -> Completion:
+        config = None
+        if json_output:
+            config = genai.GenerationConfig(response_mime_type="application/json")
+        if on_chunk is None:
+            response = await self.model.generate_content_async(prompt, generation_config=config)
+            text = response.text
+        else:
+            response = await self.model.generate_content_async(
+                prompt, generation_config=config, stream=True
+            )
+            chunks = []
+            async for chunk in response:
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    await on_chunk(chunk.text)
+            text = "".join(chunks)
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return Completion(text=text)
+        return Completion(
+            text=text,
+            prompt_tokens=usage.prompt_token_count,
+            output_tokens=usage.candidates_token_count,
+        )
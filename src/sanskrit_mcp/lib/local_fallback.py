@@ -0,0 +1,173 @@
+"""
+Degraded answers from local resources when Gemini is unavailable.
+
+Nothing here calls a model: a text is matched against the corpus (by
+shared Sanskrit words, or by keyword for English) and each word against
+the built-in vocabulary. The result is a glossary, not a translation,
+and is labelled as such.
+"""
+
+import unicodedata
+from typing import Optional
+
+from .tokenizer import word_spans
+from .transliteration import DEVANAGARI, IAST, detect_scheme, transliterate
+from .vedic_corpus_parser import VedicCorpusParser
+
+# Core terms, also served as the sanskrit://vocabulary resource
+VOCABULARY = [
+    {
+        "word": "Dharma",
+        "meaning": "Duty, righteousness, moral order",
+        "grammar": "Noun, Masculine, Nominative, Singular",
+        "context": "Central concept in Indian philosophy",
+    },
+    {
+        "word": "Karma",
+        "meaning": "Action, deed, causality",
+        "grammar": "Noun, Neuter, Nominative, Singular",
+        "context": "Law of cause and effect",
+    },
+    {
+        "word": "Yoga",
+        "meaning": "Union, discipline",
+        "grammar": "Noun, Masculine, Nominative, Singular",
+        "context": "Path to liberation",
+    },
+    {
+        "word": "Atman",
+        "meaning": "Self, Soul",
+        "grammar": "Noun, Masculine, Nominative, Singular",
+        "context": "The true self",
+    },
+    {
+        "word": "Brahman",
+        "meaning": "The Ultimate Reality",
+        "grammar": "Noun, Neuter, Nominative, Singular",
+        "context": "The absolute",
+    },
+    {
+        "word": "Satya",
+        "meaning": "Truth",
+        "grammar": "Noun, Neuter, Nominative, Singular",
+        "context": "Truthfulness",
+    },
+    {
+        "word": "Ahimsa",
+        "meaning": "Non-violence",
+        "grammar": "Noun, Feminine, Nominative, Singular",
+        "context": "Fundamental virtue",
+    },
+    {
+        "word": "Moksha",
+        "meaning": "Liberation",
+        "grammar": "Noun, Masculine, Nominative, Singular",
+        "context": "Freedom from samsara",
+    },
+    {
+        "word": "Guru",
+        "meaning": "Teacher, dispeller of darkness",
+        "grammar": "Noun, Masculine, Nominative, Singular",
+        "context": "Spiritual guide",
+    },
+    {
+        "word": "Shanti",
+        "meaning": "Peace",
+        "grammar": "Noun, Feminine, Nominative, Singular",
+        "context": "Inner and outer peace",
+    },
+]
+
+# Shortest word matched against the vocabulary
+MIN_WORD_LENGTH = 3
+
+
+def _fold(word: str) -> str:
+    """Spell an IAST word the way the vocabulary does: ASCII, ś/ṣ as sh, lower case."""
+    word = word.lower().replace("ś", "sh").replace("ṣ", "sh")
+    return "".join(c for c in unicodedata.normalize("NFD", word) if not unicodedata.combining(c))
+
+
+def _meaning_terms(entry: dict[str, str]) -> set[str]:
+    """Lower-cased words of an entry's English meaning."""
+    return {
+        word.strip(",").lower() for word in entry["meaning"].split() if len(word) > MIN_WORD_LENGTH
+    }
+
+
+def _vocabulary_matches(text: str, direction: str) -> list[dict[str, str]]:
+    """Find the vocabulary entries for the words of a text, in order of appearance."""
+    if direction == "sanskrit-to-english":
+        if detect_scheme(text) == DEVANAGARI:
+            text = transliterate(text, IAST, DEVANAGARI)
+        words = [_fold(text[start:end]) for start, end in word_spans(text)]
+        # Inflected forms share the entry's stem: dharmaḥ, ātmā, yogena
+        matches = (
+            entry
+            for word in words
+            if len(word) >= MIN_WORD_LENGTH
+            for entry in VOCABULARY
+            if word.startswith(entry["word"].lower()[:-1]) or entry["word"].lower().startswith(word)
+        )
+    else:
+        terms = {word.strip(".,;:!?\"'").lower() for word in text.split()}
+        matches = (entry for entry in VOCABULARY if terms & _meaning_terms(entry))
+    found: list[dict[str, str]] = []
+    for entry in matches:
+        if entry not in found:
+            found.append(entry)
+    return found
+
+
+async def local_translation(
+    text: str,
+    direction: str,
+    corpus: VedicCorpusParser,
+    reason: str,
+    cached: Optional[str] = None,
+) -> str:
+    """
+    Build a degraded answer to a translation request from local resources.
+
+    Args:
+        text: Text to translate
+        direction: 'sanskrit-to-english' or 'english-to-sanskrit'
+        corpus: Corpus to search for the text
+        reason: Why Gemini was not used, shown to the user
+        cached: A cached translation of the text made with other options
+
+    Returns:
+        Cached translation, closest corpus passage and vocabulary glossary,
+        headed by a notice that this is not a fresh translation
+    """
+    response = (
+        f"⚠️ Degraded answer: Gemini is unavailable ({reason}). Built from local resources only.\n"
+    )
+    if cached is not None:
+        return response + f"\n💾 Cached translation (made with other options):\n{cached}\n"
+
+    if direction == "sanskrit-to-english":
+        matches = corpus.find_passages_by_text(text, limit=1)
+        passage = matches[0][0] if matches else None
+        shared = f", {matches[0][1]} shared words" if matches else ""
+    else:
+        result = await corpus.query_vedic_knowledge(text)
+        passage = result.passages[0] if result.passages else None
+        shared = ""
+    if passage is not None:
+        ref = passage.reference
+        location = f" {ref.chapter}.{ref.verse}" if ref.chapter and ref.verse else ""
+        response += (
+            f"\n📚 Closest corpus passage ({ref.text}{location}{shared}):\n"
+            f'  {passage.sanskrit}\n  "{passage.translation}"\n'
+        )
+
+    vocabulary = _vocabulary_matches(text, direction)
+    if vocabulary:
+        response += "\n📖 Vocabulary:\n"
+        for entry in vocabulary:
+            response += f"  • {entry['word']}: {entry['meaning']} ({entry['grammar']})\n"
+
+    if passage is None and not vocabulary:
+        response += "\nNo corpus passage or vocabulary entry matches this text.\n"
+    return response
@@ -0,0 +1,206 @@
+"""
+Per-agent mailboxes for message delivery.
+
+Every agent that is sent a message gets a bounded asyncio.Queue. When a
+mailbox is full the hub's overflow policy decides what happens to a new
+message: BLOCK waits (up to a timeout) for the agent to make room,
+DROP_OLDEST discards the oldest queued message, and REJECT refuses the
+new one. Memory is therefore bounded by agents × capacity however many
+messages pass through.
+
+Broadcast delivers one shared log entry to many mailboxes: recipients with
+room are filled immediately and only full mailboxes are waited on, all at
+once. The hub belongs to one event loop and is not thread-safe.
+"""
+
+import asyncio
+from typing import Iterable, Optional
+
+from .types import CommunicationLog, MailboxStatistics, OverflowPolicy
+
+# Messages held per agent mailbox
+MAILBOX_SIZE = 1000
+# Seconds a BLOCK delivery waits for room before giving up
+BLOCK_TIMEOUT = 1.0
+# Longest receive long-poll, in seconds
+MAX_WAIT = 30.0
+
+
+class MailboxHub:
+    """Bounded per-agent message queues with an overflow policy."""
+
+    def __init__(
+        self,
+        capacity: int = MAILBOX_SIZE,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        block_timeout: float = BLOCK_TIMEOUT,
+    ) -> None:
+        """
+        Initialize with no mailboxes.
+
+        Args:
+            capacity: Messages held per mailbox
+            policy: What a full mailbox does with a new message
+            block_timeout: Seconds a BLOCK delivery waits before the message
+                is rejected
+        """
+        self.capacity = capacity
+        self.policy = OverflowPolicy(policy)
+        self.block_timeout = block_timeout
+        self._mailboxes: dict[str, asyncio.Queue[CommunicationLog]] = {}
+        self._delivered = 0
+        self._received = 0
+        self._dropped = 0
+        self._rejected = 0
+
+    def _mailbox(self, agent_id: str) -> asyncio.Queue:
+        mailbox = self._mailboxes.get(agent_id)
+        if mailbox is None:
+            mailbox = self._mailboxes[agent_id] = asyncio.Queue(self.capacity)
+        return mailbox
+
+    def _offer(self, mailbox: asyncio.Queue, entry: CommunicationLog) -> bool:
+        """Queue without waiting, applying the policy if full; False if the mailbox is full."""
+        if mailbox.full():
+            if self.policy != OverflowPolicy.DROP_OLDEST:
+                return False
+            mailbox.get_nowait()
+            self._dropped += 1
+        mailbox.put_nowait(entry)
+        self._delivered += 1
+        return True
+
+    async def _wait_for_room(self, mailbox: asyncio.Queue, entry: CommunicationLog) -> bool:
+        try:
+            await asyncio.wait_for(mailbox.put(entry), self.block_timeout)
+        except TimeoutError:
+            self._rejected += 1
+            return False
+        self._delivered += 1
+        return True
+
+    async def deliver(self, agent_id: str, entry: CommunicationLog) -> bool:
+        """
+        Put a message in an agent's mailbox.
+
+        Args:
+            agent_id: Receiving agent
+            entry: Logged message to deliver
+
+        Returns:
+            True if the message was queued, False if it was rejected
+        """
+        mailbox = self._mailbox(agent_id)
+        if self._offer(mailbox, entry):
+            return True
+        if self.policy == OverflowPolicy.BLOCK:
+            return await self._wait_for_room(mailbox, entry)
+        self._rejected += 1
+        return False
+
+    async def broadcast(self, agent_ids: Iterable[str], entry: CommunicationLog) -> int:
+        """
+        Put one message in several agents' mailboxes.
+
+        Args:
+            agent_ids: Receiving agents
+            entry: Logged message to deliver to all of them
+
+        Returns:
+            Number of mailboxes the message was queued in
+        """
+        delivered = 0
+        full = []
+        for agent_id in agent_ids:
+            mailbox = self._mailbox(agent_id)
+            if self._offer(mailbox, entry):
+                delivered += 1
+            elif self.policy == OverflowPolicy.BLOCK:
+                full.append(mailbox)
+            else:
+                self._rejected += 1
+        if full:
+            results = await asyncio.gather(
+                *(self._wait_for_room(mailbox, entry) for mailbox in full)
+            )
+            delivered += sum(results)
+        return delivered
+
+    async def receive(
+        self, agent_id: str, max_messages: int = 10, timeout: float = 0.0
+    ) -> list[CommunicationLog]:
+        """
+        Take messages from an agent's mailbox, oldest first.
+
+        Args:
+            agent_id: Agent whose mailbox to read
+            max_messages: Most messages to return
+            timeout: Seconds to wait for a message if the mailbox is empty
+                (capped at MAX_WAIT); 0 returns immediately
+
+        Returns:
+            The messages taken, possibly none
+        """
+        timeout = min(timeout, MAX_WAIT)
+        if agent_id not in self._mailboxes and timeout <= 0:
+            return []
+        mailbox = self._mailbox(agent_id)
+
+        messages: list[CommunicationLog] = []
+        if mailbox.empty() and timeout > 0:
+            try:
+                messages.append(await asyncio.wait_for(mailbox.get(), timeout))
+            except TimeoutError:
+                return []
+        while len(messages) < max_messages and not mailbox.empty():
+            messages.append(mailbox.get_nowait())
+        self._received += len(messages)
+        return messages
+
+    def pending(self, agent_id: str) -> int:
+        """
+        Count the messages waiting for an agent.
+
+        Args:
+            agent_id: Agent whose mailbox to check
+
+        Returns:
+            Queued message count
+        """
+        mailbox = self._mailboxes.get(agent_id)
+        return mailbox.qsize() if mailbox else 0
+
+    def discard(self, agent_id: str) -> Optional[int]:
+        """
+        Remove an agent's mailbox and any messages in it.
+
+        Args:
+            agent_id: Agent whose mailbox to remove
+
+        Returns:
+            Number of undelivered messages dropped, or None if it had no mailbox
+        """
+        mailbox = self._mailboxes.pop(agent_id, None)
+        if mailbox is None:
+            return None
+        self._dropped += mailbox.qsize()
+        return mailbox.qsize()
+
+    def get_statistics(self) -> MailboxStatistics:
+        """
+        Get delivery counters.
+
+        Returns:
+            MailboxStatistics for all mailboxes
+        """
+        return MailboxStatistics(
+            mailboxes=len(self._mailboxes),
+            # Every delivered message is since received, dropped or still queued
+            queued=self._delivered - self._received - self._dropped,
+            capacity=self.capacity,
+            policy=self.policy,
+            delivered=self._delivered,
+            received=self._received,
+            dropped=self._dropped,
+            rejected=self._rejected,
+        )
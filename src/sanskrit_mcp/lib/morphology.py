@@ -0,0 +1,536 @@
+"""
+Morphological analysis of Sanskrit word forms.
+
+Inflection tables for the common nominal declensions, pronouns and the
+thematic verb conjugations are expanded over a stem lexicon, and every
+generated form is compiled into a minimized DAWG whose final states carry
+analysis rules. A rule rebuilds the stem from the surface form (cut the
+augment and ending, add the stem-final sounds) rather than naming it, so
+all words of one paradigm share their suffix states after minimization
+and lookup costs one transition per letter. Forms that are not in the
+lexicon are analysed by their longest known ending and marked as guesses.
+All work is done in SLP1.
+"""
+
+from typing import Iterable, Literal, Optional
+
+from .transliteration import SLP1, source_scheme, transliterate_many
+from .types import MorphAnalysis
+
+# fmt: off
+CASES = (
+    "nominative", "accusative", "instrumental", "dative",
+    "ablative", "genitive", "locative", "vocative",
+)
+NUMBERS = ("singular", "dual", "plural")
+PERSONS = ("third", "second", "first")  # prathama, madhyama, uttama puruṣa
+
+# Declension tables: one row per case (CASES order), one entry per number.
+# Entries are endings added to the stem minus its final sounds; alternatives
+# are separated by "/".
+_DECLENSIONS: dict[str, tuple[str, str, tuple[tuple[str, str, str], ...]]] = {
+    # name: (stem final, gender, rows)
+    "a-m": ("a", "masculine", (
+        ("aH", "O", "AH"), ("am", "O", "An"), ("ena", "AByAm", "EH"),
+        ("Aya", "AByAm", "eByaH"), ("At", "AByAm", "eByaH"), ("asya", "ayoH", "AnAm"),
+        ("e", "ayoH", "ezu"), ("a", "O", "AH"),
+    )),
+    "a-n": ("a", "neuter", (
+        ("am", "e", "Ani"), ("am", "e", "Ani"), ("ena", "AByAm", "EH"),
+        ("Aya", "AByAm", "eByaH"), ("At", "AByAm", "eByaH"), ("asya", "ayoH", "AnAm"),
+        ("e", "ayoH", "ezu"), ("a", "e", "Ani"),
+    )),
+    "A-f": ("A", "feminine", (
+        ("A", "e", "AH"), ("Am", "e", "AH"), ("ayA", "AByAm", "ABiH"),
+        ("AyE", "AByAm", "AByaH"), ("AyAH", "AByAm", "AByaH"), ("AyAH", "ayoH", "AnAm"),
+        ("AyAm", "ayoH", "Asu"), ("e", "e", "AH"),
+    )),
+    "i-m": ("i", "masculine", (
+        ("iH", "I", "ayaH"), ("im", "I", "In"), ("inA", "iByAm", "iBiH"),
+        ("aye", "iByAm", "iByaH"), ("eH", "iByAm", "iByaH"), ("eH", "yoH", "InAm"),
+        ("O", "yoH", "izu"), ("e", "I", "ayaH"),
+    )),
+    "i-f": ("i", "feminine", (
+        ("iH", "I", "ayaH"), ("im", "I", "IH"), ("yA", "iByAm", "iBiH"),
+        ("aye/yE", "iByAm", "iByaH"), ("eH/yAH", "iByAm", "iByaH"), ("eH/yAH", "yoH", "InAm"),
+        ("O/yAm", "yoH", "izu"), ("e", "I", "ayaH"),
+    )),
+    "u-m": ("u", "masculine", (
+        ("uH", "U", "avaH"), ("um", "U", "Un"), ("unA", "uByAm", "uBiH"),
+        ("ave", "uByAm", "uByaH"), ("oH", "uByAm", "uByaH"), ("oH", "voH", "UnAm"),
+        ("O", "voH", "uzu"), ("o", "U", "avaH"),
+    )),
+    "I-f": ("I", "feminine", (
+        ("I", "yO", "yaH"), ("Im", "yO", "IH"), ("yA", "IByAm", "IBiH"),
+        ("yE", "IByAm", "IByaH"), ("yAH", "IByAm", "IByaH"), ("yAH", "yoH", "InAm"),
+        ("yAm", "yoH", "Izu"), ("i", "yO", "yaH"),
+    )),
+    # an-stems after a consonant cluster (Atman, karman), which keep -an- in weak cases
+    "an-m": ("an", "masculine", (
+        ("A", "AnO", "AnaH"), ("Anam", "AnO", "anaH"), ("anA", "aByAm", "aBiH"),
+        ("ane", "aByAm", "aByaH"), ("anaH", "aByAm", "aByaH"), ("anaH", "anoH", "anAm"),
+        ("ani", "anoH", "asu"), ("an", "AnO", "AnaH"),
+    )),
+    "an-n": ("an", "neuter", (
+        ("a", "anI", "Ani"), ("a", "anI", "Ani"), ("anA", "aByAm", "aBiH"),
+        ("ane", "aByAm", "aByaH"), ("anaH", "aByAm", "aByaH"), ("anaH", "anoH", "anAm"),
+        ("ani", "anoH", "asu"), ("a/an", "anI", "Ani"),
+    )),
+}
+
+# Pronominal (sarvanāman) declension, on the stem minus final -a / -A
+_PRONOMINAL: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "masculine": (
+        ("aH", "O", "e"), ("am", "O", "An"), ("ena", "AByAm", "EH"),
+        ("asmE", "AByAm", "eByaH"), ("asmAt", "AByAm", "eByaH"), ("asya", "ayoH", "ezAm"),
+        ("asmin", "ayoH", "ezu"),
+    ),
+    "neuter": (("am", "e", "Ani"), ("am", "e", "Ani")),
+    "feminine": (
+        ("A", "e", "AH"), ("Am", "e", "AH"), ("ayA", "AByAm", "ABiH"),
+        ("asyE", "AByAm", "AByaH"), ("asyAH", "AByAm", "AByaH"), ("asyAH", "ayoH", "AsAm"),
+        ("asyAm", "ayoH", "Asu"),
+    ),
+}
+
+# Stem lexicon by declension (SLP1)
+NOMINAL_STEMS: dict[str, tuple[str, ...]] = {
+    "a-m": (
+        "deva", "rAma", "kfzRa", "arjuna", "Darma", "aDarma", "loka", "yoga", "veda",
+        "jIva", "ISvara", "puruza", "nara", "putra", "Sizya", "prARa", "sUrya", "candra",
+        "mokza", "AcArya", "kAla", "deSa", "guRa", "Ananda", "saMsAra", "vedAnta", "mArga",
+        "Bakta", "janaka", "bAla", "vfkza", "aSva", "gaja", "pARqava", "BArata",
+    ),
+    "a-n": (
+        "jYAna", "satya", "vana", "Pala", "kzetra", "sukha", "duHKa", "amfta", "rUpa", "jala",
+        "mitra", "SAstra", "vAkya", "pustaka", "DAna", "SarIra", "nagara", "gfha", "anna",
+    ),
+    "A-f": (
+        "vidyA", "avidyA", "mAyA", "gItA", "sItA", "SradDA", "kaTA", "BAzA", "prajYA",
+        "dayA", "kanyA", "latA", "SAlA", "senA", "ramA", "AtmavidyA",
+    ),
+    "i-m": ("agni", "hari", "muni", "kavi", "ravi", "pati", "fzi", "atiTi"),
+    "i-f": (
+        "Bakti", "SAnti", "mati", "buDDi", "prakfti", "mukti", "Sakti", "gati", "smfti",
+        "Sruti", "glAni", "kIrti", "rAtri", "BUmi",
+    ),
+    "u-m": ("guru", "vAyu", "BAnu", "SiSu", "manu", "viSRu", "sADu", "baDu", "Satru"),
+    "I-f": ("nadI", "devI", "pfTivI", "nArI", "vARI", "lakzmI", "jananI"),
+    "an-m": ("Atman", "paramAtman"),
+    "an-n": ("brahman", "karman", "janman", "Darman"),
+}
+
+# Pronouns: (stem, masculine/feminine nominative singular overrides, neuter nom/acc singular)
+_PRONOUN_STEMS: tuple[tuple[str, str, str, str], ...] = (
+    ("tad", "saH", "sA", "tat"),
+    ("yad", "yaH", "yA", "yat"),
+    ("etad", "ezaH", "ezA", "etat"),
+    ("sarva", "sarvaH", "sarvA", "sarvam"),
+    ("anya", "anyaH", "anyA", "anyat"),
+)
+
+# Personal pronouns: rows per case (no vocative), alternatives separated by "/"
+_PERSONAL_PRONOUNS: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "asmad": (
+        ("aham", "AvAm", "vayam"), ("mAm/mA", "AvAm/nO", "asmAn/naH"),
+        ("mayA", "AvAByAm", "asmABiH"), ("mahyam/me", "AvAByAm/nO", "asmaByam/naH"),
+        ("mat", "AvAByAm", "asmat"), ("mama/me", "AvayoH/nO", "asmAkam/naH"),
+        ("mayi", "AvayoH", "asmAsu"),
+    ),
+    "yuzmad": (
+        ("tvam", "yuvAm", "yUyam"), ("tvAm/tvA", "yuvAm/vAm", "yuzmAn/vaH"),
+        ("tvayA", "yuvAByAm", "yuzmABiH"), ("tuByam/te", "yuvAByAm/vAm", "yuzmaByam/vaH"),
+        ("tvat", "yuvAByAm", "yuzmat"), ("tava/te", "yuvayoH/vAm", "yuzmAkam/vaH"),
+        ("tvayi", "yuvayoH", "yuzmAsu"),
+    ),
+}
+
+INDECLINABLES: tuple[str, ...] = (
+    "ca", "vA", "hi", "eva", "api", "iti", "na", "tu", "tadA", "yadA", "yatra", "tatra",
+    "saha", "iha", "atra", "Kalu", "nanu", "aTa", "yaTA", "taTA", "iva", "sadA", "punaH",
+    "mA", "kila", "vE", "om", "evam", "kutra", "kadA", "katham", "sarvadA", "adya", "SvaH",
+)
+
+# Conjugation tables for thematic stems (ending in -a): rows per person
+# (PERSONS order), one entry per number; the stem's final -a is replaced.
+_CONJUGATIONS: dict[tuple[str, str], tuple[tuple[str, str, str], ...]] = {
+    ("laṭ", "parasmaipada"): (
+        ("ati", "ataH", "anti"),
+        ("asi", "aTaH", "aTa"),
+        ("Ami", "AvaH", "AmaH"),
+    ),
+    ("laṭ", "ātmanepada"): (
+        ("ate", "ete", "ante"),
+        ("ase", "eTe", "aDve"),
+        ("e", "Avahe", "Amahe"),
+    ),
+    ("laṅ", "parasmaipada"): (("at", "atAm", "an"), ("aH", "atam", "ata"), ("am", "Ava", "Ama")),
+    ("laṅ", "ātmanepada"): (
+        ("ata", "etAm", "anta"),
+        ("aTAH", "eTAm", "aDvam"),
+        ("e", "Avahi", "Amahi"),
+    ),
+    ("loṭ", "parasmaipada"): (("atu", "atAm", "antu"), ("a", "atam", "ata"), ("Ani", "Ava", "Ama")),
+    ("loṭ", "ātmanepada"): (
+        ("atAm", "etAm", "antAm"),
+        ("asva", "eTAm", "aDvam"),
+        ("E", "AvahE", "AmahE"),
+    ),
+    ("vidhiliṅ", "parasmaipada"): (
+        ("et", "etAm", "eyuH"),
+        ("eH", "etam", "eta"),
+        ("eyam", "eva", "ema"),
+    ),
+    ("vidhiliṅ", "ātmanepada"): (
+        ("eta", "eyAtAm", "eran"),
+        ("eTAH", "eyATAm", "eDvam"),
+        ("eya", "evahi", "emahi"),
+    ),
+}
+
+# Verb lexicon: (root, present stem, pada, future stem)
+VERB_STEMS: tuple[tuple[str, str, str, str], ...] = (
+    ("BU", "Bava", "parasmaipada", "Bavizya"),
+    ("gam", "gacCa", "parasmaipada", "gamizya"),
+    ("vad", "vada", "parasmaipada", "vadizya"),
+    ("dfS", "paSya", "parasmaipada", "drakzya"),
+    ("sTA", "tizWa", "parasmaipada", "sTAsya"),
+    ("iz", "icCa", "parasmaipada", "ezizya"),
+    ("sfj", "sfja", "parasmaipada", "srakzya"),
+    ("vah", "vaha", "parasmaipada", "vakzya"),
+    ("pat", "pata", "parasmaipada", "patizya"),
+    ("paW", "paWa", "parasmaipada", "paWizya"),
+    ("liK", "liKa", "parasmaipada", "leKizya"),
+    ("smf", "smara", "parasmaipada", "smarizya"),
+    ("ji", "jaya", "parasmaipada", "jezya"),
+    ("nI", "naya", "parasmaipada", "nezya"),
+    ("car", "cara", "parasmaipada", "carizya"),
+    ("rakz", "rakza", "parasmaipada", "rakzizya"),
+    ("pac", "paca", "parasmaipada", "pakzya"),
+    ("pA", "piba", "parasmaipada", "pAsya"),
+    ("laB", "laBa", "ātmanepada", "lapsya"),
+    ("sev", "seva", "ātmanepada", "sevizya"),
+    ("vft", "varta", "ātmanepada", "vartizya"),
+    ("man", "manya", "ātmanepada", "maMsya"),
+    ("yuD", "yuDya", "ātmanepada", "yotsya"),
+    ("ram", "rama", "ātmanepada", "raMsya"),
+)
+
+# Athematic present forms: root -> laṭ parasmaipada rows
+_IRREGULAR_PRESENT: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "as": (("asti", "staH", "santi"), ("asi", "sTaH", "sTa"), ("asmi", "svaH", "smaH")),
+    "kf": (
+        ("karoti", "kurutaH", "kurvanti"),
+        ("karozi", "kuruTaH", "kuruTa"),
+        ("karomi", "kurvaH", "kurmaH"),
+    ),
+    "jYA": (
+        ("jAnAti", "jAnItaH", "jAnanti"),
+        ("jAnAsi", "jAnITaH", "jAnITa"),
+        ("jAnAmi", "jAnIvaH", "jAnImaH"),
+    ),
+    "dA": (
+        ("dadAti", "dattaH", "dadati"),
+        ("dadAsi", "datTaH", "datTa"),
+        ("dadAmi", "dadvaH", "dadmaH"),
+    ),
+    "i": (("eti", "itaH", "yanti"), ("ezi", "iTaH", "iTa"), ("emi", "ivaH", "imaH")),
+}
+
+# Vṛddhi of an initial vowel when the augment a- is added
+_AUGMENT_VRDDHI = {
+    "a": "A", "A": "A", "i": "E", "I": "E", "e": "E", "u": "O", "U": "O", "o": "O", "f": "Ar"
+}
+# fmt: on
+
+_VOWELS = frozenset("aAiIuUfFxXeEoO")
+# Sounds across which ṇatva (n -> ṇ after r, ṣ, ṛ) still applies
+_NATVA_TRANSPARENT = frozenset("aAiIuUfFxXeEoOkKgGNpPbBmyvhM")
+
+# Shortest ending used to guess the analysis of an unknown word
+MIN_GUESS_ENDING = 2
+
+# Rule: (front cut, front add, end cut, end add, tags)
+# tags: (category, gender, case, number, person, lakara, pada)
+_Category = Literal["noun", "pronoun", "verb", "indeclinable"]
+_Tags = tuple[
+    _Category,
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+]
+_Rule = tuple[int, str, int, str, _Tags]
+
+
+def _natva(word: str) -> str:
+    """Apply ṇatva: n becomes ṇ after r, ṣ or ṛ unless a blocking sound intervenes."""
+    chars = list(word)
+    active = False
+    for i, char in enumerate(chars):
+        if char in "rzfF":
+            active = True
+        elif (
+            char == "n"
+            and active
+            and i + 1 < len(chars)
+            and (chars[i + 1] in _VOWELS or chars[i + 1] in "nmyv")
+        ):
+            chars[i] = "R"
+            active = False
+        elif char not in _NATVA_TRANSPARENT:
+            active = False
+    return "".join(chars)
+
+
+class MinimalDAWG:
+    """
+    Minimized acyclic automaton mapping words to tuples of output ids.
+
+    The trie of all words is minimized bottom-up: two states are merged
+    when they have the same outputs and the same transitions to already
+    merged states. The result is stored as flat per-state arrays.
+    """
+
+    def __init__(self, entries: dict[str, tuple[int, ...]]) -> None:
+        """
+        Build the automaton.
+
+        Args:
+            entries: Mapping from word to output ids
+        """
+        trie: dict = {}
+        for word, outputs in entries.items():
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[""] = outputs
+
+        self._edges: list[dict[str, int]] = []
+        self._outputs: list[tuple[int, ...]] = []
+        register: dict[tuple, int] = {}
+
+        def minimize(node: dict) -> int:
+            edges = tuple(sorted((char, minimize(child)) for char, child in node.items() if char))
+            signature = (node.get("", ()), edges)
+            state = register.get(signature)
+            if state is None:
+                state = len(self._edges)
+                register[signature] = state
+                self._edges.append(dict(edges))
+                self._outputs.append(node.get("", ()))
+            return state
+
+        self._root = minimize(trie)
+
+    def __len__(self) -> int:
+        """Number of states."""
+        return len(self._edges)
+
+    def lookup(self, word: str) -> tuple[int, ...]:
+        """Return the output ids for a word, or an empty tuple."""
+        state = self._root
+        edges = self._edges
+        for char in word:
+            state = edges[state].get(char)  # type: ignore[assignment]
+            if state is None:
+                return ()
+        return self._outputs[state]
+
+
+class MorphologicalAnalyzer:
+    """Table-driven morphological analyzer over a minimized DAWG."""
+
+    def __init__(self) -> None:
+        """Expand the inflection tables and compile them."""
+        self._rules: list[_Rule] = []
+        self._rule_ids: dict[_Rule, int] = {}
+        self._roots: dict[str, str] = {}
+        forms: dict[str, set[int]] = {}
+        self._endings: dict[str, set[int]] = {}
+
+        for form, rule, ending in self._generate():
+            rule_id = self._rule_ids.setdefault(rule, len(self._rules))
+            if rule_id == len(self._rules):
+                self._rules.append(rule)
+            forms.setdefault(form, set()).add(rule_id)
+            if ending is not None and len(ending) >= MIN_GUESS_ENDING:
+                self._endings.setdefault(ending, set()).add(rule_id)
+
+        self.form_count = len(forms)
+        self._dawg = MinimalDAWG({form: tuple(sorted(ids)) for form, ids in forms.items()})
+        self._max_ending = max(len(ending) for ending in self._endings)
+
+    @property
+    def state_count(self) -> int:
+        """Number of states in the compiled automaton."""
+        return len(self._dawg)
+
+    def _generate(self) -> Iterable[tuple[str, _Rule, Optional[str]]]:
+        """Yield (form, rule, guessable ending) for every inflected form."""
+        for declension, stems in NOMINAL_STEMS.items():
+            final, gender, rows = _DECLENSIONS[declension]
+            for stem in stems:
+                base = stem[: len(stem) - len(final)]
+                for case, row in zip(CASES, rows):
+                    for number, endings in zip(NUMBERS, row):
+                        for ending in endings.split("/"):
+                            form = _natva(base + ending)
+                            tags: _Tags = ("noun", gender, case, number, None, None, None)
+                            yield form, (0, "", len(ending), final, tags), form[len(base) :]
+
+        for stem, masculine, feminine, neuter in _PRONOUN_STEMS:
+            base = stem[:-1] if stem.endswith("a") else stem[:-2]
+            overrides = {
+                ("masculine", 0, 0): masculine,
+                ("feminine", 0, 0): feminine,
+                ("neuter", 0, 0): neuter,
+                ("neuter", 1, 0): neuter,
+            }
+            for gender, rows in _PRONOMINAL.items():
+                if gender == "neuter":
+                    rows = rows + _PRONOMINAL["masculine"][2:]
+                for case_index, (case, row) in enumerate(zip(CASES, rows)):
+                    for number_index, (number, ending) in enumerate(zip(NUMBERS, row)):
+                        form = overrides.get(
+                            (gender, case_index, number_index), _natva(base + ending)
+                        )
+                        tags = ("pronoun", gender, case, number, None, None, None)
+                        yield form, (0, "", len(form), stem, tags), None
+
+        for stem, rows in _PERSONAL_PRONOUNS.items():
+            for case, row in zip(CASES, rows):
+                for number, forms in zip(NUMBERS, row):
+                    for form in forms.split("/"):
+                        tags = ("pronoun", None, case, number, None, None, None)
+                        yield form, (0, "", len(form), stem, tags), None
+
+        for word in INDECLINABLES:
+            yield word, (0, "", 0, "", ("indeclinable", None, None, None, None, None, None)), None
+
+        for root, stem, pada, future in VERB_STEMS:
+            self._roots[stem] = root
+            self._roots[future] = root
+            yield from self._conjugate(stem, pada, ("laṭ", "laṅ", "loṭ", "vidhiliṅ"))
+            yield from self._conjugate(future, pada, ("lṛṭ",))
+
+        for root, rows in _IRREGULAR_PRESENT.items():
+            self._roots[root] = root
+            for person, row in zip(PERSONS, rows):
+                for number, form in zip(NUMBERS, row):
+                    tags = ("verb", None, None, number, person, "laṭ", "parasmaipada")
+                    yield form, (0, "", len(form), root, tags), None
+
+    def _conjugate(
+        self, stem: str, pada: str, lakaras: tuple[str, ...]
+    ) -> Iterable[tuple[str, _Rule, Optional[str]]]:
+        """Yield the forms of a thematic stem in the given lakāras."""
+        base = stem[:-1]
+        for lakara in lakaras:
+            table = _CONJUGATIONS[("laṭ" if lakara == "lṛṭ" else lakara, pada)]
+            augment = ""
+            if lakara == "laṅ":
+                initial = base[0]
+                augment = _AUGMENT_VRDDHI[initial] if initial in _AUGMENT_VRDDHI else "a" + initial
+                augmented = augment + base[1:]
+            else:
+                augmented = base
+            for person, row in zip(PERSONS, table):
+                for number, ending in zip(NUMBERS, row):
+                    form = _natva(augmented + ending)
+                    tags: _Tags = ("verb", None, None, number, person, lakara, pada)
+                    front = (len(augment), base[0]) if augment else (0, "")
+                    rule = (*front, len(ending), "a", tags)
+                    # Only unaugmented endings are safe to guess from
+                    yield form, rule, None if augment else form[len(base) :]
+
+    def analyze(self, word: str, scheme: Optional[str] = None) -> list[MorphAnalysis]:
+        """
+        Analyze a single word form.
+
+        Args:
+            word: Word to analyze
+            scheme: Scheme of word (detected when omitted)
+
+        Returns:
+            All analyses, written in the input scheme
+        """
+        return self.analyze_many([word], scheme)[0]
+
+    def analyze_many(
+        self, words: list[str], scheme: Optional[str] = None
+    ) -> list[list[MorphAnalysis]]:
+        """
+        Analyze a batch of word forms.
+
+        Args:
+            words: Words to analyze
+            scheme: Scheme of the words (detected when omitted)
+
+        Returns:
+            Analyses per word, written in the input scheme
+
+        Raises:
+            ValueError: If scheme is omitted and cannot be detected
+        """
+        if not words:
+            return []
+        scheme = source_scheme(" ".join(words), scheme)
+        slp1_words = transliterate_many(words, SLP1, scheme)
+
+        results: list[list[MorphAnalysis]] = []
+        for word, slp1 in zip(words, slp1_words):
+            results.append(
+                [
+                    self._build(word, slp1, rule_id, guessed)
+                    for rule_id, guessed in self._match(slp1)
+                ]
+            )
+
+        if scheme != SLP1:
+            self._respell(results, scheme)
+        return results
+
+    def _match(self, word: str) -> list[tuple[int, bool]]:
+        """Find rule ids for an SLP1 word: exact lexicon forms, else the longest known ending."""
+        if word.endswith("M"):
+            word = word[:-1] + "m"  # final anusvāra written for m
+        exact = self._dawg.lookup(word)
+        if exact:
+            return [(rule_id, False) for rule_id in exact]
+        for length in range(min(self._max_ending, len(word) - 1), MIN_GUESS_ENDING - 1, -1):
+            rule_ids = self._endings.get(word[-length:])
+            if rule_ids:
+                return [(rule_id, True) for rule_id in sorted(rule_ids)]
+        return []
+
+    def _build(self, word: str, slp1: str, rule_id: int, guessed: bool) -> MorphAnalysis:
+        """Apply a rule to recover the stem and tags."""
+        front_cut, front_add, end_cut, end_add, tags = self._rules[rule_id]
+        category, gender, case, number, person, lakara, pada = tags
+        stem = front_add + slp1[front_cut : len(slp1) - end_cut] + end_add
+        return MorphAnalysis(
+            word=word,
+            stem=stem,
+            category=category,
+            root=self._roots.get(stem) if category == "verb" else None,
+            gender=gender,
+            case=case,
+            number=number,
+            person=person,
+            lakara=lakara,
+            pada=pada,
+            guessed=guessed,
+        )
+
+    @staticmethod
+    def _respell(results: list[list[MorphAnalysis]], scheme: str) -> None:
+        """Write stems and roots back in the caller's scheme."""
+        analyses = [a for group in results for a in group]
+        stems = transliterate_many([a.stem for a in analyses], scheme, SLP1)
+        roots = transliterate_many([a.root or "" for a in analyses], scheme, SLP1)
+        for analysis, stem, root in zip(analyses, stems, roots):
+            analysis.stem = stem
+            analysis.root = root or None
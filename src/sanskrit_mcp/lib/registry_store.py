@@ -0,0 +1,281 @@
+"""
+SQLite persistence for the agent registry.
+
+Agents and their statistics are stored in a WAL-mode SQLite database so a
+restarted server recovers its registry. Writes are write-behind: callers
+only mark agents dirty, repeated updates to one agent coalesce into a
+single row write, and a background thread flushes dirty agents in one
+transaction per interval. Nothing on the message path waits on disk.
+
+Agents evicted from memory can be archived: their row is kept, flagged
+so it is not loaded back at start-up.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .types import Agent, AgentStatistics, ComprehensionLevel, Formality, SanskritCapabilities
+
+logger = logging.getLogger(__name__)
+
+# Seconds between write-behind flushes
+FLUSH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS agents (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    capabilities TEXT NOT NULL,
+    sanskrit_capabilities TEXT NOT NULL,
+    is_active INTEGER NOT NULL,
+    last_seen TEXT NOT NULL,
+    messages_sent INTEGER NOT NULL,
+    messages_received INTEGER NOT NULL,
+    last_active TEXT NOT NULL,
+    average_response_time REAL NOT NULL,
+    error_count INTEGER NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_UPSERT = "INSERT OR REPLACE INTO agents VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_COLUMNS = (
+    "id, name, description, capabilities, sanskrit_capabilities, is_active, last_seen, "
+    "messages_sent, messages_received, last_active, average_response_time, error_count"
+)
+
+
+def _to_row(agent: Agent, archived: bool = False) -> tuple:
+    """Serialize an agent to an agents table row."""
+    caps = agent.sanskrit_capabilities
+    stats = agent.statistics
+    return (
+        agent.id,
+        agent.name,
+        agent.description,
+        json.dumps(agent.capabilities),
+        json.dumps(
+            {
+                "can_read": caps.can_read,
+                "can_write": caps.can_write,
+                "dialect_preference": caps.dialect_preference,
+                "formality": caps.formality.value,
+                "comprehension_level": (
+                    caps.comprehension_level.value if caps.comprehension_level else None
+                ),
+            }
+        ),
+        int(agent.is_active),
+        agent.last_seen.isoformat(),
+        stats.messages_sent,
+        stats.messages_received,
+        stats.last_active.isoformat(),
+        stats.average_response_time,
+        stats.error_count,
+        int(archived),
+    )
+
+
+def _from_row(row: tuple) -> Agent:
+    """Rebuild an agent from an agents table row."""
+    (
+        agent_id,
+        name,
+        description,
+        capabilities,
+        sanskrit,
+        is_active,
+        last_seen,
+        sent,
+        received,
+        last_active,
+        average_response_time,
+        error_count,
+    ) = row
+    caps = json.loads(sanskrit)
+    level = caps["comprehension_level"]
+    return Agent(
+        id=agent_id,
+        name=name,
+        description=description,
+        capabilities=json.loads(capabilities),
+        sanskrit_capabilities=SanskritCapabilities(
+            can_read=caps["can_read"],
+            can_write=caps["can_write"],
+            dialect_preference=caps["dialect_preference"],
+            formality=Formality(caps["formality"]),
+            comprehension_level=ComprehensionLevel(level) if level else None,
+        ),
+        statistics=AgentStatistics(
+            messages_sent=sent,
+            messages_received=received,
+            last_active=datetime.fromisoformat(last_active),
+            average_response_time=average_response_time,
+            error_count=error_count,
+        ),
+        is_active=bool(is_active),
+        last_seen=datetime.fromisoformat(last_seen),
+    )
+
+
+class RegistryStore:
+    """Write-behind SQLite store for registered agents."""
+
+    def __init__(self, path: str | Path, flush_interval: float = FLUSH_INTERVAL) -> None:
+        """
+        Open (or create) the database and start the flush thread.
+
+        Args:
+            path: SQLite database file
+            flush_interval: Seconds between write-behind flushes
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(agents)")}
+        if "archived" not in columns:
+            self._db.execute("ALTER TABLE agents ADD COLUMN archived INTEGER NOT NULL DEFAULT 0")
+        self._db_lock = threading.Lock()
+
+        # Dirty agents by ID with their archived flag; flushed as they are at flush time
+        self._dirty: dict[str, tuple[Agent, bool]] = {}
+        self._deleted: set[str] = set()
+        self._total_messages: Optional[int] = None
+        self._dirty_lock = threading.Lock()
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="registry-store", daemon=True)
+        self._thread.start()
+
+    def load(self) -> tuple[list[Agent], int]:
+        """
+        Read every stored agent that is not archived.
+
+        Returns:
+            (agents, total message count)
+        """
+        with self._db_lock:
+            rows = self._db.execute(f"SELECT {_COLUMNS} FROM agents WHERE archived = 0")
+            agents = [_from_row(row) for row in rows]
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'total_messages'").fetchone()
+        return agents, row[0] if row else 0
+
+    def mark_dirty(self, *agents: Agent, total_messages: Optional[int] = None) -> None:
+        """
+        Queue agents (and optionally the message total) for the next flush.
+
+        Args:
+            agents: Agents whose state changed
+            total_messages: Current registry-wide message count
+        """
+        with self._dirty_lock:
+            for agent in agents:
+                self._dirty[agent.id] = (agent, False)
+                self._deleted.discard(agent.id)
+            if total_messages is not None:
+                # Concurrent callers may arrive out of order; keep the highest
+                self._total_messages = max(total_messages, self._total_messages or 0)
+
+    def archive(self, agent: Agent) -> None:
+        """
+        Queue an agent to be kept on disk but not loaded at start-up.
+
+        Args:
+            agent: Agent leaving memory
+        """
+        with self._dirty_lock:
+            self._dirty[agent.id] = (agent, True)
+            self._deleted.discard(agent.id)
+
+    def delete(self, agent_id: str) -> None:
+        """
+        Queue an agent's row for deletion.
+
+        Args:
+            agent_id: Agent to forget
+        """
+        with self._dirty_lock:
+            self._dirty.pop(agent_id, None)
+            self._deleted.add(agent_id)
+
+    def flush(self) -> int:
+        """
+        Write all dirty and deleted agents in one transaction.
+
+        If the write fails, the changes are queued again (behind any made
+        since) for the next flush.
+
+        Returns:
+            Number of agent rows written
+
+        Raises:
+            sqlite3.Error: If the transaction fails
+        """
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {}
+            deleted, self._deleted = self._deleted, set()
+            total_messages, self._total_messages = self._total_messages, None
+        if not dirty and not deleted and total_messages is None:
+            return 0
+
+        rows = [_to_row(agent, archived) for agent, archived in dirty.values()]
+        try:
+            with self._db_lock, self._db:
+                self._db.executemany(_UPSERT, rows)
+                self._db.executemany("DELETE FROM agents WHERE id = ?", [(i,) for i in deleted])
+                if total_messages is not None:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO meta VALUES ('total_messages', ?)",
+                        (total_messages,),
+                    )
+        except sqlite3.Error:
+            self._requeue(dirty, deleted, total_messages)
+            raise
+        return len(rows)
+
+    def _requeue(
+        self, dirty: dict[str, tuple[Agent, bool]], deleted: set[str], total_messages: Optional[int]
+    ) -> None:
+        """Queue the changes of a failed flush again, unless newer ones replaced them."""
+        with self._dirty_lock:
+            for agent_id, entry in dirty.items():
+                if agent_id not in self._deleted:
+                    self._dirty.setdefault(agent_id, entry)
+            for agent_id in deleted:
+                if agent_id not in self._dirty:
+                    self._deleted.add(agent_id)
+            if total_messages is not None:
+                self._total_messages = max(self._total_messages or 0, total_messages)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(f"Registry flush failed, retrying in {self.flush_interval:g}s: {e}")
+
+    def close(self) -> None:
+        """Stop the flush thread, write pending changes and close the database."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                self._db.close()
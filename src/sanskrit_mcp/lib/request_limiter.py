@@ -0,0 +1,231 @@
+"""
+Admission control and retries for calls to a rate-limited API.
+
+Each call passes three gates before it is sent:
+
+- a cap on calls in flight (an asyncio.Semaphore);
+- a token bucket of requests per minute;
+- a token bucket of model tokens per minute, charged an estimate up front
+  and corrected with the actual usage once the response arrives.
+
+Buckets hand out reservations rather than polling: a caller takes what it
+needs immediately, possibly driving the bucket into debt, and sleeps for
+as long as the debt takes to refill. Waiters are therefore served in
+order and never wake just to find the bucket still empty.
+
+Failed calls that look transient are retried with exponential backoff and
+full jitter. Queueing, throttling and retries all count against one
+deadline per call. All state belongs to one event loop.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from .latency import LatencyHistogram
+from .types import LimiterStatistics
+
+# Calls sent at once
+MAX_IN_FLIGHT = 8
+# Retries after the first attempt
+MAX_RETRIES = 3
+# First backoff ceiling and largest backoff, in seconds
+BASE_BACKOFF = 0.5
+MAX_BACKOFF = 8.0
+# Seconds a call may take from admission queue to final attempt
+DEADLINE = 60.0
+
+
+class TokenBucket:
+    """Continuously refilling token bucket with reservations."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None) -> None:
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Refill rate
+            burst: Bucket size; one minute's worth when omitted
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens now, going into debt if needed.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            Seconds to wait before using them
+        """
+        self._refill()
+        self._level -= amount
+        return max(0.0, -self._level / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """
+        Take (or, if negative, return) tokens without waiting.
+
+        Args:
+            amount: Tokens to take
+        """
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+
+class RequestLimiter:
+    """In-flight cap, request and token rate limits, and jittered retries."""
+
+    def __init__(
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = MAX_RETRIES,
+        base_backoff: float = BASE_BACKOFF,
+        max_backoff: float = MAX_BACKOFF,
+        deadline: float = DEADLINE,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_in_flight: Calls sent at once
+            requests_per_minute: Request quota; unlimited when omitted
+            tokens_per_minute: Token quota; unlimited when omitted
+            max_retries: Retries after the first attempt
+            base_backoff: Backoff ceiling before the first retry, doubled
+                for each further retry
+            max_backoff: Largest backoff ceiling
+            deadline: Seconds a call may take overall, including queueing
+        """
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self._queued = 0
+        self._in_flight = 0
+        self._admitted = 0
+        self._throttled = 0
+        self._retries = 0
+        self._failed = 0
+        self._wait = LatencyHistogram()
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        tokens: int = 0,
+        retryable: Callable[[BaseException], bool] = lambda error: False,
+    ) -> Any:
+        """
+        Run a call once admitted, retrying transient failures.
+
+        Args:
+            call: Starts one attempt
+            tokens: Estimated model tokens per attempt
+            retryable: Whether a failure is worth retrying
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            TimeoutError: If the deadline passes first
+            Exception: The last attempt's error, when not retried
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                return await asyncio.wait_for(self._attempt(call, tokens), deadline - loop.time())
+            except Exception as error:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._failed += 1
+                    raise TimeoutError(
+                        f"No response within the {self.deadline:g}s deadline"
+                    ) from error
+                if attempt >= self.max_retries or not retryable(error):
+                    self._failed += 1
+                    raise
+                # Full jitter: spreads retries from many callers over the whole window
+                backoff = random.uniform(0, min(self.max_backoff, self.base_backoff * 2**attempt))
+                if backoff >= remaining:
+                    self._failed += 1
+                    raise
+                attempt += 1
+                self._retries += 1
+                await asyncio.sleep(backoff)
+
+    async def _attempt(self, call: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        """Wait for admission, then make one attempt."""
+        queued_at = time.perf_counter()
+        self._queued += 1
+        admitted = False
+        try:
+            async with self._semaphore:
+                delay = 0.0
+                if self._requests is not None:
+                    delay = self._requests.reserve(1)
+                if self._tokens is not None and tokens:
+                    delay = max(delay, self._tokens.reserve(tokens))
+                if delay:
+                    self._throttled += 1
+                    await asyncio.sleep(delay)
+
+                self._queued -= 1
+                admitted = True
+                self._admitted += 1
+                self._in_flight += 1
+                self._wait.record(time.perf_counter() - queued_at)
+                try:
+                    return await call()
+                finally:
+                    self._in_flight -= 1
+        finally:
+            if not admitted:
+                self._queued -= 1
+
+    def charge_tokens(self, tokens: int) -> None:
+        """
+        Correct the token bucket once a response reports its actual usage.
+
+        Args:
+            tokens: Actual minus estimated tokens; negative to refund
+        """
+        if self._tokens is not None:
+            self._tokens.adjust(tokens)
+
+    def get_statistics(self) -> LimiterStatistics:
+        """
+        Get queue and retry metrics.
+
+        Returns:
+            LimiterStatistics with current and cumulative counts
+        """
+        return LimiterStatistics(
+            in_flight=self._in_flight,
+            queued=self._queued,
+            max_in_flight=self.max_in_flight,
+            admitted=self._admitted,
+            throttled=self._throttled,
+            retries=self._retries,
+            failed=self._failed,
+            mean_wait_ms=self._wait.mean * 1000,
+            p99_wait_ms=self._wait.percentile(99) * 1000,
+        )
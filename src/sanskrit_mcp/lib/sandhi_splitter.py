@@ -0,0 +1,289 @@
+"""
+Sandhi splitting for Sanskrit text.
+
+Words are looked up in a lexicon trie; at every point where a word could
+end, reverse sandhi rules propose how the surface sounds at the junction
+came about. Candidate splits are searched with dynamic programming over
+the remaining input, memoized so each remainder is solved once, and
+ranked so the fewest, longest words come first. All work is done in SLP1,
+where every phoneme is a single character.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional
+
+from .transliteration import IAST, SLP1, source_scheme, transliterate, transliterate_many
+from .types import SandhiSplit
+
+# Word-final sounds that only occur before another word
+_SANDHI_FINALS = frozenset("yvrdgjclYS")
+
+# A segmentation in progress: (sandhi rules applied, words)
+_Candidate = tuple[int, tuple[str, ...]]
+
+# Reverse sandhi rules: (surface at the junction, end of left word, start of right word).
+# fmt: off
+REVERSE_SANDHI_RULES: tuple[tuple[str, str, str], ...] = (
+    # Savarṇa-dīrgha: like vowels merge into the long vowel
+    *((long, left, right) for long, short in (("A", "a"), ("I", "i"), ("U", "u"), ("F", "f"))
+      for left in (short, long) for right in (short, long)),
+    # Guṇa and vṛddhi
+    *(("e", left, right) for left in ("a", "A") for right in ("i", "I")),
+    *(("o", left, right) for left in ("a", "A") for right in ("u", "U")),
+    *(("ar", left, "f") for left in ("a", "A")),
+    *(("E", left, right) for left in ("a", "A") for right in ("e", "E")),
+    *(("O", left, right) for left in ("a", "A") for right in ("o", "O")),
+    # Yaṇ: i/u/ṛ become semivowels before an unlike vowel
+    ("y", "i", ""), ("y", "I", ""), ("v", "u", ""), ("v", "U", ""), ("r", "f", ""),
+    # Ayādi: e/ai/o/au before vowels
+    ("ay", "e", ""), ("Ay", "E", ""), ("av", "o", ""), ("Av", "O", ""),
+    # Pūrvarūpa: e/o absorb a following a (written with avagraha)
+    ("e'", "e", "a"), ("o'", "o", "a"), ("o'", "aH", "a"), ("''", "", "A"),
+    # Visarga
+    ("o", "aH", ""), ("r", "H", ""), ("S", "H", ""), ("z", "H", ""), ("s", "H", ""),
+    ("", "H", ""),
+    # Consonants
+    ("M", "m", ""), ("d", "t", ""), ("j", "t", ""), ("c", "t", ""), ("l", "t", ""),
+    ("n", "t", ""), ("g", "k", ""), ("cC", "t", "S"), ("Y", "n", ""), ("Y", "m", ""),
+)
+
+# Common words and stems (SLP1); corpus words are added on top of these.
+SEED_LEXICON: tuple[str, ...] = (
+    # Particles and indeclinables
+    "ca", "vA", "hi", "eva", "api", "iti", "na", "tu", "tadA", "yadA", "yatra", "tatra",
+    "saha", "iha", "atra", "Kalu", "nanu", "aTa", "yaTA", "taTA", "iva", "sadA", "punar",
+    "mA", "nitya", "kila", "vE", "om",
+    # Pronouns
+    "aham", "tvam", "saH", "sA", "tat", "idam", "ayam", "iyam", "etat", "ezaH", "yat",
+    "yaH", "kim", "kaH", "mama", "me", "mAm", "tava", "te", "tvAm", "naH", "vayam",
+    "yUyam", "tasya", "tasmE", "tasmAt", "tena", "tam", "tAm", "tasmin", "ye", "yasya",
+    "sarvam", "sarve", "sarvaH", "sarva", "nau", "AvAm",
+    # Noun stems and common forms
+    "Darma", "DarmaH", "Darmam", "Darmasya", "DarmeRa", "Darme", "aDarma", "aDarmasya",
+    "kzetra", "kzetre", "kuru", "kurukzetre", "rAja", "rAjA", "putra", "putraH", "deva",
+    "devaH", "devAH", "brahma", "brahman", "jYAna", "jYAnam", "karma", "karman", "yoga",
+    "yogaH", "Bakti", "BaktiH", "Atman", "AtmA", "AtmAnam", "Atma", "mahA", "parama",
+    "loka", "lokaH", "guRa", "satya", "satyam", "Ananda", "AnandaH", "cit", "sat",
+    "mokza", "mokzaH", "mukti", "vidyA", "avidyA", "mAyA", "jIva", "jIvaH", "ISvara",
+    "ISvaraH", "BagavAn", "Bagavat", "gItA", "upanizat", "veda", "vedaH", "vedAnta",
+    "kfzRa", "kfzRaH", "rAma", "rAmaH", "arjuna", "arjunaH", "BArata", "pARqava",
+    "pARqavAH", "yudDa", "SAnti", "SAntiH", "tejas", "tejasvi", "samaveta", "samavetAH",
+    "yuyutsavaH", "mAmakAH", "kim", "akurvata", "saYjaya", "jagat", "miTyA", "jIvaH",
+    "nara", "naraH", "nArAyaRa", "puruza", "puruzaH", "prakfti", "guru", "guruH",
+    "SizyaH", "Sizya", "vAk", "manas", "manaH", "buDDi", "buDDiH", "prARa", "prARaH",
+    "sUrya", "candra", "agni", "agniH", "indra", "indraH", "vAyu", "jala", "pfTivI",
+    "AkASa", "kAla", "kAlaH", "deSa", "nAma", "rUpa", "sukha", "duHKa", "mahat",
+    "ananta", "amfta", "amftam", "paramAtmA", "paramAtman", "jYAnin", "yogin", "yogI",
+    "glAni", "glAniH", "aByutTAna", "aByutTAnam",
+    # Verb forms
+    "Bavati", "asti", "santi", "asi", "asmi", "gacCati", "karoti", "vadati", "vadanti",
+    "paSyati", "jAnAti", "sfjAmi", "vahAmi", "Bavatu", "avatu", "Bunaktu", "karavAvahE",
+    "Bavanti", "upAsate", "paryupAsate", "icCati", "dadAti", "tizWati", "Aha", "uvAca",
+)
+# fmt: on
+
+
+class LexiconTrie:
+    """
+    Compact prefix trie over SLP1 words.
+
+    Nodes are integers; edges live in one dict per node and terminal flags
+    in a bytearray, so the whole lexicon is a pair of flat arrays.
+    """
+
+    def __init__(self, words: Iterable[str] = ()) -> None:
+        """Initialize trie with optional words."""
+        self._edges: list[dict[str, int]] = [{}]
+        self._terminal = bytearray(1)
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        node = self.step(0, word)
+        return node is not None and bool(self._terminal[node])
+
+    def add(self, word: str) -> None:
+        """Add a word to the trie."""
+        node = 0
+        for char in word:
+            child = self._edges[node].get(char)
+            if child is None:
+                child = len(self._edges)
+                self._edges[node][char] = child
+                self._edges.append({})
+                self._terminal.append(0)
+            node = child
+        if not self._terminal[node]:
+            self._terminal[node] = 1
+            self._size += 1
+
+    def step(self, node: int, chars: str) -> Optional[int]:
+        """Follow chars from node, returning the node reached or None."""
+        for char in chars:
+            node = self._edges[node].get(char)  # type: ignore[assignment]
+            if node is None:
+                return None
+        return node
+
+    def is_word(self, node: int) -> bool:
+        """Check whether a node ends a word."""
+        return bool(self._terminal[node])
+
+    def walk(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (length, node) for every prefix of text that is a trie path."""
+        node = 0
+        for length, char in enumerate(text, 1):
+            node = self._edges[node].get(char)  # type: ignore[assignment]
+            if node is None:
+                return
+            yield length, node
+
+
+class SandhiSplitter:
+    """Lexicon-driven sandhi splitter with memoized dynamic programming."""
+
+    def __init__(self, lexicon: Iterable[str] = SEED_LEXICON, max_results: int = 5) -> None:
+        """
+        Initialize splitter.
+
+        Args:
+            lexicon: Words in SLP1
+            max_results: Segmentations kept per remainder while searching
+        """
+        self.lexicon = LexiconTrie(lexicon)
+        self.max_results = max_results
+        self._rules: dict[str, list[tuple[str, str, str]]] = defaultdict(list)
+        for surface, left, right in REVERSE_SANDHI_RULES:
+            self._rules[surface[:1]].append((surface, left, right))
+
+    def add_words(self, words: Iterable[str], scheme: str = SLP1) -> None:
+        """
+        Extend the lexicon.
+
+        Args:
+            words: Words to add
+            scheme: Scheme the words are written in
+        """
+        words = list(words)
+        if scheme != SLP1:
+            words = transliterate_many(words, SLP1, scheme)
+        for word in words:
+            if word:
+                self.lexicon.add(word)
+
+    def split(self, text: str, scheme: Optional[str] = None) -> list[SandhiSplit]:
+        """
+        Split a word or phrase into its component words.
+
+        Each whitespace-separated chunk is split on its own and the best
+        segmentations are combined in rank order.
+
+        Args:
+            text: Text to split
+            scheme: Scheme of text (detected when omitted)
+
+        Returns:
+            Ranked segmentations written in the input scheme; empty if
+            some chunk cannot be covered by the lexicon
+
+        Raises:
+            ValueError: If scheme is omitted and cannot be detected
+        """
+        scheme = source_scheme(text, scheme)
+        chunks = transliterate(text, SLP1, scheme).replace(".", " ").split()
+        if not chunks:
+            return []
+
+        memo: dict[str, list[_Candidate]] = {}
+        combined: list[_Candidate] = [(0, ())]
+        for chunk in chunks:
+            options = self._split(chunk, memo)
+            if not options:
+                return []
+            combined = sorted(
+                ((cost + more, head + tail) for cost, head in combined for more, tail in options),
+                key=self._rank,
+            )[: self.max_results]
+
+        return [
+            SandhiSplit(
+                words=transliterate_many(list(words), scheme, SLP1),
+                score=self._score(words),
+            )
+            for _, words in combined
+        ]
+
+    def _split(self, text: str, memo: dict[str, list[_Candidate]]) -> list[_Candidate]:
+        """Return the best segmentations of an SLP1 remainder with their rule counts."""
+        if not text:
+            return [(0, ())]
+        if text in memo:
+            return memo[text]
+        memo[text] = []  # guards against rules that re-create the same remainder
+
+        found: dict[tuple[str, ...], int] = {}
+
+        def extend(word: str, cost: int, remainder: str) -> None:
+            for more, tail in self._split(remainder, memo):
+                words = (word,) + tail
+                found[words] = min(found.get(words, cost + more), cost + more)
+
+        for length, node in self.lexicon.walk(text):
+            prefix, rest = text[:length], text[length:]
+
+            # Plain juncture: the word ends exactly here
+            if self.lexicon.is_word(node):
+                extend(prefix, 0, rest)
+
+            # Sandhi juncture: the sounds starting at rest came from left + right
+            rules = self._rules[rest[0]] + self._rules[""] if rest else self._rules[""]
+            for surface, left, right in rules:
+                if not rest.startswith(surface) or not (surface or rest):
+                    continue
+                end = self.lexicon.step(node, left)
+                if end is None or not self.lexicon.is_word(end):
+                    continue
+                extend(prefix + left, 1, right + rest[len(surface) :])
+
+        candidates = [(cost, words) for words, cost in found.items()]
+        memo[text] = sorted(candidates, key=self._rank)[: self.max_results]
+        return memo[text]
+
+    @staticmethod
+    def _score(words: tuple[str, ...]) -> float:
+        """Score a segmentation: fewer and longer words score higher."""
+        return sum(len(word) ** 2 for word in words) / len(words) ** 2
+
+    @classmethod
+    def _rank(cls, candidate: _Candidate) -> tuple[int, int, float, tuple[str, ...]]:
+        """Sort key: fewer words, fewer sandhi rules, higher score, then alphabetical."""
+        cost, words = candidate
+        return len(words), cost, -cls._score(words), words
+
+
+def corpus_lexicon(transliterations: Iterable[str]) -> list[str]:
+    """
+    Harvest SLP1 words from IAST corpus transliterations.
+
+    Corpus transliterations keep external sandhi, so final anusvāra is
+    restored to m and words whose final sound only arises in sandhi
+    (semivowels, voiced or assimilated stops) are skipped.
+
+    Args:
+        transliterations: IAST texts with words separated by spaces or hyphens
+
+    Returns:
+        Distinct SLP1 words
+    """
+    words: set[str] = set()
+    for text in transliterate_many(list(transliterations), SLP1, IAST):
+        for word in text.replace("-", " ").replace(".", " ").replace("'", " ").split():
+            if word.endswith("M"):
+                word = word[:-1] + "m"
+            if word[-1] not in _SANDHI_FINALS:
+                words.add(word)
+    return sorted(words)
@@ -3,6 +3,10 @@
 import re
 from typing import Optional
 
+from .grammar_analyzers import GrammarAnalyzers
+from .morphology import MorphologicalAnalyzer
+from .tokenizer import count_aksharas, word_spans
+from .transliteration import DEVANAGARI, IAST, detect_scheme, scheme_characters, transliterate
 from .types import (
     GrammarPatterns,
     Severity,
@@ -27,38 +31,32 @@ class SanskritValidator:
         re.compile(r'ञ्च'),  # nasal-palatal
     ]
 
-    # Vibhakti patterns (case endings)
-    VIBHAKTI_PATTERNS = [
-        re.compile(r'[ाःंम्]$'),  # Nominative/Accusative endings
-        re.compile(r'[ेः]$'),  # Ablative/Genitive
-        re.compile(r'ाय$'),  # Dative
-        re.compile(r'ात्$'),  # Ablative
-        re.compile(r'स्य$'),  # Genitive
-        re.compile(r'[िीुूृे]$'),  # Various case endings
-    ]
-
-    # Dhatu patterns (verb roots)
-    DHATU_PATTERNS = [
-        re.compile(r'ति$'),  # 3rd person singular present
-        re.compile(r'न्ति$'),  # 3rd person plural present
-        re.compile(r'[तन]्त$'),  # past participle
-        re.compile(r'त्वा$'),  # gerund
-        re.compile(r'त्य$'),  # gerund (Vedic)
-        re.compile(r'स्य(ति|न्ति)$'),  # future tense
-    ]
-
     # Compound indicators
     SAMASA_ENDINGS = [
         re.compile(r'त्वम्$'),  # abstract noun suffix
         re.compile(r'ता$'),  # abstract noun suffix
     ]
 
-    def __init__(self) -> None:
-        """Initialize validator with default rules."""
+    # Words with at least this many aksharas are counted as likely compounds
+    MIN_COMPOUND_AKSHARAS = 5
+
+    _DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]")
+
+    def __init__(self, analyzers: Optional[GrammarAnalyzers] = None) -> None:
+        """
+        Initialize validator with default rules.
+
+        Args:
+            analyzers: Shared grammar analyzers (a private set is created if omitted)
+        """
+        self.analyzers = analyzers or GrammarAnalyzers()
         self.allowed_scripts = ["devanagari", "iast", "itrans"]
         self.require_proper_sandhi = True
         self.strict_grammar = False
         self.allow_modern_usage = True
+        self._roman_characters = frozenset().union(
+            *(scheme_characters(scheme) for scheme in self.allowed_scripts if scheme != DEVANAGARI)
+        )
 
     async def validate_text(self, text: str) -> ValidationResult:
         """
@@ -105,8 +103,10 @@ class SanskritValidator:
                 )
             )
 
-        # Detect Sanskrit grammar patterns
-        result.grammar_patterns = self._detect_grammar_patterns(normalized_text)
+        # Detect Sanskrit grammar patterns (romanized text is analysed in Devanagari)
+        result.grammar_patterns = self._detect_grammar_patterns(
+            self._to_devanagari(normalized_text)
+        )
 
         # Calculate confidence
         result.confidence = self._calculate_confidence(result)
@@ -130,6 +130,8 @@ class SanskritValidator:
 
         invalid_chars: list[str] = []
         for char in text:
+            if char in self._roman_characters:
+                continue
             if not any(
                 pattern.match(char)
                 for pattern in [devanagari, latin, numbers, whitespace_punct]
@@ -139,6 +141,17 @@ class SanskritValidator:
 
         return invalid_chars
 
+    @property
+    def morphology(self) -> MorphologicalAnalyzer:
+        """The morphological analyzer used for vibhakti and dhatu detection."""
+        return self.analyzers.morphology
+
+    def _to_devanagari(self, text: str) -> str:
+        """Convert IAST input to Devanagari so the script-based patterns apply."""
+        if IAST in self.allowed_scripts and detect_scheme(text) == IAST:
+            return transliterate(text, DEVANAGARI, IAST)
+        return text
+
     def _has_mixed_scripts(self, text: str) -> bool:
         """Check if text mixes Devanagari and Latin scripts."""
         has_devanagari = bool(re.search(r'[\u0900-\u097F]', text))
@@ -159,35 +172,37 @@ class SanskritValidator:
             matches = pattern.findall(text)
             patterns.sandhi += len(matches)
 
-        # Split into words for word-level analysis
-        words = re.split(r'[\s।॥]+', text)
-        words = [w for w in words if w]  # Remove empty strings
+        # Word spans for word-level analysis (offsets, no substring copies)
+        spans = list(word_spans(text))
 
         # Count samasa (compounds)
-        for word in words:
-            # Heuristic: long words likely compounds
-            if len(word) > 8 and re.match(r'[\u0900-\u097F]{8,}', word):
+        for start, end in spans:
+            # Heuristic: words of many aksharas are likely compounds
+            if (
+                self._DEVANAGARI_RE.match(text, start)
+                and count_aksharas(text, start, end) >= self.MIN_COMPOUND_AKSHARAS
+            ):
                 patterns.samasa += 1
 
             # Check specific compound endings
             for pattern in self.SAMASA_ENDINGS:
-                if pattern.search(word):
+                if pattern.search(text, start, end):
                     patterns.samasa += 1
                     break
 
-        # Count vibhakti (case endings)
-        for word in words:
-            for pattern in self.VIBHAKTI_PATTERNS:
-                if pattern.search(word):
-                    patterns.vibhakti += 1
-                    break
-
-        # Count dhatu (verb forms)
-        for word in words:
-            for pattern in self.DHATU_PATTERNS:
-                if pattern.search(word):
-                    patterns.dhatu += 1
-                    break
+        # Count vibhakti (inflected nominals) and dhatu (verb forms) from morphology
+        sanskrit_words = [
+            text[start:end] for start, end in spans if self._DEVANAGARI_RE.search(text, start, end)
+        ]
+        with self.analyzers.latency.timed(GrammarAnalyzers.MORPHOLOGY):
+            word_analyses = self.analyzers.morphology.analyze_many(sanskrit_words, DEVANAGARI)
+        for analyses in word_analyses:
+            categories = {analysis.category for analysis in analyses}
+            if categories & {"noun", "pronoun"}:
+                patterns.vibhakti += 1
+            if "verb" in categories:
+                patterns.dhatu += 1
+            patterns.morphology.extend(analyses)
 
         return patterns
 
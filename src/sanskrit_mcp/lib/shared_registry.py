@@ -0,0 +1,751 @@
+"""
+Agent table in shared memory, for registries in several processes.
+
+A segment holds a 64-byte header (registry-wide counters), a log of
+recently changed slots, and a fixed number of fixed-size agent records: a
+state byte, flags, message and error counters, response-time totals and
+timestamps, the agent ID and its profile as a short JSON blob.
+
+Readers never lock. The header and every record carry a sequence number
+that writers make odd before changing them and even again afterwards; a
+reader copies the bytes between two reads of the sequence number and
+retries if it was odd or moved (a seqlock), so it always sees a whole
+update even while another process is writing. Writers are serialized
+across processes by an flock on a lock file next to the segment, and
+within a process by a thread lock. POSIX only.
+
+A reader retries a bounded number of times, backing off into short
+sleeps, and then raises SharedRegistryBusy. That only happens when a
+writer died mid-update and left a sequence number odd: writers note in
+the header which sequence number they are changing, and the next process
+to take the writer lock makes a number left odd even again (the
+interrupted update itself may be half applied).
+
+Records are placed by open addressing: the CRC-32 of the agent ID picks
+the first slot and probing is linear. Removed agents leave tombstones,
+which later inserts reuse.
+
+The header's generation number changes whenever an agent is added,
+replaced, removed or (de)activated, so a process can keep agent profiles
+and discovery indexes locally and catch up only when it moves. Each such
+change also writes the slot it touched (and a removed agent's ID) into
+the change log at the new generation's position, which the writer
+overwrites CHANGE_LOG_SIZE generations later; a process that has fallen
+no further behind re-reads just those slots, and one that has rescans
+the whole table.
+
+The segment outlives the processes using it until unlink() is called.
+"""
+
+import fcntl
+import itertools
+import json
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from .types import Agent, AgentStatistics, ComprehensionLevel, Formality, SanskritCapabilities
+
+logger = logging.getLogger(__name__)
+
+# Agent records in a newly created segment
+SHARED_CAPACITY = 16384
+# Bytes per agent record
+RECORD_SIZE = 1024
+HEADER_SIZE = 64
+# Changes remembered in the log; a process further behind rescans the table
+CHANGE_LOG_SIZE = 1024
+# Back-to-back attempts at a lock-free read, then attempts after sleeping
+READ_SPINS = 100
+READ_SLEEPS = 20
+# First and longest sleep between read attempts, in seconds
+READ_BACKOFF = 0.00001
+MAX_READ_BACKOFF = 0.001
+
+_MAGIC = b"SKTREG02"
+_SEQ = struct.Struct("<Q")
+# magic, capacity, record size
+_LAYOUT = struct.Struct("<8sII")
+_HEADER_SEQ = _LAYOUT.size
+# generation, total messages, agents, active agents, Sanskrit-capable agents
+_COUNTERS = struct.Struct("<QQIII")
+_COUNTERS_OFFSET = _HEADER_SEQ + _SEQ.size
+# Offset of the sequence number a writer is changing, 0 when none
+_PENDING = struct.Struct("<Q")
+_PENDING_OFFSET = HEADER_SIZE - _PENDING.size
+# Change log entry: slot changed, and the agent ID if it was a removal
+_CHANGE = struct.Struct("<Q64s")
+_CHANGES_OFFSET = HEADER_SIZE
+_RECORDS_OFFSET = _CHANGES_OFFSET + CHANGE_LOG_SIZE * _CHANGE.size
+
+# state, flags, messages sent, messages received, errors, responses,
+# total response seconds, last active, last seen (epoch seconds)
+_FIELDS = struct.Struct("<BB6xQQQQddd")
+_FIELDS_OFFSET = _SEQ.size
+_ID_OFFSET = _FIELDS_OFFSET + _FIELDS.size
+_ID_SIZE = 64
+_PROFILE_LEN = struct.Struct("<H")
+_PROFILE_OFFSET = _ID_OFFSET + _ID_SIZE
+_PROFILE_SIZE = RECORD_SIZE - _PROFILE_OFFSET - _PROFILE_LEN.size
+
+# Record states and flag bits
+_EMPTY, _USED, _REMOVED = 0, 1, 2
+_ACTIVE, _SANSKRIT_CAPABLE = 1, 2
+
+
+class SharedRegistryBusy(RuntimeError):
+    """A record stayed mid-update for every read attempt, as when its writer died."""
+
+
+def _flags(agent: Agent) -> int:
+    caps = agent.sanskrit_capabilities
+    active = _ACTIVE if agent.is_active else 0
+    return active | (_SANSKRIT_CAPABLE if caps.can_read or caps.can_write else 0)
+
+
+def _profile(agent: Agent) -> bytes:
+    """Serialize the parts of an agent that only change on re-registration."""
+    caps = agent.sanskrit_capabilities
+    return json.dumps(
+        {
+            "name": agent.name,
+            "description": agent.description,
+            "capabilities": agent.capabilities,
+            "can_read": caps.can_read,
+            "can_write": caps.can_write,
+            "dialect_preference": caps.dialect_preference,
+            "formality": caps.formality.value,
+            "comprehension_level": (
+                caps.comprehension_level.value if caps.comprehension_level else None
+            ),
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _statistics(fields: tuple) -> tuple[AgentStatistics, datetime]:
+    """Build AgentStatistics and last_seen from unpacked record fields."""
+    _, _, sent, received, errors, responses, response_total, last_active, last_seen = fields
+    statistics = AgentStatistics(
+        messages_sent=sent,
+        messages_received=received,
+        last_active=datetime.fromtimestamp(last_active),
+        average_response_time=response_total / responses if responses else 0.0,
+        error_count=errors,
+    )
+    return statistics, datetime.fromtimestamp(last_seen)
+
+
+def _agent(record: bytes) -> Agent:
+    """Rebuild an agent from a record snapshot."""
+    fields = _FIELDS.unpack_from(record, _FIELDS_OFFSET)
+    agent_id = record[_ID_OFFSET : _ID_OFFSET + _ID_SIZE].rstrip(b"\0").decode("utf-8")
+    (length,) = _PROFILE_LEN.unpack_from(record, _PROFILE_OFFSET)
+    start = _PROFILE_OFFSET + _PROFILE_LEN.size
+    profile = json.loads(record[start : start + length])
+    level = profile["comprehension_level"]
+    statistics, last_seen = _statistics(fields)
+    return Agent(
+        id=agent_id,
+        name=profile["name"],
+        description=profile["description"],
+        capabilities=profile["capabilities"],
+        sanskrit_capabilities=SanskritCapabilities(
+            can_read=profile["can_read"],
+            can_write=profile["can_write"],
+            dialect_preference=profile["dialect_preference"],
+            formality=Formality(profile["formality"]),
+            comprehension_level=ComprehensionLevel(level) if level else None,
+        ),
+        statistics=statistics,
+        is_active=bool(fields[1] & _ACTIVE),
+        last_seen=last_seen,
+    )
+
+
+class SharedRegistryTable:
+    """Fixed-layout agent table in a named shared memory segment."""
+
+    def __init__(self, name: str, capacity: int = SHARED_CAPACITY) -> None:
+        """
+        Attach to a segment, creating it if no process has yet.
+
+        Args:
+            name: Segment name, the same in every process sharing the table
+            capacity: Agent records in the segment if it is created here;
+                an existing segment keeps its own capacity
+        """
+        self.name = name
+        self._attached = False
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(
+            Path(tempfile.gettempdir()) / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o666
+        )
+        # Slot of each agent ID this process has looked up; records never move
+        self._slots: dict[str, int] = {}
+
+        with self._locked():
+            try:
+                self._shm = shared_memory.SharedMemory(name=name)
+                created = False
+            except FileNotFoundError:
+                size = _RECORDS_OFFSET + capacity * RECORD_SIZE
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                created = True
+            # SharedMemory.buf is only None once the segment is closed
+            self._buf: memoryview = self._shm.buf  # type: ignore[assignment]
+            if created:
+                _LAYOUT.pack_into(self._buf, 0, _MAGIC, capacity, RECORD_SIZE)
+            # The table must outlive this process, not be unlinked when it exits;
+            # the tracker knows the segment by its POSIX name, with a leading slash
+            resource_tracker.unregister(f"/{name}", "shared_memory")
+
+            magic, capacity, record_size = _LAYOUT.unpack_from(self._buf, 0)
+            self.capacity: int = capacity
+        if magic != _MAGIC or record_size != RECORD_SIZE:
+            self._shm.close()
+            os.close(self._lock_fd)
+            raise ValueError(f"Shared memory segment {name} does not hold a compatible agent table")
+        self._attached = True
+
+    # Locking
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the writer lock shared by every process and thread."""
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                if self._attached:
+                    self._repair()
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _writing(self, seq_offset: int) -> Iterator[None]:
+        """Mark the header or a record as being written; caller holds the writer lock."""
+        seq = _SEQ.unpack_from(self._buf, seq_offset)[0]
+        _PENDING.pack_into(self._buf, _PENDING_OFFSET, seq_offset)
+        _SEQ.pack_into(self._buf, seq_offset, seq + 1)
+        try:
+            yield
+        finally:
+            _SEQ.pack_into(self._buf, seq_offset, seq + 2)
+            _PENDING.pack_into(self._buf, _PENDING_OFFSET, 0)
+
+    def _repair(self) -> None:
+        """Even out a sequence number a dead writer left odd; caller holds the writer lock."""
+        (seq_offset,) = _PENDING.unpack_from(self._buf, _PENDING_OFFSET)
+        if not seq_offset:
+            return
+        (seq,) = _SEQ.unpack_from(self._buf, seq_offset)
+        if seq & 1:
+            logger.warning(
+                f"Shared registry {self.name}: "
+                f"repairing an update interrupted at offset {seq_offset}"
+            )
+            _SEQ.pack_into(self._buf, seq_offset, seq + 1)
+        _PENDING.pack_into(self._buf, _PENDING_OFFSET, 0)
+
+    def repair(self) -> None:
+        """Take the writer lock, repairing any update a dead writer left unfinished."""
+        with self._locked():
+            pass
+
+    def _snapshot(self, seq_offset: int, start: int, end: int) -> bytes:
+        """
+        Copy a byte range consistently with its sequence number, without locking.
+
+        Raises:
+            SharedRegistryBusy: If the range was mid-update for every attempt
+        """
+        buf = self._buf
+        for attempt in range(READ_SPINS + READ_SLEEPS):
+            before = _SEQ.unpack_from(buf, seq_offset)[0]
+            if not before & 1:
+                data = bytes(buf[start:end])
+                if _SEQ.unpack_from(buf, seq_offset)[0] == before:
+                    return data
+            if attempt >= READ_SPINS:
+                time.sleep(min(MAX_READ_BACKOFF, READ_BACKOFF * 2 ** (attempt - READ_SPINS)))
+        raise SharedRegistryBusy(
+            f"Shared registry {self.name} stayed mid-update at offset {seq_offset}"
+        )
+
+    # Slots
+
+    def _offset(self, slot: int) -> int:
+        return _RECORDS_OFFSET + slot * RECORD_SIZE
+
+    def _key(self, agent_id: str) -> bytes:
+        key = agent_id.encode("utf-8")
+        if len(key) > _ID_SIZE or b"\0" in key:
+            raise ValueError(f"Agent ID is not storable in the shared registry: {agent_id!r}")
+        return key
+
+    def _probe(self, key: bytes) -> tuple[Optional[int], Optional[int]]:
+        """
+        Find a key's slot; caller holds the writer lock.
+
+        Returns:
+            (slot holding the key, first reusable slot on its probe path)
+        """
+        buf = self._buf
+        start = zlib.crc32(key) % self.capacity
+        reusable = None
+        for step in range(self.capacity):
+            slot = (start + step) % self.capacity
+            offset = self._offset(slot)
+            state = buf[offset + _FIELDS_OFFSET]
+            if state == _EMPTY:
+                return None, slot if reusable is None else reusable
+            if state == _REMOVED:
+                if reusable is None:
+                    reusable = slot
+            elif bytes(buf[offset + _ID_OFFSET : offset + _PROFILE_OFFSET]).rstrip(b"\0") == key:
+                return slot, None
+        return None, reusable
+
+    def _find(self, agent_id: str) -> Optional[int]:
+        """Find an agent's slot without locking."""
+        key = agent_id.encode("utf-8")
+        slot = self._slots.get(agent_id)
+        if slot is not None and self._holds(slot, key):
+            return slot
+        self._slots.pop(agent_id, None)
+
+        start = zlib.crc32(key) % self.capacity
+        for step in range(self.capacity):
+            slot = (start + step) % self.capacity
+            offset = self._offset(slot)
+            head = self._snapshot(offset, offset, _PROFILE_OFFSET + offset)
+            state = head[_FIELDS_OFFSET]
+            if state == _EMPTY:
+                return None
+            if state == _USED and head[_ID_OFFSET:].rstrip(b"\0") == key:
+                self._slots[agent_id] = slot
+                return slot
+        return None
+
+    def _holds(self, slot: int, key: bytes) -> bool:
+        offset = self._offset(slot)
+        head = self._snapshot(offset, offset, _PROFILE_OFFSET + offset)
+        return head[_FIELDS_OFFSET] == _USED and head[_ID_OFFSET:].rstrip(b"\0") == key
+
+    # Header
+
+    def _bump(
+        self,
+        generation: int = 0,
+        messages: int = 0,
+        agents: int = 0,
+        active: int = 0,
+        capable: int = 0,
+        changed: Optional[int] = None,
+        removed: bytes = b"",
+    ) -> tuple[int, int]:
+        """
+        Adjust the header counters under the writer lock.
+
+        Args:
+            changed: Slot to log under the new generation, when it moves
+            removed: ID of the agent removed from that slot, if any
+
+        Returns:
+            (generation, total messages) after the change
+        """
+        with self._writing(_HEADER_SEQ):
+            counters = _COUNTERS.unpack_from(self._buf, _COUNTERS_OFFSET)
+            updated = (
+                counters[0] + generation,
+                counters[1] + messages,
+                counters[2] + agents,
+                counters[3] + active,
+                counters[4] + capable,
+            )
+            _COUNTERS.pack_into(self._buf, _COUNTERS_OFFSET, *updated)
+            if changed is not None:
+                _CHANGE.pack_into(self._buf, self._change_offset(updated[0]), changed, removed)
+        return updated[0], updated[1]
+
+    def _change_offset(self, generation: int) -> int:
+        return _CHANGES_OFFSET + generation % CHANGE_LOG_SIZE * _CHANGE.size
+
+    def _flag_deltas(self, old_flags: int, new_flags: int) -> tuple[int, int]:
+        return (
+            bool(new_flags & _ACTIVE) - bool(old_flags & _ACTIVE),
+            bool(new_flags & _SANSKRIT_CAPABLE) - bool(old_flags & _SANSKRIT_CAPABLE),
+        )
+
+    @property
+    def generation(self) -> int:
+        """Counter that changes whenever agent membership or profiles change."""
+        counters = self._snapshot(_HEADER_SEQ, _COUNTERS_OFFSET, _COUNTERS_OFFSET + _COUNTERS.size)
+        return int(_COUNTERS.unpack(counters)[0])
+
+    def statistics(self) -> tuple[int, int, int, int]:
+        """
+        Read the registry-wide counters as one consistent snapshot.
+
+        Returns:
+            (agents, active agents, Sanskrit-capable agents, total messages)
+        """
+        counters = self._snapshot(_HEADER_SEQ, _COUNTERS_OFFSET, _COUNTERS_OFFSET + _COUNTERS.size)
+        _, total_messages, agents, active, capable = _COUNTERS.unpack(counters)
+        return agents, active, capable, total_messages
+
+    def raise_total_messages(self, total_messages: int) -> None:
+        """
+        Raise the message total to at least a value, e.g. one restored from disk.
+
+        Args:
+            total_messages: Lower bound for the total
+        """
+        with self._locked():
+            current = _COUNTERS.unpack_from(self._buf, _COUNTERS_OFFSET)[1]
+            if total_messages > current:
+                self._bump(messages=total_messages - current)
+
+    # Records
+
+    def put(self, agent: Agent) -> int:
+        """
+        Add an agent, or replace the agent with the same ID.
+
+        Args:
+            agent: Agent to store, with its current statistics
+
+        Returns:
+            The table generation after the change
+        """
+        key = self._key(agent.id)
+        profile = _profile(agent)
+        if len(profile) > _PROFILE_SIZE:
+            raise ValueError(f"Agent profile is too large for the shared registry: {agent.id}")
+        stats = agent.statistics
+        flags = _flags(agent)
+
+        with self._locked():
+            slot, reusable = self._probe(key)
+            if slot is None:
+                if reusable is None:
+                    raise ValueError(
+                        f"Shared registry {self.name} is full ({self.capacity} agents)"
+                    )
+                slot, old_flags, added = reusable, 0, 1
+            else:
+                old_flags, added = self._buf[self._offset(slot) + _FIELDS_OFFSET + 1], 0
+
+            offset = self._offset(slot)
+            with self._writing(offset):
+                _FIELDS.pack_into(
+                    self._buf,
+                    offset + _FIELDS_OFFSET,
+                    _USED,
+                    flags,
+                    stats.messages_sent,
+                    stats.messages_received,
+                    stats.error_count,
+                    1 if stats.average_response_time else 0,
+                    stats.average_response_time,
+                    stats.last_active.timestamp(),
+                    agent.last_seen.timestamp(),
+                )
+                self._buf[offset + _ID_OFFSET : offset + _PROFILE_OFFSET] = key.ljust(
+                    _ID_SIZE, b"\0"
+                )
+                _PROFILE_LEN.pack_into(self._buf, offset + _PROFILE_OFFSET, len(profile))
+                start = offset + _PROFILE_OFFSET + _PROFILE_LEN.size
+                self._buf[start : start + len(profile)] = profile
+            active, capable = self._flag_deltas(old_flags, flags)
+            generation, _ = self._bump(
+                generation=1, agents=added, active=active, capable=capable, changed=slot
+            )
+        self._slots[agent.id] = slot
+        return generation
+
+    def remove(self, agent_id: str) -> Optional[int]:
+        """
+        Remove an agent.
+
+        Args:
+            agent_id: Agent to remove
+
+        Returns:
+            The table generation after the change, or None if it was absent
+        """
+        with self._locked():
+            slot, _ = self._probe(self._key(agent_id))
+            if slot is None:
+                return None
+            offset = self._offset(slot)
+            old_flags = self._buf[offset + _FIELDS_OFFSET + 1]
+            with self._writing(offset):
+                self._buf[offset + _FIELDS_OFFSET] = _REMOVED
+            active, capable = self._flag_deltas(old_flags, 0)
+            generation, _ = self._bump(
+                generation=1,
+                agents=-1,
+                active=active,
+                capable=capable,
+                changed=slot,
+                removed=self._key(agent_id),
+            )
+        self._slots.pop(agent_id, None)
+        return generation
+
+    def set_active(self, agent_id: str, active: bool) -> Optional[int]:
+        """
+        Activate or deactivate an agent.
+
+        Args:
+            agent_id: Agent to change
+            active: New active state
+
+        Returns:
+            The table generation after the change, or None if the agent is absent
+        """
+        with self._locked():
+            slot, _ = self._probe(self._key(agent_id))
+            if slot is None:
+                return None
+            flags_offset = self._offset(slot) + _FIELDS_OFFSET + 1
+            old_flags = self._buf[flags_offset]
+            flags = old_flags | _ACTIVE if active else old_flags & ~_ACTIVE
+            with self._writing(self._offset(slot)):
+                self._buf[flags_offset] = flags
+            delta, _ = self._flag_deltas(old_flags, flags)
+            generation, _ = self._bump(generation=1, active=delta, changed=slot)
+        return generation
+
+    def _update(self, slot: int, change: Callable[[list], None]) -> tuple:
+        """Rewrite a record's fields through a function; caller holds the writer lock."""
+        offset = self._offset(slot)
+        with self._writing(offset):
+            fields = list(_FIELDS.unpack_from(self._buf, offset + _FIELDS_OFFSET))
+            change(fields)
+            _FIELDS.pack_into(self._buf, offset + _FIELDS_OFFSET, *fields)
+        return tuple(fields)
+
+    def add_message(
+        self, from_agent_id: str, to_agent_ids: Iterable[str], touch_receivers: bool = True
+    ) -> int:
+        """
+        Count one message in the sender's, receivers' and registry totals.
+
+        Args:
+            from_agent_id: Sender agent ID
+            to_agent_ids: Receiver agent IDs
+            touch_receivers: Also update the receivers' last active and
+                last seen times
+
+        Returns:
+            The registry-wide message total after the message
+        """
+        now = datetime.now().timestamp()
+
+        def sent(fields: list) -> None:
+            fields[2] += 1
+            fields[7] = fields[8] = now
+
+        def received(fields: list) -> None:
+            fields[3] += 1
+            if touch_receivers:
+                fields[7] = fields[8] = now
+
+        with self._locked():
+            updates = itertools.chain(
+                [(from_agent_id, sent)], ((agent_id, received) for agent_id in to_agent_ids)
+            )
+            for agent_id, change in updates:
+                slot = self._find(agent_id)
+                if slot is not None:
+                    self._update(slot, change)
+            _, total_messages = self._bump(messages=1)
+        return total_messages
+
+    def add_response(
+        self, agent_id: str, seconds: Optional[float], error: bool = False
+    ) -> Optional[tuple[float, int]]:
+        """
+        Count a reply time and/or an error for an agent.
+
+        Args:
+            agent_id: Replying agent
+            seconds: Reply latency, or None when only recording an error
+            error: Whether the message failed
+
+        Returns:
+            (mean reply seconds, error count) after the update, or None if
+            the agent is absent
+        """
+
+        def respond(fields: list) -> None:
+            if seconds is not None:
+                fields[5] += 1
+                fields[6] += seconds
+            if error:
+                fields[4] += 1
+
+        with self._locked():
+            slot = self._find(agent_id)
+            if slot is None:
+                return None
+            fields = self._update(slot, respond)
+        return (fields[6] / fields[5] if fields[5] else 0.0), fields[4]
+
+    def touch(self, agent_id: str) -> bool:
+        """
+        Set an agent's last seen time to now.
+
+        Args:
+            agent_id: Agent seen
+
+        Returns:
+            True if the agent is in the table
+        """
+        now = datetime.now().timestamp()
+
+        def seen(fields: list) -> None:
+            fields[8] = now
+
+        with self._locked():
+            slot = self._find(agent_id)
+            if slot is None:
+                return False
+            self._update(slot, seen)
+        return True
+
+    def get(self, agent_id: str) -> Optional[Agent]:
+        """
+        Read an agent without locking.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            Agent rebuilt from its record, or None if absent
+        """
+        slot = self._find(agent_id)
+        if slot is None:
+            return None
+        offset = self._offset(slot)
+        record = self._snapshot(offset, offset, offset + RECORD_SIZE)
+        if record[_FIELDS_OFFSET] != _USED:
+            return None
+        return _agent(record)
+
+    def refresh(self, agent: Agent) -> bool:
+        """
+        Copy an agent's shared statistics and last seen time into it.
+
+        The active flag is left alone: changing it moves the generation, and
+        the registry re-indexes the agent when it rescans the table.
+
+        Args:
+            agent: Local copy of the agent to update in place
+
+        Returns:
+            True if the agent is in the table
+
+        Raises:
+            SharedRegistryBusy: If the agent's record stayed mid-update
+        """
+        slot = self._find(agent.id)
+        if slot is None:
+            return False
+        offset = self._offset(slot)
+        head = self._snapshot(offset, offset, offset + _ID_OFFSET)
+        fields = _FIELDS.unpack_from(head, _FIELDS_OFFSET)
+        if fields[0] != _USED:
+            return False
+        agent.statistics, agent.last_seen = _statistics(fields)
+        return True
+
+    def agents(self) -> list[Agent]:
+        """
+        Read every agent without locking.
+
+        Returns:
+            Agents in slot order
+        """
+        agents = []
+        for slot in range(self.capacity):
+            offset = self._offset(slot)
+            if self._buf[offset + _FIELDS_OFFSET] == _EMPTY:
+                continue
+            record = self._snapshot(offset, offset, offset + RECORD_SIZE)
+            if record[_FIELDS_OFFSET] == _USED:
+                agents.append(_agent(record))
+        return agents
+
+    def changes(self, since: int) -> Optional[tuple[int, list[Agent], list[str]]]:
+        """
+        Read what changed after a generation, without locking.
+
+        Only the slots in the change log are read, each once, after the
+        last change logged for it. A record can be newer than the returned
+        generation; its own log entry then repeats it on the next call.
+
+        Args:
+            since: Generation the caller's copy of the table reflects
+
+        Returns:
+            (generation, agents added or changed, IDs of agents removed), or
+            None if the log no longer reaches back to since and every agent
+            must be read with agents()
+
+        Raises:
+            SharedRegistryBusy: If the header or a record stayed mid-update
+        """
+        generation = self.generation
+        if since < 0 or generation - since >= CHANGE_LOG_SIZE:
+            return None
+        log = [
+            _CHANGE.unpack_from(self._buf, self._change_offset(number))
+            for number in range(since + 1, generation + 1)
+        ]
+        # A writer may have been overwriting the oldest entries meanwhile
+        if self.generation - since >= CHANGE_LOG_SIZE:
+            return None
+
+        last = {slot: index for index, (slot, _) in enumerate(log)}
+        changed: dict[str, Agent] = {}
+        removed: set[str] = set()
+        for index, (slot, key) in enumerate(log):
+            agent_id = key.rstrip(b"\0").decode("utf-8")
+            if agent_id:
+                changed.pop(agent_id, None)
+                removed.add(agent_id)
+            if last[slot] != index:
+                continue
+            offset = self._offset(slot)
+            record = self._snapshot(offset, offset, offset + RECORD_SIZE)
+            if record[_FIELDS_OFFSET] == _USED:
+                agent = _agent(record)
+                removed.discard(agent.id)
+                changed[agent.id] = agent
+        return generation, list(changed.values()), sorted(removed)
+
+    def close(self) -> None:
+        """Detach from the segment, leaving it for other processes."""
+        self._attached = False
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Destroy the segment once no process needs it."""
+        segment = shared_memory.SharedMemory(name=self.name)
+        segment.close()
+        segment.unlink()
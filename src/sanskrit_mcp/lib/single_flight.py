@@ -0,0 +1,77 @@
+"""
+Coalescing of identical concurrent calls.
+
+While a call for a key is in flight, further callers with the same key
+wait for it instead of starting their own, and all of them receive its
+result or its exception. The call runs in its own task, so a caller
+being cancelled neither cancels it nor fails the others. A call started
+as cancellable is cancelled once every caller has been, unless one of
+them joined it as not cancellable.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """At most one in-flight call per key, shared by every concurrent caller."""
+
+    def __init__(self) -> None:
+        """Initialize with nothing in flight."""
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        # Per in-flight call: [callers waiting, whether it outlives its callers]
+        self._callers: dict[asyncio.Task, list] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def run(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]], cancellable: bool = False
+    ) -> Any:
+        """
+        Run a call, or join the identical one already running.
+
+        Args:
+            key: Identity of the call; equal keys must mean equal results
+            call: Starts the call when no call with this key is in flight
+            cancellable: Whether this caller lets the call be cancelled when
+                it and every other caller are
+
+        Returns:
+            The call's result; its exception is raised to every caller
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            self._callers[task] = [0, False]
+            task.add_done_callback(lambda done: self._land(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        callers = self._callers[task]
+        callers[0] += 1
+        callers[1] = callers[1] or not cancellable
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if callers[0] == 1 and not callers[1] and not task.done():
+                # Nobody is left waiting: stop the call, and let the next caller start afresh
+                if self._in_flight.get(key) is task:
+                    del self._in_flight[key]
+                task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            callers[0] -= 1
+
+    def _land(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        del self._callers[task]
+        # Mark the exception retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
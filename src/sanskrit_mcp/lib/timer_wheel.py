@@ -0,0 +1,135 @@
+"""
+Hierarchical timer wheel.
+
+Timers are kept in a few levels of 64 slots. Level 0 holds timers due in
+the next 64 ticks, one slot per tick; each higher level covers 64 times
+the span of the one below, and its slots are cascaded down as the wheel
+turns. Scheduling and cancelling are O(1), and advancing costs O(ticks
+elapsed + timers due), independent of how many timers are pending.
+"""
+
+import math
+from typing import Hashable
+
+# Slots per level (a power of two) and number of levels
+SLOT_BITS = 6
+LEVELS = 4
+
+
+class TimerWheel:
+    """Hierarchical timer wheel keyed by arbitrary hashable keys."""
+
+    def __init__(self, tick: float = 1.0, start: float = 0.0, levels: int = LEVELS) -> None:
+        """
+        Initialize an empty wheel.
+
+        Args:
+            tick: Seconds per tick, the timer resolution
+            start: Time of tick 0, in the caller's clock
+            levels: Number of wheel levels
+        """
+        self.tick = tick
+        self.start = start
+        self._slot_count = 1 << SLOT_BITS
+        self._levels = levels
+        self._wheel: list[list[set[Hashable]]] = [
+            [set() for _ in range(self._slot_count)] for _ in range(levels)
+        ]
+        self._current = 0
+        # key -> (absolute expiry tick, level, slot)
+        self._timers: dict[Hashable, tuple[int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def _to_tick(self, moment: float) -> int:
+        return math.ceil((moment - self.start) / self.tick)
+
+    def _place(self, key: Hashable, expires: int, earliest: int) -> None:
+        """Put a timer in the slot matching its distance from the current tick."""
+        # Overdue timers fire on the earliest tick still to be processed
+        expires = max(expires, earliest)
+        delay = expires - self._current
+        for level in range(self._levels):
+            if delay < 1 << (SLOT_BITS * (level + 1)) or level == self._levels - 1:
+                break
+        # Beyond the top level's span: park in the farthest slot, re-placed on cascade
+        placed = min(expires, self._current + (1 << (SLOT_BITS * self._levels)) - 1)
+        slot = (placed >> (SLOT_BITS * level)) & (self._slot_count - 1)
+        self._wheel[level][slot].add(key)
+        self._timers[key] = (expires, level, slot)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Schedule (or reschedule) a timer.
+
+        Args:
+            key: Timer identity; an existing timer with this key is replaced
+            deadline: When the timer fires, in the caller's clock
+        """
+        self.cancel(key)
+        self._place(key, self._to_tick(deadline), self._current + 1)
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel a timer.
+
+        Args:
+            key: Timer to cancel
+
+        Returns:
+            True if a timer was pending
+        """
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        _, level, slot = timer
+        self._wheel[level][slot].discard(key)
+        return True
+
+    def advance(self, now: float) -> list[Hashable]:
+        """
+        Turn the wheel up to a time and collect the timers that fired.
+
+        Args:
+            now: Current time, in the caller's clock
+
+        Returns:
+            Keys of the expired timers
+        """
+        # Only ticks fully passed: a timer never fires before its deadline
+        target = math.floor((now - self.start) / self.tick)
+        if not self._timers:
+            self._current = max(self._current, target)
+            return []
+
+        expired: list[Hashable] = []
+        mask = self._slot_count - 1
+        while self._current < target:
+            self._current += 1
+            tick = self._current
+            # Cascade higher levels whose slot boundary this tick crosses, top
+            # first, so timers can fall through several levels at once
+            for level in range(self._levels - 1, 0, -1):
+                if tick & ((1 << (SLOT_BITS * level)) - 1) == 0:
+                    slot = self._wheel[level][(tick >> (SLOT_BITS * level)) & mask]
+                    pending = list(slot)
+                    slot.clear()
+                    for key in pending:
+                        self._place(key, self._timers[key][0], tick)
+
+            due = self._wheel[0][tick & mask]
+            if due:
+                pending = list(due)
+                due.clear()
+                for key in pending:
+                    expires = self._timers[key][0]
+                    if expires <= tick:
+                        del self._timers[key]
+                        expired.append(key)
+                    else:
+                        self._place(key, expires, tick + 1)
+        return expired
@@ -0,0 +1,163 @@
+"""
+Token and cost accounting for model calls.
+
+Every completed model call is recorded with its estimated prompt tokens
+(known before sending) and the actual prompt and output tokens (reported
+by the backend, else estimated). Calls are attributed to the tool and
+agent on whose behalf they were made, taken from a context variable that
+the server sets per tool call; tasks started within inherit it, so the
+attribution survives coalescing, batching and retries. Per-agent totals
+are kept for the most recently charged agents only.
+
+Estimates count characters: about four per token for Latin script, and
+two per token for Devanagari and other non-ASCII text, which tokenizers
+split more finely.
+"""
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from .types import TokenUsage
+
+# Characters per token for ASCII and for other text
+ASCII_CHARS_PER_TOKEN = 4
+OTHER_CHARS_PER_TOKEN = 2
+# USD per million prompt and output tokens (gemini-2.0-flash list prices)
+INPUT_PRICE = 0.10
+OUTPUT_PRICE = 0.40
+# Agents whose usage is kept, least recently charged dropped first
+MAX_AGENTS = 10000
+
+# (tool, agent) that model calls in the current context are made for
+usage_scope: ContextVar[tuple[Optional[str], Optional[str]]] = ContextVar(
+    "usage_scope", default=(None, None)
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens a text costs.
+
+    Args:
+        text: Prompt or completion text
+
+    Returns:
+        Estimated token count, at least 1
+    """
+    ascii_chars = sum(1 for char in text if char < "\x80")
+    other_chars = len(text) - ascii_chars
+    return ascii_chars // ASCII_CHARS_PER_TOKEN + other_chars // OTHER_CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class _Totals:
+    calls: int = 0
+    estimated_prompt_tokens: int = 0
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+
+
+class TokenLedger:
+    """Token counts and cost, in total and per tool and agent."""
+
+    def __init__(
+        self,
+        input_price: float = INPUT_PRICE,
+        output_price: float = OUTPUT_PRICE,
+        max_agents: int = MAX_AGENTS,
+    ) -> None:
+        """
+        Initialize an empty ledger.
+
+        Args:
+            input_price: USD per million prompt tokens
+            output_price: USD per million output tokens
+            max_agents: Agents whose usage is kept, least recently charged
+                dropped first
+        """
+        self.input_price = input_price
+        self.output_price = output_price
+        self.max_agents = max_agents
+        self._total = _Totals()
+        self._tools: dict[str, _Totals] = {}
+        # Agent ID -> totals, least recently charged first
+        self._agents: OrderedDict[str, _Totals] = OrderedDict()
+
+    def record(self, estimated_prompt_tokens: int, prompt_tokens: int, output_tokens: int) -> None:
+        """
+        Record one completed model call against the current usage scope.
+
+        Args:
+            estimated_prompt_tokens: Prompt tokens estimated before sending
+            prompt_tokens: Prompt tokens actually charged
+            output_tokens: Output tokens actually charged
+        """
+        tool, agent = usage_scope.get()
+        entries = [self._total]
+        if tool:
+            entries.append(self._tools.setdefault(tool, _Totals()))
+        if agent:
+            entries.append(self._agents.setdefault(agent, _Totals()))
+            self._agents.move_to_end(agent)
+            if len(self._agents) > self.max_agents:
+                self._agents.popitem(last=False)
+        for totals in entries:
+            totals.calls += 1
+            totals.estimated_prompt_tokens += estimated_prompt_tokens
+            totals.prompt_tokens += prompt_tokens
+            totals.output_tokens += output_tokens
+
+    def _usage(self, name: str, totals: _Totals) -> TokenUsage:
+        # Prices are per million tokens
+        cost = totals.prompt_tokens * self.input_price + totals.output_tokens * self.output_price
+        return TokenUsage(
+            name=name,
+            calls=totals.calls,
+            estimated_prompt_tokens=totals.estimated_prompt_tokens,
+            prompt_tokens=totals.prompt_tokens,
+            output_tokens=totals.output_tokens,
+            cost_usd=cost / 1e6,
+        )
+
+    def get_total(self) -> TokenUsage:
+        """
+        Get usage across all calls.
+
+        Returns:
+            TokenUsage named "total"
+        """
+        return self._usage("total", self._total)
+
+    def get_tools(self) -> list[TokenUsage]:
+        """
+        Get usage per tool.
+
+        Returns:
+            TokenUsage per tool, most expensive first
+        """
+        usage = [self._usage(tool, totals) for tool, totals in self._tools.items()]
+        return sorted(usage, key=lambda entry: entry.cost_usd, reverse=True)
+
+    def get_agent(self, agent_id: str) -> Optional[TokenUsage]:
+        """
+        Get usage on behalf of one agent.
+
+        Args:
+            agent_id: Agent to look up
+
+        Returns:
+            TokenUsage, or None if no calls were made for the agent
+        """
+        totals = self._agents.get(agent_id)
+        return self._usage(agent_id, totals) if totals else None
+
+    def discard_agent(self, agent_id: str) -> None:
+        """
+        Forget the usage recorded for an agent, as when it is evicted.
+
+        Args:
+            agent_id: Agent to forget
+        """
+        self._agents.pop(agent_id, None)
@@ -0,0 +1,70 @@
+"""
+Akshara and word tokenization for Sanskrit text.
+
+Tokens are reported as (start, end) offsets into the original string, so
+callers can measure, compare and index text without copying substrings.
+An akshara is one orthographic syllable: any consonants joined by virama,
+a consonant or independent vowel, its vowel sign and nasal or visarga
+marks, plus a word-final half consonant (the म् of अहम्).
+"""
+
+import re
+from typing import Iterator, Optional
+
+# Devanagari classes
+_CONSONANT = "[क-हक़-य़ॸ-ॿ]़?"
+_VOWEL = "[ऄ-औॠॡॲ-ॷ]"
+_VOWEL_SIGN = "[ऺऻा-ौॎॏॕ-ॗॢॣ]"
+_MODIFIER = "[ऀ-ः]"
+_VIRAMA = "्"
+
+AKSHARA_RE = re.compile(
+    rf"(?:{_CONSONANT}{_VIRAMA})*(?:{_CONSONANT}{_VOWEL_SIGN}?|{_VOWEL}){_MODIFIER}*"
+    rf"(?:(?:{_CONSONANT}{_VIRAMA})+(?!{_CONSONANT}))?"
+    # Anything else: one character with its combining marks
+    r"|.[̀-ͯऀ-ः़ा-्]*",
+    re.DOTALL,
+)
+
+# Words are runs of anything but whitespace and daṇḍas
+WORD_RE = re.compile(r"[^\s।॥|]+")
+
+Span = tuple[int, int]
+
+
+def akshara_spans(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Span]:
+    """
+    Yield the akshara spans of text[start:end] without slicing it.
+
+    Args:
+        text: Text to tokenize
+        start: Offset to start from
+        end: Offset to stop at (end of text when omitted)
+
+    Returns:
+        Iterator of (start, end) offsets into text
+    """
+    for match in AKSHARA_RE.finditer(text, start, len(text) if end is None else end):
+        if not match.group().isspace():
+            yield match.span()
+
+
+def word_spans(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Span]:
+    """
+    Yield the word spans of text[start:end] without slicing it.
+
+    Args:
+        text: Text to tokenize
+        start: Offset to start from
+        end: Offset to stop at (end of text when omitted)
+
+    Returns:
+        Iterator of (start, end) offsets into text
+    """
+    for match in WORD_RE.finditer(text, start, len(text) if end is None else end):
+        yield match.span()
+
+
+def count_aksharas(text: str, start: int = 0, end: Optional[int] = None) -> int:
+    """Count the aksharas in text[start:end]."""
+    return sum(1 for _ in akshara_spans(text, start, end))
@@ -0,0 +1,336 @@
+"""
+Content-addressed cache for model responses.
+
+Responses are stored under the SHA-256 of the model name and the request
+arguments, so identical requests share one entry whatever their order of
+arrival. Lookups go through two tiers:
+
+- an in-memory LRU of recent entries, answering repeats in microseconds;
+- an optional SQLite database (WAL mode) that survives restarts, bounded
+  by a byte budget with the least recently used entries evicted first.
+
+Every entry carries an expiry time; expired entries are never returned
+and are purged as they are found. All methods are safe to call from
+threads.
+
+Nothing on the event loop waits on disk. Writes to the database are
+write-behind: put() only updates memory and queues the entry, and a
+background thread writes queued entries in one transaction per interval,
+evicting down to the byte budget when it is exceeded. get_async() answers
+from memory inline and reads the database in a worker thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from .types import CacheStatistics
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in memory
+CACHE_SIZE = 1024
+# Seconds an entry stays valid
+CACHE_TTL = 7 * 24 * 3600.0
+# Bytes of response text kept on disk
+CACHE_MAX_BYTES = 100 * 1024 * 1024
+# Share of the disk budget freed when it is exceeded, so eviction is not per insert
+EVICTION_FRACTION = 0.1
+# Seconds between write-behind flushes to the database
+FLUSH_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Derive the content address of a request.
+
+    Args:
+        parts: JSON-serializable request arguments, model name included
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Two-tier (memory LRU, optional SQLite) response cache with TTL and size cap."""
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        capacity: int = CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        max_bytes: int = CACHE_MAX_BYTES,
+        flush_interval: float = FLUSH_INTERVAL,
+    ) -> None:
+        """
+        Initialize the cache, opening (or creating) the database if given.
+
+        Args:
+            path: SQLite database file for the disk tier; memory only when omitted
+            capacity: Entries kept in memory
+            ttl: Seconds an entry stays valid
+            max_bytes: Bytes of response text kept on disk
+            flush_interval: Seconds between writes of queued entries to the database
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        # key -> (expiry time, response)
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # Entries put but not yet written to the database, same layout
+        self._pending: dict[str, tuple[float, str]] = {}
+        # Guards the memory tier, the write queue and the hit counters
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self.path = Path(path) if path else None
+        self._db: Optional[sqlite3.Connection] = None
+        # Guards the database and the disk counters
+        self._db_lock = threading.Lock()
+        self._disk_bytes = 0
+        self._disk_entries = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if self.path:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            with self._db:
+                self._db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+            self._disk_entries, self._disk_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="translation-cache", daemon=True
+            )
+            self._thread.start()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response, reading the database on a memory miss.
+
+        Args:
+            key: Content address from cache_key()
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None or self._db is None:
+            return value
+        return self._get_disk(key, now)
+
+    async def get_async(self, key: str) -> Optional[str]:
+        """
+        Look up a response without blocking the event loop on the database.
+
+        Args:
+            key: Content address from cache_key()
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None or self._db is None:
+            return value
+        return await asyncio.to_thread(self._get_disk, key, now)
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Look up the memory tier and the write queue; counts a miss only without a database."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._memory[key]
+                entry = None
+            if entry is None:
+                # Dropped from memory before its write reached the database
+                entry = self._pending.get(key)
+                if entry is not None and entry[0] > now:
+                    self._remember(key, *entry)
+            if entry is not None and entry[0] > now:
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return entry[1]
+            if self._db is None:
+                self._misses += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look up the database after a memory miss."""
+        with self._db_lock:
+            db = self._db
+            row = None
+            if db is not None:
+                row = db.execute(
+                    "SELECT value, size, expires FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            if db is not None and row is not None:
+                with db:
+                    if row[2] > now:
+                        db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    else:
+                        db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                        self._disk_entries -= 1
+                        self._disk_bytes -= row[1]
+        with self._lock:
+            if row is None or row[2] <= now:
+                self._misses += 1
+                return None
+            value: str = row[0]
+            self._remember(key, row[2], value)
+            self._disk_hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        """
+        Store a response in memory and queue it for the database.
+
+        Args:
+            key: Content address from cache_key()
+            value: Response to cache
+        """
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires, value)
+            if self._db is not None:
+                self._pending[key] = (expires, value)
+
+    def flush(self) -> int:
+        """
+        Write queued entries to the database in one transaction.
+
+        If the write fails, the entries are queued again (behind any put
+        since) for the next flush.
+
+        Returns:
+            Number of entries written
+
+        Raises:
+            sqlite3.Error: If the transaction fails
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        now = time.time()
+        try:
+            with self._db_lock:
+                db = self._db
+                if db is None:
+                    return 0
+                with db:
+                    for key, (expires, value) in pending.items():
+                        size = len(value.encode("utf-8"))
+                        previous = db.execute(
+                            "SELECT size FROM responses WHERE key = ?", (key,)
+                        ).fetchone()
+                        db.execute(
+                            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                            (key, value, size, expires, now),
+                        )
+                        if previous:
+                            self._disk_bytes -= previous[0]
+                        else:
+                            self._disk_entries += 1
+                        self._disk_bytes += size
+                if self._disk_bytes > self.max_bytes:
+                    self._shrink(db)
+        except sqlite3.Error:
+            with self._lock:
+                for key, entry in pending.items():
+                    self._pending.setdefault(key, entry)
+            raise
+        return len(pending)
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logger.error(
+                    f"Translation cache flush failed, retrying in {self.flush_interval:g}s: {e}"
+                )
+
+    def _remember(self, key: str, expires: float, value: str) -> None:
+        """Put an entry in the memory tier; caller holds the lock."""
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _shrink(self, db: sqlite3.Connection) -> None:
+        """Evict least recently used disk entries below the byte budget; caller holds _db_lock."""
+        target = self.max_bytes * (1 - EVICTION_FRACTION)
+        freed, keys = 0, []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._disk_bytes - freed <= target:
+                break
+            keys.append((key,))
+            freed += size
+        with db:
+            db.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self._disk_bytes -= freed
+        self._disk_entries -= len(keys)
+        self._evictions += len(keys)
+
+    def get_statistics(self) -> CacheStatistics:
+        """
+        Get hit and size counters.
+
+        Returns:
+            CacheStatistics for both tiers
+        """
+        # Disk counters are read without the database lock, so a flush never holds this up
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return CacheStatistics(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                hit_rate=(self._memory_hits + self._disk_hits) / lookups if lookups else 0.0,
+                memory_entries=len(self._memory),
+                disk_entries=self._disk_entries,
+                disk_bytes=self._disk_bytes,
+                evictions=self._evictions,
+            )
+
+    def close(self) -> None:
+        """Stop the flush thread, write queued entries and close the database, if any."""
+        if self._thread is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            with self._db_lock:
+                if self._db is not None:
+                    self._db.close()
+                    self._db = None
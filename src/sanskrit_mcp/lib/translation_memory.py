@@ -0,0 +1,231 @@
+"""
+Translation memory of aligned source/target segments.
+
+Segments come from the corpus (each passage's Sanskrit and translation,
+in both directions) and from past model translations. A lookup finds
+the stored segment most similar to a text: exact matches through a hash
+of the text's exact form, fuzzy ones through an inverted index of
+character trigrams of its folded form, scored by the Dice coefficient.
+A length filter skips segments too long or short to reach the
+threshold, so a lookup touches only the postings of its own trigrams.
+
+Sanskrit is compared as lower-case NFC IAST without punctuation, daṇḍas
+or word breaks, so Devanagari and IAST spellings match however sandhi
+is written. Only the exact form keeps the diacritics: the folded form
+also drops them (and reads ASCII sh as s) so that plain ASCII spellings
+are still found, but texts that differ only there (kāla and kala) are
+fuzzy matches scored below 1.0. English is compared in lower case
+without punctuation.
+"""
+
+import difflib
+import re
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Iterable
+
+from .transliteration import DEVANAGARI, IAST, detect_scheme, transliterate
+from .types import MemoryMatch, MemoryStatistics, VedicPassage
+
+# Dice similarity at or above which a match is used as the translation
+MATCH_THRESHOLD = 0.95
+# Dice similarity at or above which a match is passed to the model as a hint
+HINT_THRESHOLD = 0.6
+# Past translations kept; corpus segments are always kept
+MEMORY_CAPACITY = 10000
+# Characters per n-gram
+NGRAM = 3
+# Origin of segments learned from model translations
+LEARNED = "translation"
+
+SANSKRIT_TO_ENGLISH = "sanskrit-to-english"
+ENGLISH_TO_SANSKRIT = "english-to-sanskrit"
+
+_NON_WORD = re.compile(r"[^\w\s]|_|\d")
+_SPACES = re.compile(r"\s+")
+
+
+def _exact_form(text: str, direction: str) -> str:
+    """Reduce a source text to the form exact matches are looked up by."""
+    text = text.lower()
+    if direction == SANSKRIT_TO_ENGLISH:
+        if detect_scheme(text) == DEVANAGARI:
+            text = transliterate(text, IAST, DEVANAGARI)
+        # Word breaks are editorial in Sanskrit
+        return _SPACES.sub("", _NON_WORD.sub("", unicodedata.normalize("NFC", text)))
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", text)).strip()
+
+
+def _folded_form(exact: str, direction: str) -> str:
+    """Reduce an exact form to the form fuzzy matches are scored in."""
+    if direction != SANSKRIT_TO_ENGLISH:
+        return exact
+    # ś and ṣ fold to s, as does ASCII sh
+    folded = "".join(c for c in unicodedata.normalize("NFD", exact) if not unicodedata.combining(c))
+    return folded.replace("sh", "s")
+
+
+def _ngrams(normalized: str) -> set[str]:
+    padded = f" {normalized} "
+    return {padded[i : i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class TranslationMemory:
+    """Exact and fuzzy lookup of previously translated segments."""
+
+    def __init__(
+        self, capacity: int = MEMORY_CAPACITY, hint_threshold: float = HINT_THRESHOLD
+    ) -> None:
+        """
+        Initialize an empty memory.
+
+        Args:
+            capacity: Past translations kept, oldest dropped first
+            hint_threshold: Lowest similarity a lookup returns
+        """
+        self.capacity = capacity
+        self.hint_threshold = hint_threshold
+        # id -> (direction, exact source, source, target, origin, n-grams of folded source)
+        self._segments: dict[int, tuple[str, str, str, str, str, frozenset[str]]] = {}
+        # (direction, exact source) -> id
+        self._exact: dict[tuple[str, str], int] = {}
+        # (direction, n-gram) -> ids
+        self._postings: dict[tuple[str, str], set[int]] = {}
+        # Ids of past translations, oldest first
+        self._learned: OrderedDict[int, None] = OrderedDict()
+        self._next_id = 0
+        self._exact_hits = 0
+        self._fuzzy_hits = 0
+        self._misses = 0
+
+    def add(self, source: str, target: str, direction: str, origin: str = LEARNED) -> None:
+        """
+        Store an aligned segment, replacing any with the same exact source.
+
+        Args:
+            source: Source text
+            target: Its translation
+            direction: 'sanskrit-to-english' or 'english-to-sanskrit'
+            origin: Where the segment comes from; LEARNED for past model
+                translations, which are subject to the capacity
+        """
+        exact = _exact_form(source, direction)
+        if not exact or not target.strip():
+            return
+        previous = self._exact.get((direction, exact))
+        if previous is not None:
+            self._forget(previous)
+
+        segment_id = self._next_id
+        self._next_id += 1
+        grams = frozenset(_ngrams(_folded_form(exact, direction)))
+        self._segments[segment_id] = (direction, exact, source, target.strip(), origin, grams)
+        self._exact[(direction, exact)] = segment_id
+        for gram in grams:
+            self._postings.setdefault((direction, gram), set()).add(segment_id)
+
+        if origin == LEARNED:
+            self._learned[segment_id] = None
+            while len(self._learned) > self.capacity:
+                self._forget(next(iter(self._learned)))
+
+    def add_passages(self, passages: Iterable[VedicPassage]) -> int:
+        """
+        Store the corpus's Sanskrit/translation pairs in both directions.
+
+        Args:
+            passages: Corpus passages
+
+        Returns:
+            Number of passages stored
+        """
+        count = 0
+        for passage in passages:
+            ref = passage.reference
+            origin = (
+                f"{ref.text} {ref.chapter}.{ref.verse}" if ref.chapter and ref.verse else ref.text
+            )
+            self.add(passage.sanskrit, passage.translation, SANSKRIT_TO_ENGLISH, origin)
+            self.add(passage.translation, passage.sanskrit, ENGLISH_TO_SANSKRIT, origin)
+            count += 1
+        return count
+
+    def _forget(self, segment_id: int) -> None:
+        segment = self._segments.pop(segment_id, None)
+        self._learned.pop(segment_id, None)
+        if segment is None:
+            return
+        direction, exact, *_, grams = segment
+        if self._exact.get((direction, exact)) == segment_id:
+            del self._exact[(direction, exact)]
+        for gram in grams:
+            ids = self._postings[(direction, gram)]
+            ids.discard(segment_id)
+            if not ids:
+                del self._postings[(direction, gram)]
+
+    def lookup(self, text: str, direction: str, limit: int = 3) -> list[MemoryMatch]:
+        """
+        Find the stored segments most similar to a text.
+
+        Args:
+            text: Source text to translate
+            direction: 'sanskrit-to-english' or 'english-to-sanskrit'
+            limit: Most matches to return
+
+        Returns:
+            Matches at or above the hint threshold, most similar first
+        """
+        exact = _exact_form(text, direction)
+        exact_id = self._exact.get((direction, exact))
+        if exact_id is not None:
+            self._exact_hits += 1
+            return [self._match(exact_id, 1.0)]
+
+        grams = _ngrams(_folded_form(exact, direction)) if exact else set()
+        if not grams:
+            self._misses += 1
+            return []
+        # Dice >= t needs the other set's size within [t / (2 - t), (2 - t) / t] of ours
+        t = self.hint_threshold
+        low, high = len(grams) * t / (2 - t), len(grams) * (2 - t) / t
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._postings.get((direction, gram), ()))
+
+        matches = []
+        for segment_id, count in shared.items():
+            size = len(self._segments[segment_id][5])
+            if low <= size <= high:
+                score = 2 * count / (len(grams) + size)
+                if score == 1.0:
+                    # Same once folded, but not exactly: score the exact forms instead
+                    stored = self._segments[segment_id][1]
+                    score = difflib.SequenceMatcher(None, exact, stored).ratio()
+                if score >= t:
+                    matches.append((score, segment_id))
+        if not matches:
+            self._misses += 1
+            return []
+        self._fuzzy_hits += 1
+        matches.sort(reverse=True)
+        return [self._match(segment_id, score) for score, segment_id in matches[:limit]]
+
+    def _match(self, segment_id: int, score: float) -> MemoryMatch:
+        _, _, source, target, origin, _ = self._segments[segment_id]
+        return MemoryMatch(source=source, target=target, score=score, origin=origin)
+
+    def get_statistics(self) -> MemoryStatistics:
+        """
+        Get segment and lookup counters.
+
+        Returns:
+            MemoryStatistics
+        """
+        return MemoryStatistics(
+            segments=len(self._segments),
+            learned=len(self._learned),
+            exact_hits=self._exact_hits,
+            fuzzy_hits=self._fuzzy_hits,
+            misses=self._misses,
+        )
@@ -0,0 +1,351 @@
+"""
+Table-driven transliteration between Sanskrit encoding schemes.
+
+Supports Devanagari, IAST, SLP1, ITRANS and Harvard-Kyoto (HK). Every
+scheme is described as a table of phonemes; for each (source, target)
+pair those tables are compiled once into a longest-match trie (expressed
+as a regular expression) plus a flat lookup table from source syllable
+to target syllable, so conversion is a single ``re.sub`` pass. Converted
+words are memoized per pair, since running text repeats words heavily.
+
+The Vedic ळ (ḷ) and ळ्ह (ḷh) are covered by every scheme. HK spells the
+vowel ḷ as "lR", which is also l + ṛ; it is read as the vowel, so लृ is
+the one syllable HK cannot round-trip.
+"""
+
+import re
+from functools import cache, lru_cache
+from itertools import product
+from typing import Callable, Iterable, Optional
+
+DEVANAGARI = "devanagari"
+IAST = "iast"
+SLP1 = "slp1"
+ITRANS = "itrans"
+HK = "hk"
+
+SCHEMES = (DEVANAGARI, IAST, SLP1, ITRANS, HK)
+# What detect_scheme reports for text in neither Devanagari nor Roman letters
+UNKNOWN = "unknown"
+
+# Phoneme inventory, keyed by SLP1 (one character per phoneme), except the
+# Vedic ḷh, whose SLP1 letter "|" already keys the daṇḍa.
+VOWELS = ("a", "A", "i", "I", "u", "U", "f", "F", "x", "X", "e", "E", "o", "O")
+# fmt: off
+CONSONANTS = (
+    "k", "K", "g", "G", "N",
+    "c", "C", "j", "J", "Y",
+    "w", "W", "q", "Q", "R",
+    "t", "T", "d", "D", "n",
+    "p", "P", "b", "B", "m",
+    "y", "r", "l", "v",
+    "S", "z", "s", "h",
+    "L", "Lh",
+)
+# fmt: on
+MARKS = ("M", "H", "~", "'", "|", "||") + tuple("0123456789")
+
+# Devanagari spellings: independent vowel, dependent sign (mātrā), consonant, marks.
+_DEVANAGARI_VOWELS = dict(zip(VOWELS, "अआइईउऊऋॠऌॡएऐओऔ"))
+_DEVANAGARI_MATRAS = dict(
+    zip(VOWELS, ["", "ा", "ि", "ी", "ु", "ू", "ृ", "ॄ", "ॢ", "ॣ", "े", "ै", "ो", "ौ"])
+)
+_DEVANAGARI_CONSONANTS = {
+    **dict(zip(CONSONANTS, "कखगघङचछजझञटठडढणतथदधनपफबभमयरलवशषसह")),
+    "L": "ळ",
+    "Lh": "ळ्ह",
+}
+_DEVANAGARI_MARKS = dict(zip(MARKS, ["ं", "ः", "ँ", "ऽ", "।", "॥"] + list("०१२३४५६७८९")))
+VIRAMA = "्"
+
+# Roman schemes: each phoneme maps to a tuple of spellings, canonical first.
+# fmt: off
+_ROMAN_TABLES: dict[str, dict[str, tuple[str, ...]]] = {
+    IAST: {
+        "a": ("a",), "A": ("ā",), "i": ("i",), "I": ("ī",), "u": ("u",), "U": ("ū",),
+        "f": ("ṛ",), "F": ("ṝ",), "x": ("ḷ",), "X": ("ḹ",),
+        "e": ("e",), "E": ("ai",), "o": ("o",), "O": ("au",),
+        "k": ("k",), "K": ("kh",), "g": ("g",), "G": ("gh",), "N": ("ṅ",),
+        "c": ("c",), "C": ("ch",), "j": ("j",), "J": ("jh",), "Y": ("ñ",),
+        "w": ("ṭ",), "W": ("ṭh",), "q": ("ḍ",), "Q": ("ḍh",), "R": ("ṇ",),
+        "t": ("t",), "T": ("th",), "d": ("d",), "D": ("dh",), "n": ("n",),
+        "p": ("p",), "P": ("ph",), "b": ("b",), "B": ("bh",), "m": ("m",),
+        "y": ("y",), "r": ("r",), "l": ("l",), "v": ("v",),
+        "S": ("ś",), "z": ("ṣ",), "s": ("s",), "h": ("h",), "L": ("ḷ",), "Lh": ("ḷh",),
+        "M": ("ṃ", "ṁ"), "H": ("ḥ",), "~": ("m̐",), "'": ("'",), "|": ("|",), "||": ("||",),
+    },
+    SLP1: {
+        **{p: (p,) for p in VOWELS + CONSONANTS},
+        "Lh": ("|",),
+        "M": ("M",), "H": ("H",), "~": ("~",), "'": ("'",), "|": (".",), "||": ("..",),
+    },
+    ITRANS: {
+        "a": ("a",), "A": ("A", "aa"), "i": ("i",), "I": ("I", "ii"), "u": ("u",),
+        "U": ("U", "uu"), "f": ("RRi", "R^i"), "F": ("RRI", "R^I"), "x": ("LLi", "L^i"),
+        "X": ("LLI", "L^I"), "e": ("e",), "E": ("ai",), "o": ("o",), "O": ("au",),
+        "k": ("k",), "K": ("kh",), "g": ("g",), "G": ("gh",), "N": ("~N",),
+        "c": ("ch",), "C": ("Ch", "chh"), "j": ("j",), "J": ("jh",), "Y": ("~n",),
+        "w": ("T",), "W": ("Th",), "q": ("D",), "Q": ("Dh",), "R": ("N",),
+        "t": ("t",), "T": ("th",), "d": ("d",), "D": ("dh",), "n": ("n",),
+        "p": ("p",), "P": ("ph",), "b": ("b",), "B": ("bh",), "m": ("m",),
+        "y": ("y",), "r": ("r",), "l": ("l",), "v": ("v", "w"),
+        "S": ("sh",), "z": ("Sh", "shh"), "s": ("s",), "h": ("h",), "L": ("L",), "Lh": ("Lh",),
+        "M": ("M", ".n"), "H": ("H",), "~": (".N",), "'": (".a",), "|": ("|",), "||": ("||",),
+    },
+    HK: {
+        "a": ("a",), "A": ("A",), "i": ("i",), "I": ("I",), "u": ("u",), "U": ("U",),
+        "f": ("R",), "F": ("RR",), "x": ("lR",), "X": ("lRR",),
+        "e": ("e",), "E": ("ai",), "o": ("o",), "O": ("au",),
+        "k": ("k",), "K": ("kh",), "g": ("g",), "G": ("gh",), "N": ("G",),
+        "c": ("c",), "C": ("ch",), "j": ("j",), "J": ("jh",), "Y": ("J",),
+        "w": ("T",), "W": ("Th",), "q": ("D",), "Q": ("Dh",), "R": ("N",),
+        "t": ("t",), "T": ("th",), "d": ("d",), "D": ("dh",), "n": ("n",),
+        "p": ("p",), "P": ("ph",), "b": ("b",), "B": ("bh",), "m": ("m",),
+        "y": ("y",), "r": ("r",), "l": ("l",), "v": ("v",),
+        "S": ("z",), "z": ("S",), "s": ("s",), "h": ("h",), "L": ("L",), "Lh": ("Lh",),
+        "M": ("M",), "H": ("H",), "~": ("~",), "'": ("'",), "|": ("|",), "||": ("||",),
+    },
+}
+# fmt: on
+for _table in _ROMAN_TABLES.values():
+    for _digit in "0123456789":
+        _table[_digit] = (_digit,)
+
+# Characters that mark text as IAST rather than plain ASCII.
+_IAST_MARKERS = frozenset("āīūṛṝḷḹṅñṭḍṇśṣṃṁḥ")
+
+_DEVANAGARI_RE = re.compile(r"[ऀ-ॿ]")
+# A capital after a lower-case letter within a word, as HK writes long vowels
+# and retroflexes (rAma, kRSNa); English words are capitalized at the front
+_HK_CAPITAL_RE = re.compile(r"[a-z][A-Za-z]*[A-Z]")
+_ASCII_LETTER_RE = re.compile(r"[A-Za-z]")
+_WORD_RE = re.compile(r"\S+")
+
+# Distinct words remembered per scheme pair.
+WORD_CACHE_SIZE = 65536
+
+# A unit is one output-independent piece of text: a consonant with its
+# vowel (None meaning virama), a standalone vowel, or a mark.
+_Unit = tuple[str, str, Optional[str]]
+
+
+def _units() -> list[_Unit]:
+    """Enumerate every unit of the shared phoneme inventory."""
+    units: list[_Unit] = []
+    for consonant in CONSONANTS:
+        units.append(("C", consonant, None))
+        units.extend(("C", consonant, vowel) for vowel in VOWELS)
+    units.extend(("V", vowel, None) for vowel in VOWELS)
+    units.extend(("O", mark, None) for mark in MARKS)
+    return units
+
+
+def _spellings(scheme: str, unit: _Unit) -> list[str]:
+    """Return all spellings of a unit in a scheme, canonical first."""
+    kind, phoneme, vowel = unit
+    if scheme == DEVANAGARI:
+        if kind == "V":
+            return [_DEVANAGARI_VOWELS[phoneme]]
+        if kind == "O":
+            return [_DEVANAGARI_MARKS[phoneme]]
+        base = _DEVANAGARI_CONSONANTS[phoneme]
+        return [base + (VIRAMA if vowel is None else _DEVANAGARI_MATRAS[vowel])]
+
+    table = _ROMAN_TABLES[scheme]
+    if kind != "C" or vowel is None:
+        return list(table[phoneme])
+    return ["".join(parts) for parts in product(table[phoneme], table[vowel])]
+
+
+def _trie_pattern(keys: Iterable[str]) -> str:
+    """
+    Compile keys into a trie-shaped regular expression.
+
+    Branches are greedy, so the engine always prefers the longest key
+    that matches at a position, and each node only branches on distinct
+    next characters.
+    """
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def emit(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if terminal else body
+
+    return emit(trie)
+
+
+@cache
+def _compile(source: str, target: str) -> Callable[[re.Match[str]], str]:
+    """
+    Build the converter for a scheme pair.
+
+    Returns a ``re.sub`` callback that converts one whitespace-delimited
+    word; no unit of any scheme spans whitespace, so words convert
+    independently and can be cached.
+    """
+    lookup: dict[str, str] = {}
+    # Where one spelling reads as two units, the standalone vowel wins: HK
+    # "lR" is ḷ rather than l + ṛ, and IAST "ḷ" before a consonant is the
+    # vowel rather than Vedic ḷ (which is read as such before a vowel)
+    for unit in sorted(_units(), key=lambda unit: unit[0] != "V"):
+        rendered = _spellings(target, unit)[0]
+        for spelling in _spellings(source, unit):
+            lookup.setdefault(spelling, rendered)
+
+    # A bare Devanagari consonant is already the unit carrying inherent 'a'
+    # (its mātrā is empty). The oṃ ligature is romanized as o + anusvāra and
+    # restored when that spelling stands as a word of its own.
+    om = "ॐ"
+    om_words: dict[str, str] = {}
+    if source == DEVANAGARI:
+        lookup[om] = (
+            _spellings(target, ("V", "o", None))[0] + _spellings(target, ("O", "M", None))[0]
+        )
+    elif target == DEVANAGARI:
+        for vowel, anusvara in product(
+            _spellings(source, ("V", "o", None)), _spellings(source, ("O", "M", None))
+        ):
+            om_words[vowel + anusvara] = om
+
+    pattern = re.compile(_trie_pattern(lookup))
+
+    def replace(match: re.Match[str]) -> str:
+        return lookup[match.group()]
+
+    @lru_cache(maxsize=WORD_CACHE_SIZE)
+    def convert_word(word: str) -> str:
+        if word in om_words:
+            return om_words[word]
+        return pattern.sub(replace, word)
+
+    return lambda match: convert_word(match.group())
+
+
+def _check_scheme(scheme: str) -> str:
+    """Normalize and validate a scheme name."""
+    normalized = scheme.lower().replace("-", "").replace("_", "")
+    if normalized == "harvardkyoto":
+        normalized = HK
+    if normalized not in SCHEMES:
+        raise ValueError(f"Unknown transliteration scheme: {scheme} (expected one of {SCHEMES})")
+    return normalized
+
+
+def detect_scheme(text: str) -> str:
+    """
+    Guess the scheme of a text.
+
+    Devanagari is recognised by script; IAST by its diacritics; HK by
+    capitals inside words (rAma, kRSNa). Other plain ASCII (dharma) is
+    also taken as HK, whose lower-case letters read as unmarked IAST
+    does. Text with neither Devanagari nor Roman letters is UNKNOWN.
+    """
+    if _DEVANAGARI_RE.search(text):
+        return DEVANAGARI
+    if not _IAST_MARKERS.isdisjoint(text.lower()):
+        return IAST
+    if _HK_CAPITAL_RE.search(text) or _ASCII_LETTER_RE.search(text):
+        return HK
+    return UNKNOWN
+
+
+def source_scheme(text: str, source: Optional[str] = None) -> str:
+    """
+    Resolve the scheme a text is written in.
+
+    Args:
+        text: Text to convert or analyze
+        source: Scheme name given by the caller (detected when omitted)
+
+    Returns:
+        Normalized scheme name
+
+    Raises:
+        ValueError: If source is not a scheme, or is omitted and cannot be detected
+    """
+    if source:
+        return _check_scheme(source)
+    scheme = detect_scheme(text)
+    if scheme == UNKNOWN:
+        raise ValueError(
+            "Cannot tell which scheme this text is in (it has neither Devanagari nor "
+            f"Roman letters); give the source scheme, one of {SCHEMES}"
+        )
+    return scheme
+
+
+def transliterate(text: str, target: str, source: Optional[str] = None) -> str:
+    """
+    Transliterate text between schemes.
+
+    Args:
+        text: Text to convert
+        target: Target scheme name
+        source: Source scheme name (detected when omitted)
+
+    Returns:
+        Converted text; characters outside the source scheme pass through
+
+    Raises:
+        ValueError: If a scheme is unknown, or source is omitted and cannot be detected
+    """
+    target = _check_scheme(target)
+    source = source_scheme(text, source)
+    if source == target:
+        return text
+
+    return _WORD_RE.sub(_compile(source, target), text)
+
+
+def transliterate_many(texts: list[str], target: str, source: Optional[str] = None) -> list[str]:
+    """
+    Transliterate a batch of texts in one pass.
+
+    All texts share one scheme; when ``source`` is omitted it is detected
+    from the batch as a whole.
+
+    Args:
+        texts: Texts to convert
+        target: Target scheme name
+        source: Source scheme name (detected when omitted)
+
+    Returns:
+        Converted texts in input order
+
+    Raises:
+        ValueError: If a scheme is unknown, or source is omitted and cannot be detected
+    """
+    if not texts:
+        return []
+
+    target = _check_scheme(target)
+    source = source_scheme(" ".join(texts), source)
+    if source == target:
+        return list(texts)
+
+    convert = _compile(source, target)
+
+    # Join on a separator no scheme uses so the whole batch is one sub() call.
+    separator = "\n\x00\n"
+    if any(separator in text for text in texts):
+        return [_WORD_RE.sub(convert, text) for text in texts]
+    return _WORD_RE.sub(convert, separator.join(texts)).split(separator)
+
+
+def scheme_characters(scheme: str) -> frozenset[str]:
+    """Return the set of characters a scheme uses for Sanskrit sounds."""
+    scheme = _check_scheme(scheme)
+    chars: set[str] = set()
+    for unit in _units():
+        for spelling in _spellings(scheme, unit):
+            chars.update(spelling)
+    return frozenset(chars)
@@ -36,6 +36,22 @@ class Severity(str, Enum):
     HIGH = "high"
 
 
+class OverflowPolicy(str, Enum):
+    """What a full agent mailbox does with a new message."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    REJECT = "reject"
+
+
+class CircuitState(str, Enum):
+    """Whether calls to an upstream service are let through."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
 @dataclass
 class SanskritCapabilities:
     """Sanskrit-specific capabilities of an agent."""
@@ -69,6 +85,23 @@ class Agent:
     last_seen: datetime = field(default_factory=datetime.now)
 
 
+@dataclass
+class MorphAnalysis:
+    """Morphological analysis of one word form."""
+
+    word: str
+    stem: str
+    category: Literal["noun", "pronoun", "verb", "indeclinable"]
+    root: Optional[str] = None
+    gender: Optional[str] = None
+    case: Optional[str] = None
+    number: Optional[str] = None
+    person: Optional[str] = None
+    lakara: Optional[str] = None
+    pada: Optional[str] = None
+    guessed: bool = False
+
+
 @dataclass
 class GrammarPatterns:
     """Detected Sanskrit grammar patterns."""
@@ -76,6 +109,24 @@ class GrammarPatterns:
     samasa: int = 0
     vibhakti: int = 0
     dhatu: int = 0
+    morphology: list[MorphAnalysis] = field(default_factory=list)
+
+
+@dataclass
+class SandhiSplit:
+    """One candidate segmentation of a sandhi-joined text."""
+
+    words: list[str]
+    score: float
+
+
+@dataclass
+class MeterAnalysis:
+    """Metrical analysis of a verse."""
+
+    meter: Optional[str]
+    lines: list[str]  # Laghu/guru weights per line, e.g. "LGLGGLLG"
+    syllables: list[int]
 
 
 @dataclass
@@ -200,7 +251,8 @@ class VedicPassage:
     commentaries: tuple[Commentary, ...]  # Use tuple instead of list for hashability
     reliability: float
     keywords: tuple[str, ...]  # Use tuple instead of list for hashability
-    
+    meter: Optional[str] = None  # Set by the corpus when it is indexed
+
     def __hash__(self) -> int:
         """Make VedicPassage hashable."""
         return hash((self.sanskrit, self.reference.text, self.reference.chapter, self.reference.verse))
@@ -243,6 +295,46 @@ class CommunicationLog:
     metadata: Optional[dict[str, Any]] = None
 
 
+@dataclass
+class SessionSummary:
+    """Running aggregates for one conversation session."""
+
+    session_id: str
+    message_count: int = 0
+    failed_count: int = 0
+    first_message: Optional[datetime] = None
+    last_message: Optional[datetime] = None
+    # (from agent, to agent) -> messages
+    flow: dict[tuple[str, str], int] = field(default_factory=dict)
+    response_count: int = 0
+    total_response_time: float = 0.0
+    max_response_time: float = 0.0
+    sandhi: int = 0
+    samasa: int = 0
+    vibhakti: int = 0
+    dhatu: int = 0
+
+    @property
+    def mean_response_time(self) -> float:
+        """Mean seconds between a message and its reply."""
+        return self.total_response_time / self.response_count if self.response_count else 0.0
+
+    @property
+    def participants(self) -> list[str]:
+        """Agents that sent or received messages in this session."""
+        return sorted({agent for pair in self.flow for agent in pair})
+
+
+@dataclass
+class AgentQueryResult:
+    """One page of agents matching a registry query."""
+
+    agents: list[Agent]
+    total: int
+    offset: int
+    limit: int
+
+
 @dataclass
 class RegistryStatistics:
     """Statistics for the agent registry."""
@@ -251,3 +343,123 @@ class RegistryStatistics:
     sanskrit_capable_agents: int
     total_messages: int
     active_sessions: int
+    evicted_agents: int = 0
+
+
+@dataclass
+class MailboxStatistics:
+    """Delivery counters for agent mailboxes."""
+
+    mailboxes: int
+    queued: int
+    capacity: int
+    policy: OverflowPolicy
+    delivered: int
+    received: int
+    dropped: int
+    rejected: int
+
+
+@dataclass
+class CacheStatistics:
+    """Hit and size counters for the translation cache."""
+
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float
+    memory_entries: int
+    disk_entries: int
+    disk_bytes: int
+    evictions: int
+
+
+@dataclass
+class Completion:
+    """A language model's answer to one prompt."""
+
+    text: str
+    prompt_tokens: Optional[int] = None  # Reported by the backend, if it does
+    output_tokens: Optional[int] = None
+
+
+@dataclass
+class TokenUsage:
+    """Model token counts and cost for a tool, an agent or in total."""
+
+    name: str
+    calls: int
+    estimated_prompt_tokens: int
+    prompt_tokens: int
+    output_tokens: int
+    cost_usd: float
+
+
+@dataclass
+class CircuitStatistics:
+    """State and counters of a circuit breaker."""
+
+    state: CircuitState
+    recent_failures: int
+    times_opened: int
+    rejected: int
+
+
+@dataclass
+class LimiterStatistics:
+    """Admission queue, throttling and retry counters for model requests."""
+
+    in_flight: int
+    queued: int
+    max_in_flight: int
+    admitted: int
+    throttled: int
+    retries: int
+    failed: int
+    mean_wait_ms: float
+    p99_wait_ms: float
+
+
+@dataclass
+class MemoryMatch:
+    """A stored segment similar to a text being translated."""
+
+    source: str
+    target: str
+    score: float  # Dice similarity of the normalized sources, 1.0 when identical
+    origin: str  # Corpus reference, or "translation" for a past model translation
+
+
+@dataclass
+class MemoryStatistics:
+    """Segment and lookup counters of a translation memory."""
+
+    segments: int
+    learned: int
+    exact_hits: int
+    fuzzy_hits: int
+    misses: int
+
+
+@dataclass
+class LatencyStatistics:
+    """Latency percentiles and error count for an agent or tool."""
+
+    name: str
+    count: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class AnalyzerStatistics:
+    """Load and latency statistics for a grammar analyzer."""
+
+    name: str
+    loaded: bool
+    load_time_ms: Optional[float]
+    latency: LatencyStatistics
@@ -5,9 +5,13 @@ This module creates an authoritative knowledge base from Vedic texts
 with full source attribution and anti-hallucination safeguards.
 """
 
-from collections import defaultdict
-from typing import Literal
+from collections import Counter, defaultdict
+from typing import Literal, Optional
 
+from .chandas import analyze_meters
+from .token_usage import estimate_tokens
+from .tokenizer import word_spans
+from .transliteration import DEVANAGARI, IAST, detect_scheme, transliterate, transliterate_many
 from .types import Commentary, QueryResult, VedicPassage, VedicTextReference
 
 
@@ -21,9 +25,14 @@ ic texts."""
         self.corpus: dict[str, list[VedicPassage]] = {}
         self.indexed_keywords: dict[str, list[VedicPassage]] = defaultdict(list)
         self.concept_graph: dict[str, list[str]] = {}
+        # Sanskrit words of each passage, keyed by their IAST spelling
+        self.indexed_sanskrit: dict[str, list[VedicPassage]] = defaultdict(list)
+        self.indexed_meters: dict[str, list[VedicPassage]] = defaultdict(list)
 
         self._initialize_corpus()
         self._build_concept_graph()
+        self._index_sanskrit_terms()
+        self._index_meters()
 
     def _initialize_corpus(self) -> None:
         """Initialize the corpus with key Vedantic texts."""
@@ -171,7 +180,7 @@ ic texts."""
 
         # Gajendra Moksha passages from Śrīmad Bhāgavatam 8.3
         self._add_gajendra_stotram()
-        
+
         # Add Vedānta school-specific passages
         self._add_vedanta_school_passages()
 
@@ -252,10 +261,10 @@ ic texts."""
 
         for passage in passages:
             self._add_passage(passage)
-    
+
     def _add_vedanta_school_passages(self) -> None:
         """Add passages specific to the 5 Vedānta schools."""
-        
+
         # 1. ADVAITA VEDĀNTA - Shankara's Non-Dualism
         self._add_passage(
             VedicPassage(
@@ -281,7 +290,7 @@ ic texts."""
                 keywords=["advaita", "mahavakya", "identity", "brahman", "atman", "maya", "illusion", "one"],
             )
         )
-        
+
         # 2. VISHISHTADVAITA - Ramanuja's Qualified Non-Dualism
         self._add_passage(
             VedicPassage(
@@ -309,7 +318,7 @@ ic texts."""
                 keywords=["vishishtadvaita", "qualified non-dualism", "brahman", "body of god", "real world", "inseparable"],
             )
         )
-        
+
         self._add_passage(
             VedicPassage(
                 sanskrit="अन्तर्यामी",
@@ -336,7 +345,7 @@ ic texts."""
                 keywords=["vishishtadvaita", "antaryami", "inner controller", "god within", "soul master", "part of whole"],
             )
         )
-        
+
         # 3. DVAITA VEDĀNTA - Madhva's Dualism
         self._add_passage(
             VedicPassage(
@@ -364,7 +373,7 @@ ic texts."""
                 keywords=["dvaita", "dualism", "eternal distinction", "jiva", "paramatma", "separate", "servant master"],
             )
         )
-        
+
         self._add_passage(
             VedicPassage(
                 sanskrit="पञ्चभेदा",
@@ -389,7 +398,7 @@ ic texts."""
                 keywords=["dvaita", "five differences", "eternal separation", "real distinctions", "panchabheda"],
             )
         )
-        
+
         # 4. SHUDDHADVAITA - Vallabha's Pure Non-Dualism
         self._add_passage(
             VedicPassage(
@@ -414,7 +423,7 @@ ic texts."""
                 keywords=["shuddhadvaita", "pure non-dualism", "krishna", "real world", "lila", "spark fire", "divine play"],
             )
         )
-        
+
         self._add_passage(
             VedicPassage(
                 sanskrit="अनन्याश्चिन्तयन्तो मां ये जनाः पर्युपासते। तेषां नित्याभियुक्तानां योगक्षेमं वहाम्यहम्॥",
@@ -440,7 +449,7 @@ ic texts."""
                 keywords=["shuddhadvaita", "pushti marga", "grace", "ananya bhakti", "exclusive devotion", "divine care"],
             )
         )
-        
+
         # 5. ACHINTYA BHEDA ABHEDA - Chaitanya's Inconceivable Difference and Non-Difference
         self._add_passage(
             VedicPassage(
@@ -466,7 +475,7 @@ ic texts."""
                 keywords=["achintya bheda abheda", "inconceivable", "one and different", "simultaneously", "transcends logic"],
             )
         )
-        
+
         self._add_passage(
             VedicPassage(
                 sanskrit="सूर्यकान्तोपलस्पर्शविशेषवत्",
@@ -503,9 +512,14 @@ ic texts."""
                 context=passage.context,
                 commentaries=tuple(passage.commentaries),
                 reliability=passage.reliability,
-                keywords=tuple(passage.keywords) if isinstance(passage.keywords, list) else passage.keywords,
+                keywords=(
+                    tuple(passage.keywords)
+                    if isinstance(passage.keywords, list)
+                    else passage.keywords
+                ),
+                meter=passage.meter,
             )
-        
+
         text_key = passage.reference.text.lower().replace(" ", "_")
 
         if text_key not in self.corpus:
@@ -517,6 +531,65 @@ ic texts."""
             key = keyword.lower()
             self.indexed_keywords[key].append(passage)
 
+    def _index_sanskrit_terms(self) -> None:
+        """Index the words of every passage by IAST so any script can query them."""
+        passages = self.all_passages()
+        romanized = transliterate_many([p.sanskrit for p in passages], IAST, DEVANAGARI)
+
+        for passage, text in zip(passages, romanized):
+            words = {text[start:end] for start, end in word_spans(text) if end - start > 2}
+            for word in words:
+                self.indexed_sanskrit[word].append(passage)
+
+    def _index_meters(self) -> None:
+        """Annotate every passage with its meter and index passages by meter."""
+        passages = self.all_passages()
+        for passage, analysis in zip(passages, analyze_meters([p.sanskrit for p in passages])):
+            passage.meter = analysis.meter
+            if analysis.meter:
+                self.indexed_meters[analysis.meter].append(passage)
+
+    def find_passages_by_meter(self, meter: str) -> list[VedicPassage]:
+        """
+        Get the passages composed in a meter.
+
+        Args:
+            meter: Meter name in IAST, e.g. "anuṣṭubh"
+
+        Returns:
+            Matching passages, most reliable first
+        """
+        passages = self.indexed_meters.get(meter.lower(), [])
+        return sorted(passages, key=lambda p: p.reliability, reverse=True)
+
+    def find_passages_by_text(self, text: str, limit: int = 3) -> list[tuple[VedicPassage, int]]:
+        """
+        Get the passages sharing the most words with a Sanskrit text.
+
+        Args:
+            text: Sanskrit in Devanagari or IAST
+            limit: Most passages to return
+
+        Returns:
+            (passage, shared word count) pairs, most shared words first
+        """
+        romanized = self._sanskrit_key(text)
+        words = {romanized[start:end] for start, end in word_spans(romanized) if end - start > 2}
+        shared: Counter[VedicPassage] = Counter()
+        for word in words:
+            shared.update(self.indexed_sanskrit.get(word, []))
+        return shared.most_common(limit)
+
+    def all_passages(self) -> list[VedicPassage]:
+        """Get every passage in the corpus."""
+        return [p for group in self.corpus.values() for p in group]
+
+    def _sanskrit_key(self, word: str) -> str:
+        """Map a query word in Devanagari or IAST to its index key."""
+        if detect_scheme(word) == DEVANAGARI:
+            return transliterate(word, IAST, DEVANAGARI).strip("|'")
+        return word
+
     def _build_concept_graph(self) -> None:
         """Build concept relationships graph."""
         self.concept_graph = {
@@ -534,18 +607,34 @@ ic texts."""
             "maya": ["illusion", "appearance", "unreal", "advaita"],
         }
 
-    async def query_vedic_knowledge(self, query: str) -> QueryResult:
+    async def query_vedic_knowledge(self, query: str, meter: Optional[str] = None) -> QueryResult:
         """
         Query the corpus with anti-hallucination safeguards.
 
         Args:
             query: Natural language query
+            meter: Only return passages in this meter
+
+        Returns:
+            QueryResult with passages, synthesized answer, and confidence metrics
+        """
+        return self.search(query, meter)
+
+    def search(self, query: str, meter: Optional[str] = None) -> QueryResult:
+        """
+        Query the corpus synchronously; safe to run in a worker thread once the corpus is built.
+
+        Args:
+            query: Natural language query
+            meter: Only return passages in this meter
 
         Returns:
             QueryResult with passages, synthesized answer, and confidence metrics
         """
         keywords = self._extract_keywords(query)
         passages = self._find_relevant_passages(keywords)
+        if meter:
+            passages = [p for p in passages if p.meter == meter.lower()]
 
         if not passages:
             return QueryResult(
@@ -572,6 +661,70 @@ ic texts."""
             warnings=self._generate_warnings(passages, confidence),
         )
 
+    def estimate_confidence(self, query: str) -> float:
+        """
+        Estimate a query's confidence from direct index hits alone.
+
+        Skips concept-graph expansion, ranking and answer synthesis, so it
+        is cheap enough to decide on work to start before the query runs.
+        Without the expansion it tends to underestimate.
+
+        Args:
+            query: Natural language query
+
+        Returns:
+            Estimated confidence, 0.0-1.0
+        """
+        passages: set[VedicPassage] = set()
+        for keyword in self._extract_keywords(query):
+            passages.update(self.indexed_keywords.get(keyword, []))
+            passages.update(self.indexed_sanskrit.get(self._sanskrit_key(keyword), []))
+        return self._calculate_confidence(list(passages))
+
+    def prompt_context(self, query: str, passages: list[VedicPassage], max_tokens: int) -> str:
+        """
+        Summarize passages as model prompt context within a token budget.
+
+        Passages are ranked by how many query keywords they match (then by
+        reliability) and added one line each until the budget is spent;
+        commentaries on the most relevant passage follow if room is left.
+
+        Args:
+            query: Natural language query the context is for
+            passages: Candidate passages, e.g. from query_vedic_knowledge
+            max_tokens: Budget for the context, in estimated tokens
+
+        Returns:
+            Context lines, most relevant first; empty if none fit
+        """
+        keywords = self._extract_keywords(query)
+
+        def relevance(passage: VedicPassage) -> tuple[int, float]:
+            words = {k.lower() for k in passage.keywords}
+            text = f"{passage.transliteration} {passage.translation}".lower()
+            matched = sum(
+                1 for k in keywords if k in words or self._sanskrit_key(k) in text or k in text
+            )
+            return matched, passage.reliability
+
+        ranked = sorted(passages, key=relevance, reverse=True)
+        pieces = []
+        for passage in ranked:
+            ref = passage.reference
+            location = f" {ref.chapter}.{ref.verse}" if ref.chapter and ref.verse else ""
+            pieces.append(f'- {ref.text}{location}: "{passage.translation}" ({passage.sanskrit})')
+        if ranked:
+            pieces += [f"- {c.author} ({c.tradition}): {c.text}" for c in ranked[0].commentaries]
+
+        lines, used = [], 0
+        for piece in pieces:
+            cost = estimate_tokens(piece)
+            if used + cost > max_tokens:
+                break
+            lines.append(piece)
+            used += cost
+        return "\n".join(lines)
+
     def _extract_keywords(self, query: str) -> list[str]:
         """Extract keywords from query."""
         common_words = {
@@ -604,6 +757,9 @@ ic texts."""
             direct = self.indexed_keywords.get(keyword, [])
             passages.update(direct)
 
+            # Sanskrit word matches, in whichever script the query used
+            passages.update(self.indexed_sanskrit.get(self._sanskrit_key(keyword), []))
+
             # Concept graph expansion
             related = self.concept_graph.get(keyword, [])
             for related_concept in related:
@@ -684,6 +840,7 @@ ic texts."""
             "texts_count": texts_count,
             "keywords_count": keywords_count,
             "concepts_count": concepts_count,
+            "meters": {meter: len(passages) for meter, passages in self.indexed_meters.items()},
             "coverage": {
                 "upaniṣads": self._get_text_group_count(["upaniṣad"]),
                 "gītā": self._get_text_group_count(["bhagavad"]),
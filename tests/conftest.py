@@ -0,0 +1,60 @@
+"""Helpers shared by the agent registry tests."""
+
+import importlib.util
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sanskrit_mcp.lib.agent_registry import AgentRegistry
+from sanskrit_mcp.lib.types import Agent, SanskritCapabilities
+
+# The shared-memory table locks with fcntl, which Windows lacks
+if importlib.util.find_spec("fcntl") is None:
+    collect_ignore = ["test_shared_registry.py"]
+
+
+def make_agent(
+    agent_id: str, capabilities: list[str], can_write: bool = True, idle: float = 0.0
+) -> Agent:
+    return Agent(
+        id=agent_id,
+        name=agent_id,
+        capabilities=capabilities,
+        sanskrit_capabilities=SanskritCapabilities(can_read=True, can_write=can_write),
+        last_seen=datetime.now() - timedelta(seconds=idle),
+    )
+
+
+def assert_indexes_consistent(registry: AgentRegistry) -> None:
+    """Check index queries and counters against a scan of every agent."""
+    agents = registry.get_all_agents()
+    capabilities = {capability.lower() for agent in agents for capability in agent.capabilities}
+
+    def ids(
+        capability: Optional[str], include_inactive: bool, can_write: Optional[bool]
+    ) -> set[str]:
+        result = registry.find_agents(
+            capabilities=[capability] if capability else None,
+            include_inactive=include_inactive,
+            can_write=can_write,
+            limit=len(agents) + 1,
+        )
+        assert result.total == len(result.agents)
+        return {agent.id for agent in result.agents}
+
+    for capability in [None, *capabilities]:
+        for include_inactive in (False, True):
+            for can_write in (None, True, False):
+                expected = {
+                    agent.id
+                    for agent in agents
+                    if (include_inactive or agent.is_active)
+                    and (
+                        capability is None or capability in [c.lower() for c in agent.capabilities]
+                    )
+                    and (can_write is None or agent.sanskrit_capabilities.can_write == can_write)
+                }
+                assert ids(capability, include_inactive, can_write) == expected
+
+    statistics = registry.get_statistics()
+    assert statistics.total_agents == len(agents)
+    assert statistics.active_agents == sum(agent.is_active for agent in agents)
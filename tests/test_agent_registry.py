@@ -0,0 +1,225 @@
+"""Tests for agent registry eviction and discovery indexes."""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+from conftest import assert_indexes_consistent, make_agent
+
+from sanskrit_mcp.lib import agent_registry
+from sanskrit_mcp.lib.agent_registry import EVICTION_TICK, SESSION_TIMEOUT, AgentRegistry
+from sanskrit_mcp.lib.types import Agent, ComprehensionLevel, Formality
+
+IDLE_TTL = 60.0
+
+
+class FakeClock:
+    """Stand-in for the time module, moved by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(agent_registry, "time", clock)
+    return clock
+
+
+def test_idle_agents_are_evicted(clock: FakeClock) -> None:
+    evicted: list[Agent] = []
+    registry = AgentRegistry(idle_ttl=IDLE_TTL, on_evict=evicted.append)
+    registry.register_agent(make_agent("idle", ["vedic"], idle=2 * IDLE_TTL))
+    registry.register_agent(make_agent("busy", ["chat"]))
+
+    assert registry.evict_idle_agents() == []  # timers only fire as the wheel turns
+    clock.now += EVICTION_TICK
+    assert [agent.id for agent in registry.evict_idle_agents()] == ["idle"]
+    assert [agent.id for agent in evicted] == ["idle"]
+    assert registry.get_agent("idle") is None
+    assert registry.get_statistics().evicted_agents == 1
+    assert_indexes_consistent(registry)
+
+
+def test_agents_seen_since_their_timer_was_set_are_kept(clock: FakeClock) -> None:
+    registry = AgentRegistry(idle_ttl=IDLE_TTL)
+    registry.register_agent(make_agent("idle", ["vedic"], idle=IDLE_TTL - 1))
+    registry.mark_seen("idle")
+
+    clock.now += 2 * EVICTION_TICK
+    assert registry.evict_idle_agents() == []
+    assert registry.get_agent("idle") is not None
+
+
+def test_indexes_survive_eviction_and_slot_reuse(clock: FakeClock) -> None:
+    registry = AgentRegistry(idle_ttl=IDLE_TTL)
+    registry.register_agent(
+        make_agent("scholar", ["Vedic", "grammar"], can_write=False, idle=2 * IDLE_TTL)
+    )
+    registry.register_agent(make_agent("poet", ["poetry"]))
+    registry.deactivate_agent("scholar")
+    assert_indexes_consistent(registry)
+
+    clock.now += EVICTION_TICK
+    registry.evict_idle_agents()
+    # The newcomer takes the evicted agent's slot; none of its bits may linger
+    registry.register_agent(make_agent("newcomer", ["chat"]))
+    registry.register_agent(make_agent("second", ["vedic"], can_write=False))
+    assert registry.find_agents(capabilities=["grammar"], include_inactive=True).total == 0
+    assert_indexes_consistent(registry)
+
+    registry.deactivate_agent("newcomer")
+    registry.activate_agent("newcomer")
+    registry.deactivate_agent("poet")
+    assert_indexes_consistent(registry)
+
+
+def test_evicted_agents_cannot_be_activated(clock: FakeClock) -> None:
+    registry = AgentRegistry(idle_ttl=IDLE_TTL)
+    registry.register_agent(make_agent("idle", ["vedic"], idle=2 * IDLE_TTL))
+    clock.now += EVICTION_TICK
+    registry.evict_idle_agents()
+
+    assert not registry.activate_agent("idle")
+    assert not registry.deactivate_agent("idle")
+    assert_indexes_consistent(registry)
+
+
+def test_state_changes_race_with_reregistration() -> None:
+    registry = AgentRegistry()
+    agent_ids = [f"agent-{n}" for n in range(4)]
+    for agent_id in agent_ids:
+        registry.register_agent(make_agent(agent_id, ["vedic"]))
+    start = threading.Barrier(3)
+
+    def toggle(active: bool) -> None:
+        start.wait()
+        for _ in range(500):
+            for agent_id in agent_ids:
+                if active:
+                    registry.activate_agent(agent_id)
+                else:
+                    registry.deactivate_agent(agent_id)
+
+    def reregister() -> None:
+        start.wait()
+        for _ in range(500):
+            for agent_id in agent_ids:
+                registry.register_agent(make_agent(agent_id, ["vedic"]))
+
+    threads = [
+        threading.Thread(target=toggle, args=(True,)),
+        threading.Thread(target=toggle, args=(False,)),
+        threading.Thread(target=reregister),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert_indexes_consistent(registry)
+
+
+def test_state_changes_apply_to_the_agent_registered_when_they_run() -> None:
+    registry = AgentRegistry()
+    registry.register_agent(make_agent("scholar", ["vedic"]))
+
+    with registry._lock:
+        deactivate = threading.Thread(target=registry.deactivate_agent, args=("scholar",))
+        deactivate.start()
+        time.sleep(0.05)  # let it block on the lock
+        # Re-registered while the deactivation waits
+        registry._add(make_agent("scholar", ["vedic"]))
+    deactivate.join()
+
+    agent = registry.get_agent("scholar")
+    assert agent is not None and not agent.is_active
+    assert_indexes_consistent(registry)
+
+
+def test_counters_follow_registrations_and_messages() -> None:
+    registry = AgentRegistry()
+    registry.register_agent(make_agent("scholar", ["vedic"]))
+    registry.register_agent(make_agent("poet", ["poetry"], can_write=False))
+    mute = make_agent("mute", ["chat"])
+    mute.sanskrit_capabilities.can_read = mute.sanskrit_capabilities.can_write = False
+    registry.register_agent(mute)
+    registry.deactivate_agent("poet")
+    registry.deactivate_agent("poet")  # already inactive: counted once
+    registry.register_agent(make_agent("scholar", ["vedic"], can_write=False))  # replaced
+    registry.record_message("scholar", "poet")
+    registry.record_broadcast("scholar", ["poet", "mute"])
+
+    statistics = registry.get_statistics()
+    assert (statistics.total_agents, statistics.active_agents) == (3, 2)
+    assert statistics.sanskrit_capable_agents == 2
+    assert statistics.total_messages == 2
+    assert statistics.active_sessions == 2
+    assert_indexes_consistent(registry)
+
+
+def test_messages_expire_idle_sessions(clock: FakeClock) -> None:
+    registry = AgentRegistry()
+    for n in range(100):
+        registry.record_message("scholar", f"student-{n}")
+    clock.now += SESSION_TIMEOUT / 2
+    registry.record_message("scholar", "poet")
+    clock.now += SESSION_TIMEOUT / 2
+    registry.record_broadcast("scholar", ["poet"])
+
+    # Only the sessions still active are kept, without reading the statistics
+    assert list(registry._sessions) == ["poet+scholar", "broadcast:scholar"]
+    assert registry.get_statistics().active_sessions == 2
+
+
+def test_filters_combine_with_and_and_values_with_or() -> None:
+    registry = AgentRegistry()
+    profiles = [
+        ("scholar", ["Vedic", "grammar"], Formality.FORMAL, ComprehensionLevel.SCHOLARLY),
+        ("teacher", ["grammar", "chat"], Formality.MODERATE, ComprehensionLevel.ADVANCED),
+        ("student", ["chat"], Formality.CASUAL, ComprehensionLevel.BASIC),
+        ("poet", ["poetry"], Formality.FORMAL, None),
+    ]
+    for agent_id, capabilities, formality, level in profiles:
+        agent = make_agent(agent_id, capabilities)
+        agent.sanskrit_capabilities.formality = formality
+        agent.sanskrit_capabilities.comprehension_level = level
+        registry.register_agent(agent)
+
+    def ids(**filters: Any) -> list[str]:
+        return [agent.id for agent in registry.find_agents(**filters).agents]
+
+    assert ids(capabilities=["GRAMMAR"]) == ["scholar", "teacher"]
+    assert ids(capabilities=["grammar", "vedic"]) == ["scholar"]
+    assert ids(any_capabilities=["vedic", "poetry"]) == ["scholar", "poet"]
+    assert ids(formality=[Formality.FORMAL]) == ["scholar", "poet"]
+    assert ids(
+        any_capabilities=["chat", "poetry"],
+        comprehension_level=[ComprehensionLevel.BASIC, ComprehensionLevel.ADVANCED],
+    ) == ["teacher", "student"]
+    assert ids(capabilities=["unknown"]) == []
+    assert_indexes_consistent(registry)
+
+
+def test_pages_walk_the_matches_in_registration_order() -> None:
+    registry = AgentRegistry()
+    # More agents than fit in a machine word
+    for n in range(150):
+        registry.register_agent(make_agent(f"agent-{n:03d}", ["vedic" if n % 3 else "chat"]))
+    registry.deactivate_agent("agent-001")
+
+    expected = [f"agent-{n:03d}" for n in range(2, 150) if n % 3]
+    seen: list[str] = []
+    offset = 0
+    while True:
+        page = registry.find_agents(capabilities=["vedic"], offset=offset, limit=20)
+        assert page.total == len(expected)
+        if not page.agents:
+            break
+        seen.extend(agent.id for agent in page.agents)
+        offset += page.limit
+    assert seen == expected
@@ -0,0 +1,59 @@
+"""Tests for metrical (chandas) analysis."""
+
+import pytest
+
+from sanskrit_mcp.lib.chandas import analyze_meter, analyze_meters, scan_lines
+
+
+def verse(*lines: str) -> str:
+    """Build a Devanagari verse whose syllable weights follow the given patterns."""
+    return " । ".join("".join("का" if weight == "G" else "क" for weight in line) for line in lines)
+
+
+INDRAVAJRA = "GGLGGLLGLGG"
+UPENDRAVAJRA = "LGLGGLLGLGG"
+VASANTATILAKA = "GGLGLLLGLLGLGG"
+
+
+@pytest.mark.parametrize(
+    ("text", "weights"),
+    [
+        ("रामः कृष्णः", "GGGG"),  # visarga, and a short vowel before a cluster
+        ("अग्निम्", "GG"),  # final consonant
+        ("कमल", "LLL"),
+    ],
+)
+def test_scan_weights(text: str, weights: str) -> None:
+    assert scan_lines(text) == [weights]
+
+
+def test_classic_verses() -> None:
+    gita = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः । मामकाः पाण्डवाश्चैव किमकुर्वत सञ्जय ॥"
+    assert analyze_meter(gita).meter == "anuṣṭubh"
+    rigveda = "अग्निमीळे पुरोहितं यज्ञस्य देवमृत्विजम् । होतारं रत्नधातमम् ॥"
+    analysis = analyze_meter(rigveda)
+    assert analysis.meter == "gāyatrī"
+    assert analysis.syllables == [16, 8]
+
+
+@pytest.mark.parametrize(
+    ("lines", "meter"),
+    [
+        ((INDRAVAJRA * 2, INDRAVAJRA * 2), "indravajrā"),
+        ((INDRAVAJRA + UPENDRAVAJRA, UPENDRAVAJRA + INDRAVAJRA), "upajāti"),
+        ((VASANTATILAKA, VASANTATILAKA), "vasantatilakā"),
+        ((VASANTATILAKA,), "vasantatilakā"),
+    ],
+)
+def test_fixed_pattern_meters(lines: tuple[str, ...], meter: str) -> None:
+    assert analyze_meter(verse(*lines)).meter == meter
+
+
+def test_unrecognised_text() -> None:
+    assert analyze_meter("कख").meter is None
+    assert analyze_meter("").lines == []
+
+
+def test_batch_matches_one_by_one() -> None:
+    texts = [verse(INDRAVAJRA), verse(VASANTATILAKA, VASANTATILAKA), "कख"]
+    assert analyze_meters(texts) == [analyze_meter(text) for text in texts]
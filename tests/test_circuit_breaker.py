@@ -0,0 +1,125 @@
+"""Tests for the circuit breaker's state changes."""
+
+import asyncio
+
+import pytest
+
+from sanskrit_mcp.lib import circuit_breaker
+from sanskrit_mcp.lib.circuit_breaker import CircuitBreaker
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient, GeminiUnavailable
+from sanskrit_mcp.lib.types import CircuitState
+
+
+class FakeClock:
+    """Stand-in for the time module, moved by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(failure_threshold=3, failure_window=60.0, reset_timeout=30.0)
+
+
+def open_circuit(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_failures_within_the_window_open_the_circuit(breaker: CircuitBreaker) -> None:
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow()
+
+    statistics = breaker.get_statistics()
+    assert (statistics.times_opened, statistics.rejected) == (1, 1)
+
+
+def test_failures_outside_the_window_do_not_count(
+    breaker: CircuitBreaker, clock: FakeClock
+) -> None:
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 61.0
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_a_successful_probe_closes_the_circuit(breaker: CircuitBreaker, clock: FakeClock) -> None:
+    open_circuit(breaker)
+    clock.now += 30.0
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow()
+
+
+def test_a_failed_probe_reopens_the_circuit(breaker: CircuitBreaker, clock: FakeClock) -> None:
+    open_circuit(breaker)
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.get_statistics().times_opened == 2
+    clock.now += 29.0
+    assert not breaker.allow()
+
+
+def test_an_abandoned_probe_is_retried_after_the_timeout(
+    breaker: CircuitBreaker, clock: FakeClock
+) -> None:
+    open_circuit(breaker)
+    clock.now += 30.0
+    assert breaker.allow()
+    clock.now += 30.0
+    assert breaker.allow()
+
+
+def test_an_open_circuit_keeps_calls_from_the_backend(breaker: CircuitBreaker) -> None:
+    backend = FakeBackend(median_latency=0.0)
+    client = GeminiClient(backend=backend, breaker=breaker)
+    open_circuit(breaker)
+
+    with pytest.raises(GeminiUnavailable):
+        asyncio.run(client.translate_text("सत्यमेव जयते", "sanskrit-to-english"))
+    assert backend.calls == 0
+
+
+def test_spent_budgets_leave_the_circuit_closed(breaker: CircuitBreaker) -> None:
+    backend = FakeBackend(median_latency=0.0)
+    client = GeminiClient(backend=backend, breaker=breaker)
+
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(GeminiUnavailable):
+            asyncio.run(client.generate_content("Explain ṛta", budget=0.0))
+    assert backend.calls == 0
+    assert client.budget_exceeded == breaker.failure_threshold + 1
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_overrun_budgets_leave_the_circuit_closed(breaker: CircuitBreaker) -> None:
+    client = GeminiClient(backend=FakeBackend(median_latency=0.05), breaker=breaker)
+
+    for n in range(breaker.failure_threshold + 1):
+        with pytest.raises(GeminiUnavailable):
+            asyncio.run(client.generate_content(f"Explain ṛta, take {n}", budget=0.001))
+    assert client.budget_exceeded == breaker.failure_threshold + 1
+    assert breaker.state == CircuitState.CLOSED
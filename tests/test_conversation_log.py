@@ -0,0 +1,92 @@
+"""Tests for the bounded, indexed communication log."""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sanskrit_mcp.lib.conversation_log import ConversationLog
+from sanskrit_mcp.lib.types import Language, SanskritMessage
+
+START = datetime(2024, 1, 1, 12, 0)
+
+
+def message(n: int) -> SanskritMessage:
+    return SanskritMessage(
+        id=f"message-{n}",
+        content=f"vākyam {n}",
+        timestamp=START + timedelta(seconds=n),
+        language=Language.SANSKRIT,
+    )
+
+
+def test_replies_are_timed_and_summarized() -> None:
+    log = ConversationLog()
+    log.record("guru", "śiṣya", message(0), "lesson")
+    reply = log.record("śiṣya", "guru", message(3), "lesson")
+    log.record("guru", "śiṣya", message(4), "lesson", success=False)
+
+    assert (reply.communication_type, reply.response_time) == ("response", 3.0)
+    summary = log.get_summary("lesson")
+    assert summary is not None
+    assert (summary.message_count, summary.failed_count, summary.response_count) == (3, 1, 2)
+    assert summary.flow == {("guru", "śiṣya"): 2, ("śiṣya", "guru"): 1}
+    assert summary.max_response_time == 3.0
+    assert [entry.message.id for entry in log.pair_entries("śiṣya", "guru", limit=2)] == [
+        "message-3",
+        "message-4",
+    ]
+    assert [
+        entry.message.id
+        for entry in log.entries_between(message(1).timestamp, START + timedelta(seconds=4))
+    ] == ["message-3"]
+
+
+def test_entries_leaving_the_ring_are_spilled_in_order(tmp_path: Path) -> None:
+    log = ConversationLog(capacity=4, spill_dir=tmp_path, segment_size=3)
+    for n in range(10):
+        log.record("guru", "śiṣya", message(n), "lesson" if n % 2 else "recital")
+
+    assert len(log) == 4
+    assert [entry.message.id for entry in log.session_entries("lesson")] == [
+        "message-7",
+        "message-9",
+    ]
+    spilled = list(log.iter_spilled())
+    assert [record["content"] for record in spilled] == [f"vākyam {n}" for n in range(6)]
+    assert [record["content"] for record in log.iter_spilled("lesson")] == [
+        "vākyam 1",
+        "vākyam 3",
+        "vākyam 5",
+    ]
+    assert len(list(tmp_path.glob("segment-*.jsonl"))) == 2
+    # Summaries still count every message, spilled or not
+    summary = log.get_summary("lesson")
+    assert summary is not None and summary.message_count == 5
+    log.close()
+
+
+def test_a_reopened_log_spills_to_new_segments(tmp_path: Path) -> None:
+    for run in range(2):
+        log = ConversationLog(capacity=1, spill_dir=tmp_path)
+        for n in range(3):
+            log.record("guru", "śiṣya", message(10 * run + n), "lesson")
+        log.close()
+
+    reopened = ConversationLog(spill_dir=tmp_path)
+    assert [record["content"] for record in reopened.iter_spilled()] == [
+        "vākyam 0",
+        "vākyam 1",
+        "vākyam 10",
+        "vākyam 11",
+    ]
+    assert len(list(tmp_path.glob("segment-*.jsonl"))) == 2
+
+
+def test_without_a_spill_directory_old_entries_are_dropped() -> None:
+    log = ConversationLog(capacity=2)
+    for n in range(5):
+        log.record("guru", "śiṣya", message(n), "lesson")
+    assert list(log.iter_spilled()) == []
+    assert [entry.message.id for entry in log.session_entries("lesson")] == [
+        "message-3",
+        "message-4",
+    ]
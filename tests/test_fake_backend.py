@@ -0,0 +1,72 @@
+"""Tests for the offline fake backend and backend pluggability."""
+
+import asyncio
+import json
+import statistics
+
+import pytest
+
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient
+from sanskrit_mcp.lib.llm_backend import TransientBackendError
+from sanskrit_mcp.lib.translation_cache import TranslationCache
+
+
+def test_latency_fits_the_median_and_p99() -> None:
+    backend = FakeBackend(median_latency=0.05, p99_latency=0.5, seed=1)
+    latencies = sorted(backend.latency() for _ in range(20000))
+    assert statistics.median(latencies) == pytest.approx(0.05, rel=0.05)
+    assert latencies[int(0.99 * len(latencies))] == pytest.approx(0.5, rel=0.15)
+
+    assert FakeBackend(median_latency=0.05).latency() == 0.05
+    assert FakeBackend(median_latency=0.0).latency() == 0.0
+
+
+def test_seeded_runs_are_reproducible() -> None:
+    def run() -> list[bool]:
+        backend = FakeBackend(median_latency=0.0, error_rate=0.3, seed=42)
+
+        async def outcomes() -> list[bool]:
+            results = await asyncio.gather(
+                *(backend.complete("prompt") for _ in range(200)), return_exceptions=True
+            )
+            return [isinstance(result, TransientBackendError) for result in results]
+
+        failures = asyncio.run(outcomes())
+        assert backend.errors == sum(failures)
+        return failures
+
+    first = run()
+    assert first == run()
+    assert 40 < sum(first) < 80
+
+
+def test_responses_are_canned_or_echoed() -> None:
+    backend = FakeBackend(median_latency=0.0, responses={"dharma": "duty"})
+
+    async def complete(prompt: str, json_output: bool = False) -> str:
+        return (await backend.complete(prompt, json_output=json_output)).text
+
+    assert asyncio.run(complete("Define dharma")) == "duty"
+    assert asyncio.run(complete('Translate "satyam"')) == "Echo: satyam"
+    items = [{"id": 0, "text": "satyam"}, {"id": 1, "text": "ṛtam"}]
+    reply = asyncio.run(complete(f"Texts (JSON): {json.dumps(items)}", json_output=True))
+    assert json.loads(reply) == [
+        {"id": 0, "translation": "Echo: satyam"},
+        {"id": 1, "translation": "Echo: ṛtam"},
+    ]
+    completion = asyncio.run(backend.complete("Define dharma"))
+    assert completion.prompt_tokens and completion.output_tokens
+
+
+def test_backends_never_share_cache_entries() -> None:
+    cache = TranslationCache()
+    canned = FakeBackend(median_latency=0.0, responses={"satyam": "truth"})
+    canned.name = "canned"
+    echo = FakeBackend(median_latency=0.0)
+
+    first = GeminiClient(backend=canned, cache=cache)
+    second = GeminiClient(backend=echo, cache=cache)
+    assert asyncio.run(first.translate_text("satyam", "sanskrit-to-english")) == "truth"
+    assert asyncio.run(second.translate_text("satyam", "sanskrit-to-english")) == "Echo: satyam"
+    assert (canned.calls, echo.calls) == (1, 1)
@@ -0,0 +1,96 @@
+"""Tests for the Gemini client's batching and streaming, run against fake backends."""
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import BATCH_MAX_ITEMS, GeminiClient, GeminiUnavailable
+from sanskrit_mcp.lib.llm_backend import ChunkCallback, LLMBackend, TransientBackendError
+from sanskrit_mcp.lib.types import Completion
+
+SANSKRIT_TO_ENGLISH = "sanskrit-to-english"
+
+
+class BrokenStream(LLMBackend):
+    """Streams one chunk, then fails as if the connection dropped."""
+
+    name = "broken-stream"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def complete(
+        self, prompt: str, json_output: bool = False, on_chunk: Optional[ChunkCallback] = None
+    ) -> Completion:
+        self.calls += 1
+        if on_chunk is not None:
+            await on_chunk("satyam ")
+        raise TransientBackendError("connection reset")
+
+
+def test_many_texts_share_few_model_calls() -> None:
+    backend = FakeBackend(median_latency=0.0)
+    client = GeminiClient(backend=backend)
+    texts = [f"vākyam {n}" for n in range(2 * BATCH_MAX_ITEMS + 5)]
+
+    results = asyncio.run(client.translate_many(texts + texts[:3], SANSKRIT_TO_ENGLISH))
+    assert results == [f"Echo: {text}" for text in texts + texts[:3]]
+    assert backend.calls == 3  # identical texts are translated once
+
+
+def test_texts_missing_from_a_batch_reply_are_translated_alone() -> None:
+    backend = FakeBackend(
+        median_latency=0.0,
+        responses={"Texts (JSON)": '```json\n[{"id": 0, "translation": "truth"}, {"id": 7}]\n```'},
+    )
+    client = GeminiClient(backend=backend)
+
+    results = asyncio.run(client.translate_many(["satyam", "dharmaḥ", "ṛtam"], SANSKRIT_TO_ENGLISH))
+    assert results == ["truth", "Echo: dharmaḥ", "Echo: ṛtam"]
+    assert backend.calls == 3
+
+
+def test_batch_replies_are_split_defensively() -> None:
+    reply = """[
+        {"id": 0, "translation": " truth "},
+        {"id": 0, "translation": "duplicate"},
+        {"id": 1, "translation": ""},
+        {"id": 5, "translation": "out of range"},
+        {"id": "2", "translation": "not an int"},
+        "stray"
+    ]"""
+    assert GeminiClient._split_batch(reply, 3) == {0: "truth"}
+    assert GeminiClient._split_batch("not json", 3) == {}
+    assert GeminiClient._split_batch('{"id": 0}', 3) == {}
+
+
+def test_streamed_chunks_add_up_to_the_response() -> None:
+    client = GeminiClient(backend=FakeBackend(median_latency=0.01))
+    chunks: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    prompt = "Explain the meaning of satyam eva jayate in the Muṇḍaka Upaniṣad"
+    response = asyncio.run(client.generate_content(prompt, on_chunk=on_chunk))
+    assert len(chunks) > 1
+    assert "".join(chunks) == response
+    (first_token,) = client.first_token.get_statistics()
+    assert (first_token.name, first_token.count) == ("generate_content", 1)
+
+
+def test_a_stream_failing_midway_is_not_retried() -> None:
+    backend = BrokenStream()
+    client = GeminiClient(backend=backend)
+    chunks: list[str] = []
+
+    async def on_chunk(chunk: str) -> None:
+        chunks.append(chunk)
+
+    with pytest.raises(GeminiUnavailable):
+        asyncio.run(client.generate_content("Explain ṛta", on_chunk=on_chunk))
+    # A retry would repeat chunks the caller already has
+    assert backend.calls == 1
+    assert chunks == ["satyam "]
@@ -0,0 +1,21 @@
+"""Tests for the shared grammar analyzers' statistics."""
+
+import pytest
+
+from sanskrit_mcp.lib.grammar_analyzers import GrammarAnalyzers
+
+
+def test_calls_and_failures_land_in_the_latency_histograms() -> None:
+    analyzers = GrammarAnalyzers(preload=False)
+    for word in ("devaH", "rAmaH"):
+        with analyzers.latency.timed(GrammarAnalyzers.MORPHOLOGY):
+            analyzers.morphology.analyze(word)
+    with pytest.raises(KeyError), analyzers.latency.timed(GrammarAnalyzers.MORPHOLOGY):
+        raise KeyError("devaH")
+
+    morphology, sandhi = analyzers.get_statistics()
+    assert morphology.loaded and morphology.load_time_ms is not None
+    assert (morphology.latency.count, morphology.latency.errors) == (3, 1)
+    assert morphology.latency.p50_ms <= morphology.latency.max_ms
+    assert not sandhi.loaded and sandhi.load_time_ms is None
+    assert (sandhi.name, sandhi.latency.count) == (GrammarAnalyzers.SANDHI, 0)
@@ -0,0 +1,108 @@
+"""Tests for per-agent mailboxes and their overflow policies."""
+
+import asyncio
+from datetime import datetime
+
+from sanskrit_mcp.lib.mailbox import MailboxHub
+from sanskrit_mcp.lib.types import CommunicationLog, Language, OverflowPolicy, SanskritMessage
+
+
+def entry(n: int) -> CommunicationLog:
+    message = SanskritMessage(
+        id=f"m{n}", content=f"नमः {n}", timestamp=datetime.now(), language=Language.SANSKRIT
+    )
+    return CommunicationLog(
+        id=f"log{n}",
+        timestamp=message.timestamp,
+        from_agent="sender",
+        to_agent="receiver",
+        message=message,
+        translated_message=None,
+        communication_type="direct",
+        session_id="s",
+        success=True,
+    )
+
+
+def received_ids(messages: list[CommunicationLog]) -> list[str]:
+    return [message.id for message in messages]
+
+
+def test_drop_oldest_keeps_the_newest_messages() -> None:
+    async def run() -> None:
+        hub = MailboxHub(capacity=2, policy=OverflowPolicy.DROP_OLDEST)
+        for n in range(3):
+            assert await hub.deliver("receiver", entry(n))
+        assert received_ids(await hub.receive("receiver")) == ["log1", "log2"]
+        statistics = hub.get_statistics()
+        assert (statistics.delivered, statistics.dropped, statistics.queued) == (3, 1, 0)
+
+    asyncio.run(run())
+
+
+def test_reject_refuses_new_messages() -> None:
+    async def run() -> None:
+        hub = MailboxHub(capacity=2, policy=OverflowPolicy.REJECT)
+        results = [await hub.deliver("receiver", entry(n)) for n in range(3)]
+        assert results == [True, True, False]
+        assert received_ids(await hub.receive("receiver")) == ["log0", "log1"]
+        assert hub.get_statistics().rejected == 1
+
+    asyncio.run(run())
+
+
+def test_block_waits_for_the_receiver() -> None:
+    async def run() -> None:
+        hub = MailboxHub(capacity=1, policy=OverflowPolicy.BLOCK, block_timeout=1.0)
+        await hub.deliver("receiver", entry(0))
+        blocked = asyncio.ensure_future(hub.deliver("receiver", entry(1)))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert received_ids(await hub.receive("receiver")) == ["log0"]
+        assert await blocked
+        assert received_ids(await hub.receive("receiver")) == ["log1"]
+
+    asyncio.run(run())
+
+
+def test_block_gives_up_after_the_timeout() -> None:
+    async def run() -> None:
+        hub = MailboxHub(capacity=1, policy=OverflowPolicy.BLOCK, block_timeout=0.01)
+        await hub.deliver("receiver", entry(0))
+        assert not await hub.deliver("receiver", entry(1))
+        assert hub.get_statistics().rejected == 1
+
+    asyncio.run(run())
+
+
+def test_broadcast_only_waits_on_full_mailboxes() -> None:
+    async def run() -> None:
+        hub = MailboxHub(capacity=1, policy=OverflowPolicy.BLOCK, block_timeout=0.05)
+        await hub.deliver("full", entry(0))
+        assert await hub.broadcast(["a", "b", "full"], entry(1)) == 2
+        assert hub.pending("a") == hub.pending("b") == hub.pending("full") == 1
+
+    asyncio.run(run())
+
+
+def test_receive_long_polls() -> None:
+    async def run() -> None:
+        hub = MailboxHub()
+        assert await hub.receive("receiver") == []
+        waiting = asyncio.ensure_future(hub.receive("receiver", timeout=1.0))
+        await asyncio.sleep(0.01)
+        await hub.deliver("receiver", entry(0))
+        assert received_ids(await waiting) == ["log0"]
+
+    asyncio.run(run())
+
+
+def test_discard_drops_queued_messages() -> None:
+    async def run() -> None:
+        hub = MailboxHub()
+        await hub.deliver("receiver", entry(0))
+        assert hub.discard("receiver") == 1
+        assert hub.discard("receiver") is None
+        assert hub.get_statistics().queued == 0
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+"""Tests for the finite-state morphological analyzer."""
+
+import pytest
+
+from sanskrit_mcp.lib.morphology import MorphologicalAnalyzer
+from sanskrit_mcp.lib.transliteration import HK, SLP1
+
+
+@pytest.fixture(scope="module")
+def analyzer() -> MorphologicalAnalyzer:
+    return MorphologicalAnalyzer()
+
+
+def test_noun_forms(analyzer: MorphologicalAnalyzer) -> None:
+    (analysis,) = analyzer.analyze("रामः")
+    assert (analysis.stem, analysis.category, analysis.case, analysis.number) == (
+        "राम",
+        "noun",
+        "nominative",
+        "singular",
+    )
+    assert not analysis.guessed
+    cases = {analysis.case for analysis in analyzer.analyze("फलानि")}
+    assert cases == {"nominative", "accusative", "vocative"}
+
+
+def test_verb_forms(analyzer: MorphologicalAnalyzer) -> None:
+    (present,) = analyzer.analyze("गच्छति")
+    assert (present.category, present.person, present.number, present.lakara) == (
+        "verb",
+        "third",
+        "singular",
+        "laṭ",
+    )
+    (imperfect,) = analyzer.analyze("अगच्छत्")
+    assert (imperfect.root, imperfect.lakara) == ("गम्", "laṅ")
+    (future,) = analyzer.analyze("गमिष्यति")
+    assert (future.root, future.lakara) == ("गम्", "lṛṭ")
+
+
+def test_pronouns_and_indeclinables(analyzer: MorphologicalAnalyzer) -> None:
+    assert {analysis.gender for analysis in analyzer.analyze("तस्य")} == {"masculine", "neuter"}
+    assert analyzer.analyze("अहम्")[0].stem == "अस्मद्"
+    assert analyzer.analyze("च")[0].category == "indeclinable"
+
+
+def test_natva_applies_inside_the_word(analyzer: MorphologicalAnalyzer) -> None:
+    (analysis,) = analyzer.analyze("nareNa", HK)
+    assert (analysis.stem, analysis.case) == ("nara", "instrumental")
+
+
+def test_unknown_stems_are_guessed_from_the_ending(analyzer: MorphologicalAnalyzer) -> None:
+    analyses = analyzer.analyze("ramaNIyena", HK)
+    assert analyses
+    assert all(analysis.guessed and analysis.case == "instrumental" for analysis in analyses)
+    assert analyzer.analyze("xyzq", SLP1) == []
+
+
+def test_many_matches_one_by_one(analyzer: MorphologicalAnalyzer) -> None:
+    words = ["रामः", "देवेन", "गच्छति"]
+    assert analyzer.analyze_many(words) == [analyzer.analyze(word) for word in words]
+
+
+def test_plain_ascii_reads_as_hk(analyzer: MorphologicalAnalyzer) -> None:
+    assert analyzer.analyze("vanena")[0].stem == "vana"
+    assert analyzer.analyze("vanena", SLP1)[0].stem == "vana"
@@ -0,0 +1,106 @@
+"""Tests for query_vedic_knowledge's speculative AI insight."""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Optional
+
+import pytest
+
+import sanskrit_mcp.__main__ as server
+from sanskrit_mcp.lib.circuit_breaker import CircuitBreaker
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient
+from sanskrit_mcp.lib.types import CircuitState, QueryResult
+
+LOW, HIGH = 0.2, 0.95
+
+
+class Corpus:
+    """Controls the corpus confidence the handler sees, before and after the search."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.estimate = LOW
+        self.confidence = LOW
+        monkeypatch.setattr(server.vedic_corpus, "estimate_confidence", lambda query: self.estimate)
+        monkeypatch.setattr(server.vedic_corpus, "search", self.search)
+        monkeypatch.setattr(server.vedic_corpus, "query_vedic_knowledge", self.query)
+
+    def search(self, query: str, meter: Optional[str] = None) -> QueryResult:
+        time.sleep(0.02)  # long enough for a speculative request to be sent
+        return QueryResult(
+            query=query,
+            passages=[],
+            synthesized_answer="From the corpus.",
+            sources=[],
+            confidence=self.confidence,
+            hallucination_risk="low" if self.confidence >= HIGH else "high",
+        )
+
+    async def query(self, query: str, meter: Optional[str] = None) -> QueryResult:
+        return self.search(query, meter)
+
+
+@pytest.fixture
+def corpus(monkeypatch: pytest.MonkeyPatch) -> Corpus:
+    return Corpus(monkeypatch)
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> GeminiClient:
+    client = GeminiClient(backend=FakeBackend(median_latency=0.2), breaker=CircuitBreaker())
+    monkeypatch.setattr(server, "gemini_client", client)
+    monkeypatch.setattr(server, "insight_outcomes", Counter())
+    return client
+
+
+def query(text: str) -> str:
+    async def run() -> str:
+        (content,) = await server.handle_query_vedic_knowledge({"query": text})
+        await asyncio.sleep(0.01)  # let cancellations land
+        return content.text
+
+    return asyncio.run(run())
+
+
+def test_a_confident_corpus_answer_cancels_the_speculative_insight(
+    corpus: Corpus, client: GeminiClient
+) -> None:
+    corpus.confidence = HIGH
+    response = query("What is ṛta?")
+
+    assert "AI Insight" not in response
+    assert server.insight_outcomes == Counter(speculated=1, cancelled=1)
+    assert client.flights.cancelled == 1
+
+
+def test_a_weak_corpus_answer_uses_the_speculative_insight(
+    corpus: Corpus, client: GeminiClient
+) -> None:
+    response = query("What is ṛta?")
+
+    assert "🤖 AI Insight:\nEcho: Provide a brief scholarly insight" in response
+    assert server.insight_outcomes == Counter(speculated=1, used=1)
+    assert isinstance(client.backend, FakeBackend) and client.backend.calls == 1
+
+
+def test_without_speculation_the_insight_follows_the_search(
+    corpus: Corpus, client: GeminiClient
+) -> None:
+    corpus.estimate = HIGH
+    response = query("What is ṛta?")
+
+    assert "AI Insight" in response
+    assert server.insight_outcomes == Counter(used=1)
+
+
+def test_a_spent_budget_degrades_without_opening_the_circuit(
+    corpus: Corpus, client: GeminiClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    corpus.estimate = HIGH
+    monkeypatch.setitem(server.latency_budgets, "query_vedic_knowledge", 0.0)
+    for _ in range(client.breaker.failure_threshold + 1):
+        assert "Degraded answer" in query("What is ṛta?")
+
+    assert client.breaker.state == CircuitState.CLOSED
+    assert server.insight_outcomes["unavailable"] == client.breaker.failure_threshold + 1
@@ -0,0 +1,83 @@
+"""Tests for the registry's write-behind SQLite store."""
+
+from datetime import datetime
+from pathlib import Path
+
+from sanskrit_mcp.lib.agent_registry import AgentRegistry
+from sanskrit_mcp.lib.registry_store import RegistryStore
+from sanskrit_mcp.lib.types import Agent, ComprehensionLevel, Formality, SanskritCapabilities
+
+# Long enough that only explicit flushes write
+FLUSH_INTERVAL = 3600.0
+
+
+def make_agent(agent_id: str) -> Agent:
+    return Agent(
+        id=agent_id,
+        name=agent_id.title(),
+        description="Reads the Ṛgveda",
+        capabilities=["vedic", "grammar"],
+        sanskrit_capabilities=SanskritCapabilities(
+            can_read=True,
+            can_write=False,
+            formality=Formality.FORMAL,
+            comprehension_level=ComprehensionLevel.ADVANCED,
+        ),
+        last_seen=datetime(2024, 1, 1, 12, 0),
+    )
+
+
+def test_a_restarted_registry_recovers_agents_and_statistics(tmp_path: Path) -> None:
+    path = tmp_path / "registry.db"
+    registry = AgentRegistry(store=RegistryStore(path, FLUSH_INTERVAL))
+    registry.register_agent(make_agent("scholar"))
+    registry.register_agent(make_agent("poet"))
+    registry.record_message("scholar", "poet")
+    registry.record_message("scholar", "poet")
+    registry.deactivate_agent("poet")
+    registry.close()
+
+    restarted = AgentRegistry(store=RegistryStore(path, FLUSH_INTERVAL))
+    scholar, poet = restarted.get_agent("scholar"), restarted.get_agent("poet")
+    assert scholar is not None and poet is not None
+    assert scholar.statistics.messages_sent == 2
+    assert poet.statistics.messages_received == 2
+    assert not poet.is_active
+    assert poet.sanskrit_capabilities == make_agent("poet").sanskrit_capabilities
+    assert poet.description == "Reads the Ṛgveda"
+    assert restarted.get_statistics().total_messages == 2
+    restarted.close()
+
+
+def test_repeated_changes_coalesce_into_one_row_write(tmp_path: Path) -> None:
+    store = RegistryStore(tmp_path / "registry.db", FLUSH_INTERVAL)
+    agent = make_agent("scholar")
+    for n in range(10):
+        agent.statistics.messages_sent = n
+        store.mark_dirty(agent, total_messages=n)
+    store.mark_dirty(agent, total_messages=3)  # late and out of order
+
+    assert store.flush() == 1
+    assert store.flush() == 0
+    agents, total_messages = store.load()
+    assert [agent.statistics.messages_sent for agent in agents] == [9]
+    assert total_messages == 9
+    store.close()
+
+
+def test_archived_agents_stay_on_disk_but_are_not_loaded(tmp_path: Path) -> None:
+    path = tmp_path / "registry.db"
+    store = RegistryStore(path, FLUSH_INTERVAL)
+    for agent_id in ("scholar", "poet", "student"):
+        store.mark_dirty(make_agent(agent_id))
+    store.flush()
+    store.archive(make_agent("poet"))
+    store.delete("student")
+    store.close()
+
+    store = RegistryStore(path, FLUSH_INTERVAL)
+    agents, _ = store.load()
+    assert [agent.id for agent in agents] == ["scholar"]
+    rows = store._db.execute("SELECT id, archived FROM agents ORDER BY id").fetchall()
+    assert rows == [("poet", 1), ("scholar", 0)]
+    store.close()
@@ -0,0 +1,118 @@
+"""Tests for admission control, rate limits and retries."""
+
+import asyncio
+from typing import Awaitable, Callable
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from sanskrit_mcp.lib import request_limiter
+from sanskrit_mcp.lib.gemini_client import _is_transient
+from sanskrit_mcp.lib.request_limiter import RequestLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stand-in for the time module, moved by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def flaky(failures: list[BaseException]) -> Callable[[], Awaitable[str]]:
+    """A call raising the given errors in turn, then succeeding."""
+
+    async def call() -> str:
+        if failures:
+            raise failures.pop(0)
+        return "śubham"
+
+    return call
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    monkeypatch.setattr(request_limiter, "time", clock)
+    bucket = TokenBucket(per_minute=60, burst=10)
+
+    assert bucket.reserve(10) == 0.0
+    assert bucket.reserve(2) == pytest.approx(2.0)  # in debt: two tokens at one per second
+    clock.now += 5.0
+    assert bucket.reserve(3) == 0.0
+    clock.now += 60.0
+    assert bucket.reserve(10) == 0.0  # refilled to the burst size, no further
+    assert bucket.reserve(1) == pytest.approx(1.0)
+    bucket.adjust(-5)  # refund
+    assert bucket.reserve(4) == 0.0
+
+
+def test_rate_limited_calls_are_retried() -> None:
+    limiter = RequestLimiter(base_backoff=0.01)
+    errors: list[BaseException] = [
+        google_exceptions.TooManyRequests("quota"),
+        google_exceptions.ServiceUnavailable("overloaded"),
+    ]
+    assert asyncio.run(limiter.run(flaky(errors), retryable=_is_transient)) == "śubham"
+    statistics = limiter.get_statistics()
+    assert (statistics.retries, statistics.failed, statistics.admitted) == (2, 0, 3)
+
+
+def test_permanent_errors_and_exhausted_retries_are_raised() -> None:
+    limiter = RequestLimiter(max_retries=2, base_backoff=0.01)
+    with pytest.raises(google_exceptions.PermissionDenied):
+        asyncio.run(
+            limiter.run(flaky([google_exceptions.PermissionDenied("key")]), retryable=_is_transient)
+        )
+    with pytest.raises(google_exceptions.TooManyRequests):
+        asyncio.run(
+            limiter.run(
+                flaky([google_exceptions.TooManyRequests("quota") for _ in range(3)]),
+                retryable=_is_transient,
+            )
+        )
+    statistics = limiter.get_statistics()
+    assert (statistics.retries, statistics.failed) == (2, 2)
+
+
+def test_retries_stop_at_the_deadline() -> None:
+    limiter = RequestLimiter(max_retries=100, base_backoff=0.0, deadline=0.1)
+
+    async def slow_failure() -> str:
+        await asyncio.sleep(0.03)
+        raise ConnectionError("reset")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(limiter.run(slow_failure, retryable=_is_transient))
+    assert limiter.get_statistics().failed == 1
+
+
+def test_calls_in_flight_are_capped() -> None:
+    async def run() -> int:
+        limiter = RequestLimiter(max_in_flight=3)
+        in_flight = peak = 0
+
+        async def call() -> None:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        await asyncio.gather(*(limiter.run(call) for _ in range(10)))
+        return peak
+
+    assert asyncio.run(run()) == 3
+
+
+def test_token_quota_throttles_once_spent() -> None:
+    async def run() -> RequestLimiter:
+        # 100 tokens a second, one minute's worth up front
+        limiter = RequestLimiter(tokens_per_minute=6000)
+        await limiter.run(flaky([]), tokens=6000)
+        await limiter.run(flaky([]), tokens=5)
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.get_statistics().throttled == 1
@@ -0,0 +1,53 @@
+"""Tests for the lexicon-driven sandhi splitter."""
+
+import pytest
+
+from sanskrit_mcp.lib.sandhi_splitter import SandhiSplitter, corpus_lexicon
+from sanskrit_mcp.lib.transliteration import DEVANAGARI, SLP1
+
+
+@pytest.fixture(scope="module")
+def splitter() -> SandhiSplitter:
+    return SandhiSplitter()
+
+
+@pytest.mark.parametrize(
+    ("text", "words"),
+    [
+        ("taTeti", ["taTA", "iti"]),  # guṇa
+        ("BavatIti", ["Bavati", "iti"]),  # savarṇa-dīrgha
+        ("ityeva", ["iti", "eva"]),  # yaṇ
+        ("rAmo gacCati", ["rAmaH", "gacCati"]),  # visarga before a voiced sound
+    ],
+)
+def test_best_split(splitter: SandhiSplitter, text: str, words: list[str]) -> None:
+    assert splitter.split(text, SLP1)[0].words == words
+
+
+def test_splits_come_back_in_the_input_scheme(splitter: SandhiSplitter) -> None:
+    assert splitter.split("तथेति")[0].words == ["तथा", "इति"]
+    assert splitter.split("rāmo'pi", "iast")[0].words == ["rāmaḥ", "api"]
+    assert splitter.split("tatheti")[0].words == ["tathA", "iti"]  # plain ASCII reads as HK
+
+
+def test_fewest_words_rank_first(splitter: SandhiSplitter) -> None:
+    splits = splitter.split("kurukzetre", SLP1)
+    assert splits[0].words == ["kurukzetre"]
+    assert ["kuru", "kzetre"] in [split.words for split in splits]
+
+
+def test_uncovered_text_has_no_split(splitter: SandhiSplitter) -> None:
+    assert splitter.split("devAlayaH", SLP1) == []
+
+
+def test_added_words_extend_the_lexicon() -> None:
+    splitter = SandhiSplitter()
+    splitter.add_words(["उदयः"], DEVANAGARI)
+    assert splitter.split("सूर्योदयः")[0].words == ["सूर्य", "उदयः"]
+
+
+def test_corpus_lexicon_skips_sandhi_finals() -> None:
+    words = corpus_lexicon(["rāmaṃ vande", "tad-vat"])
+    assert "rAmam" in words
+    assert "vande" in words
+    assert "tad" not in words
@@ -0,0 +1,172 @@
+"""Tests for the shared-memory agent table."""
+
+import time
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from conftest import assert_indexes_consistent, make_agent
+
+from sanskrit_mcp.lib import shared_registry
+from sanskrit_mcp.lib.agent_registry import AgentRegistry
+from sanskrit_mcp.lib.shared_registry import SharedRegistryBusy, SharedRegistryTable
+from sanskrit_mcp.lib.types import Agent, SanskritCapabilities
+
+
+@pytest.fixture
+def tables() -> Iterator[tuple[SharedRegistryTable, SharedRegistryTable]]:
+    """Two attachments to one segment, standing in for two processes."""
+    name = f"sktest{uuid.uuid4().hex[:12]}"
+    first = SharedRegistryTable(name, capacity=64)
+    second = SharedRegistryTable(name, capacity=64)
+    yield first, second
+    second.close()
+    first.close()
+    first.unlink()
+
+
+def interrupt_update(table: SharedRegistryTable, agent_id: str) -> int:
+    """Leave an agent's record as a writer that died mid-update would."""
+    offset = table._offset(table._find(agent_id))
+    (seq,) = shared_registry._SEQ.unpack_from(table._buf, offset)
+    shared_registry._PENDING.pack_into(table._buf, shared_registry._PENDING_OFFSET, offset)
+    shared_registry._SEQ.pack_into(table._buf, offset, seq + 1)
+    return offset
+
+
+def test_agents_and_counters_are_shared(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable],
+) -> None:
+    first, second = (AgentRegistry(shared=table) for table in tables)
+    first.register_agent(make_agent("a", ["vedic"]))
+    second.register_agent(make_agent("b", ["chat"]))
+    first.record_message("a", "b", "s1")
+
+    agent = second.get_agent("a")
+    assert agent is not None
+    assert agent.statistics.messages_sent == 1
+    assert second.get_statistics().total_messages == 1
+    assert_indexes_consistent(first)
+    assert_indexes_consistent(second)
+
+
+def test_flag_changes_reindex_after_a_refresh(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable],
+) -> None:
+    first, second = (AgentRegistry(shared=table) for table in tables)
+    for agent_id in ("a", "b", "c"):
+        first.register_agent(make_agent(agent_id, ["vedic"]))
+    assert_indexes_consistent(second)
+
+    first.deactivate_agent("b")
+    # A refresh must not change the flag behind the indexes' back
+    tables[1].refresh(second._agents["b"])
+    assert second._agents["b"].is_active
+    assert_indexes_consistent(second)
+    assert second.find_agents().total == 2
+
+    first.activate_agent("b")
+    assert second.find_agents().total == 3
+    assert_indexes_consistent(second)
+
+
+def test_reads_give_up_on_a_record_left_mid_update(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first, second = tables
+    first.put(make_agent("a", ["vedic"]))
+    interrupt_update(first, "a")
+    monkeypatch.setattr(shared_registry, "READ_SLEEPS", 2)
+
+    with pytest.raises(SharedRegistryBusy):
+        second.get("a")
+
+    second.repair()
+    agent = second.get("a")
+    assert agent is not None and agent.id == "a"
+
+
+def test_registry_serves_local_data_and_repairs(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable],
+) -> None:
+    first, second = tables
+    registry = AgentRegistry(shared=second)
+    first.put(make_agent("a", ["vedic"]))
+    assert registry.get_agent("a") is not None
+    offset = interrupt_update(first, "a")
+
+    start = time.monotonic()
+    assert registry.get_agent("a") is not None
+    assert time.monotonic() - start < 1.0
+    (seq,) = shared_registry._SEQ.unpack_from(second._buf, offset)
+    assert seq % 2 == 0
+
+
+def test_the_next_writer_repairs_an_interrupted_update(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable],
+) -> None:
+    first, second = tables
+    first.put(make_agent("a", ["vedic"]))
+    interrupt_update(first, "a")
+
+    second.put(
+        Agent(
+            id="b",
+            name="b",
+            capabilities=[],
+            sanskrit_capabilities=SanskritCapabilities(False, False),
+        )
+    )
+    assert first.get("a") is not None
+    assert second.statistics()[0] == 2
+
+
+def test_registries_re_read_only_changed_slots(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first, second = (AgentRegistry(shared=table) for table in tables)
+    for n in range(40):
+        first.register_agent(make_agent(f"agent-{n}", ["vedic"]))
+    assert second.find_agents().total == 40
+
+    first.deactivate_agent("agent-3")
+    tables[0].remove("agent-7")
+    first.register_agent(make_agent("agent-40", ["chat"]))
+    reads: list[int] = []
+    snapshot = tables[1]._snapshot
+    monkeypatch.setattr(tables[1], "agents", lambda: pytest.fail("rescanned the table"))
+    monkeypatch.setattr(
+        tables[1],
+        "_snapshot",
+        lambda seq, start, end: reads.append(end - start) or snapshot(seq, start, end),
+    )
+
+    assert second.find_agents().total == 39
+    assert reads.count(shared_registry.RECORD_SIZE) == 3
+    assert "agent-7" not in second._agents
+    assert_indexes_consistent(second)
+
+
+def test_changes_follow_agents_between_slots(
+    tables: tuple[SharedRegistryTable, SharedRegistryTable],
+) -> None:
+    first, second = tables
+    since = first.put(make_agent("a", ["vedic"]))
+    first.remove("a")
+    first.put(make_agent("b", ["vedic"]))  # may take a's tombstone
+    first.put(make_agent("a", ["chat"]))
+
+    changes = second.changes(since)
+    assert changes is not None
+    generation, agents, removed = changes
+    assert generation == since + 3
+    assert sorted((agent.id, agent.capabilities[0]) for agent in agents) == [
+        ("a", "chat"),
+        ("b", "vedic"),
+    ]
+    assert removed == []
+
+    first.remove("b")
+    assert second.changes(generation) == (generation + 1, [], ["b"])
+    assert second.changes(-1) is None
+    assert second.changes(generation - shared_registry.CHANGE_LOG_SIZE) is None
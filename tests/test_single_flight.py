@@ -0,0 +1,116 @@
+"""Tests for coalescing identical concurrent calls."""
+
+import asyncio
+
+import pytest
+
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient
+from sanskrit_mcp.lib.llm_backend import TransientBackendError
+from sanskrit_mcp.lib.single_flight import SingleFlight
+
+LATENCY = 0.05
+
+
+def test_identical_calls_share_one_backend_call() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY)
+        flights = SingleFlight()
+        results = await asyncio.gather(
+            *(
+                flights.run("key", lambda: backend.complete('Translate "namaste"'))
+                for _ in range(10)
+            )
+        )
+        assert backend.calls == 1
+        assert {result.text for result in results} == {"Echo: namaste"}
+        assert (flights.calls, flights.coalesced, len(flights)) == (1, 9, 0)
+
+    asyncio.run(run())
+
+
+def test_different_keys_are_not_coalesced() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY)
+        flights = SingleFlight()
+        await asyncio.gather(
+            *(flights.run(n, lambda: backend.complete("prompt")) for n in range(3))
+        )
+        assert backend.calls == 3
+
+    asyncio.run(run())
+
+
+def test_every_caller_gets_the_exception() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY, error_rate=1.0)
+        flights = SingleFlight()
+        results = await asyncio.gather(
+            *(flights.run("key", lambda: backend.complete("prompt")) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert backend.calls == 1
+        assert all(isinstance(result, TransientBackendError) for result in results)
+
+        # A failed call is not remembered: the next caller tries again
+        assert len(flights) == 0
+        backend.error_rate = 0.0
+        assert (await flights.run("key", lambda: backend.complete("prompt"))).text == "Echo: prompt"
+        assert backend.calls == 2
+
+    asyncio.run(run())
+
+
+def test_a_cancelled_caller_leaves_the_call_running() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY)
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.run("key", lambda: backend.complete("prompt")))
+        second = asyncio.ensure_future(flights.run("key", lambda: backend.complete("prompt")))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert (await second).text == "Echo: prompt"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert flights.cancelled == 0
+
+    asyncio.run(run())
+
+
+def test_cancellable_call_stops_when_every_caller_has_gone() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY)
+        flights = SingleFlight()
+        callers = [
+            asyncio.ensure_future(
+                flights.run("key", lambda: backend.complete("prompt"), cancellable=True)
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        assert flights.cancelled == 1
+        assert len(flights) == 0
+
+        # The next caller starts afresh
+        assert (await flights.run("key", lambda: backend.complete("prompt"))).text == "Echo: prompt"
+        assert backend.calls == 2
+
+    asyncio.run(run())
+
+
+def test_concurrent_translations_of_one_text_reach_the_model_once() -> None:
+    async def run() -> None:
+        backend = FakeBackend(median_latency=LATENCY)
+        client = GeminiClient(backend=backend)
+        texts = ["धर्मो रक्षति रक्षितः"] * 5 + ["सत्यमेव जयते"]
+        results = await asyncio.gather(
+            *(client.translate_text(text, "sanskrit-to-english") for text in texts)
+        )
+        assert backend.calls == 2
+        assert len(set(results[:5])) == 1
+        assert client.flights.coalesced == 4
+
+    asyncio.run(run())
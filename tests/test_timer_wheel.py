@@ -0,0 +1,83 @@
+"""Tests for the hierarchical timer wheel."""
+
+import random
+
+from sanskrit_mcp.lib.timer_wheel import SLOT_BITS, TimerWheel
+
+SLOTS = 1 << SLOT_BITS
+
+
+def test_timers_fire_once_their_tick_is_reached() -> None:
+    wheel = TimerWheel(tick=0.5, start=100.0)
+    wheel.schedule("a", 101.0)
+    wheel.schedule("b", 101.2)
+
+    assert wheel.advance(100.9) == []
+    assert wheel.advance(101.0) == ["a"]
+    assert wheel.advance(101.4) == []  # b is due on the tick at 101.5
+    assert wheel.advance(101.5) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_timers_cascade_down_from_higher_levels() -> None:
+    wheel = TimerWheel()
+    deadlines = {"next": 1, "level 1": SLOTS + 5, "level 2": SLOTS**2 + 7, "level 3": SLOTS**3 + 3}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    fired = {}
+    for now in range(1, SLOTS**3 + 10):
+        for key in wheel.advance(now):
+            fired[key] = now
+    assert fired == deadlines
+
+
+def test_one_large_step_fires_everything_due() -> None:
+    wheel = TimerWheel()
+    for n in range(1, 5000, 37):
+        wheel.schedule(n, n)
+    assert sorted(wheel.advance(3000)) == list(range(1, 3000, 37))
+    assert sorted(wheel.advance(5000)) == list(range(3035, 5000, 37))
+
+
+def test_timers_beyond_the_top_level_are_parked_until_due() -> None:
+    wheel = TimerWheel(levels=2)
+    far = 3 * SLOTS**2 + 11
+    wheel.schedule("far", far)
+    fired = [now for now in range(1, far + 5) if wheel.advance(now)]
+    assert fired == [far]
+
+
+def test_cancelled_and_rescheduled_timers() -> None:
+    wheel = TimerWheel()
+    wheel.schedule("cancelled", 10)
+    wheel.schedule("moved", 10)
+    assert wheel.cancel("cancelled")
+    assert not wheel.cancel("cancelled")
+    wheel.schedule("moved", 200)
+    assert "moved" in wheel and "cancelled" not in wheel
+
+    assert wheel.advance(199) == []
+    assert wheel.advance(200) == ["moved"]
+
+
+def test_overdue_timers_fire_on_the_next_advance() -> None:
+    wheel = TimerWheel()
+    wheel.advance(50)
+    wheel.schedule("late", 10)
+    assert wheel.advance(50) == []  # the current tick has been processed
+    assert wheel.advance(51) == ["late"]
+
+
+def test_random_timers_fire_on_time() -> None:
+    rng = random.Random(7)
+    wheel = TimerWheel()
+    deadlines = {n: rng.randint(1, 20000) for n in range(500)}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    now = 0
+    while wheel:
+        previous, now = now, now + rng.randint(1, 300)
+        for key in wheel.advance(now):
+            assert previous < deadlines[key] <= now
@@ -0,0 +1,71 @@
+"""Tests for token estimates, cost accounting and prompt budgets."""
+
+import asyncio
+
+import pytest
+
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient
+from sanskrit_mcp.lib.token_usage import TokenLedger, estimate_tokens, usage_scope
+
+
+def test_devanagari_costs_more_tokens_per_character() -> None:
+    assert estimate_tokens("") == 1
+    assert estimate_tokens("satyam eva jayate") == 17 // 4 + 1
+    assert estimate_tokens("सत्यमेव") == 7 // 2 + 1
+    assert estimate_tokens("सत्यमेव") > estimate_tokens("satyame")
+
+
+def test_usage_is_charged_to_the_current_tool_and_agent() -> None:
+    ledger = TokenLedger(input_price=1.0, output_price=2.0)
+    ledger.record(90, 100, 50)
+    token = usage_scope.set(("translate_sanskrit", "scholar"))
+    try:
+        ledger.record(900, 1_000_000, 500_000)
+    finally:
+        usage_scope.reset(token)
+    ledger.record(10, 10, 10)
+
+    total = ledger.get_total()
+    assert (total.calls, total.estimated_prompt_tokens, total.prompt_tokens) == (3, 1000, 1000110)
+    assert total.cost_usd == pytest.approx((1000110 * 1.0 + 500060 * 2.0) / 1e6)
+    (tool,) = ledger.get_tools()
+    assert (tool.name, tool.calls, tool.cost_usd) == ("translate_sanskrit", 1, pytest.approx(2.0))
+    agent = ledger.get_agent("scholar")
+    assert agent is not None and agent.output_tokens == 500_000
+    assert ledger.get_agent("poet") is None
+
+
+def test_only_the_most_recently_charged_agents_are_kept() -> None:
+    ledger = TokenLedger(max_agents=2)
+    for agent in ("a", "b", "a", "c"):
+        token = usage_scope.set((None, agent))
+        ledger.record(1, 1, 1)
+        usage_scope.reset(token)
+
+    assert ledger.get_agent("b") is None
+    assert [ledger.get_agent(agent) is not None for agent in ("a", "c")] == [True, True]
+    ledger.discard_agent("a")
+    assert ledger.get_agent("a") is None
+    assert ledger.get_total().calls == 4
+
+
+def test_client_calls_are_recorded_and_oversized_prompts_refused() -> None:
+    backend = FakeBackend(median_latency=0.0)
+    client = GeminiClient(backend=backend, max_prompt_tokens=50)
+
+    async def run() -> tuple[str, str]:
+        usage_scope.set(("query_vedic_knowledge", "scholar"))
+        small = await client.generate_content("Explain ṛta")
+        large = await client.generate_content("Explain ṛta " * 100)
+        return small, large
+
+    small, large = asyncio.run(run())
+    assert small == "Echo: Explain ṛta"
+    assert large.startswith("Error generating content: Prompt of about")
+    assert backend.calls == 1
+    (tool,) = client.usage.get_tools()
+    assert (tool.name, tool.calls) == ("query_vedic_knowledge", 1)
+    assert tool.prompt_tokens == estimate_tokens("Explain ṛta")
+    assert tool.output_tokens == estimate_tokens("Echo: Explain ṛta")
+    assert usage_scope.get() == (None, None)  # the scope stayed inside the run
@@ -0,0 +1,102 @@
+"""Tests for the two-tier response cache."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from sanskrit_mcp.lib import translation_cache
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient
+from sanskrit_mcp.lib.translation_cache import TranslationCache, cache_key
+
+# Long enough that only explicit flushes write
+FLUSH_INTERVAL = 3600.0
+
+
+class FakeClock:
+    """Stand-in for the time module, moved by hand."""
+
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(translation_cache, "time", clock)
+    return clock
+
+
+def test_keys_depend_on_every_part() -> None:
+    assert cache_key("model", "dharma", True) == cache_key("model", "dharma", True)
+    assert cache_key("model", "dharma", True) != cache_key("model", "dharma", False)
+    assert cache_key("model", "dharma") != cache_key("other", "dharma")
+
+
+def test_memory_tier_is_lru_and_expires(clock: FakeClock) -> None:
+    cache = TranslationCache(capacity=2, ttl=60.0)
+    cache.put("a", "first")
+    cache.put("b", "second")
+    assert cache.get("a") == "first"
+    cache.put("c", "third")  # drops b, the least recently used
+
+    assert cache.get("b") is None
+    clock.now += 61.0
+    assert cache.get("a") is None
+    statistics = cache.get_statistics()
+    assert (statistics.memory_hits, statistics.misses, statistics.memory_entries) == (1, 2, 1)
+
+
+def test_disk_tier_survives_restarts(clock: FakeClock, tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = TranslationCache(path, flush_interval=FLUSH_INTERVAL)
+    cache.put("fresh", "satyam")
+    cache.put("stale", "anṛtam")
+    assert cache.get("fresh") == "satyam"  # queued, not yet on disk
+    cache.close()
+
+    clock.now += 10.0
+    reopened = TranslationCache(path, ttl=5.0, flush_interval=FLUSH_INTERVAL)
+    reopened.put("stale", "anṛtam")  # shorter ttl now
+    reopened.flush()
+    clock.now += 10.0
+    assert asyncio.run(reopened.get_async("fresh")) == "satyam"
+    assert reopened.get("stale") is None
+    statistics = reopened.get_statistics()
+    assert (statistics.disk_hits, statistics.misses, statistics.disk_entries) == (1, 1, 1)
+    reopened.close()
+
+
+def test_disk_tier_evicts_least_recently_used_over_budget(clock: FakeClock, tmp_path: Path) -> None:
+    cache = TranslationCache(
+        tmp_path / "cache.db", capacity=1, max_bytes=250, flush_interval=FLUSH_INTERVAL
+    )
+    for key in "ab":
+        cache.put(key, key * 100)
+        cache.flush()
+        clock.now += 1.0
+    assert cache.get("a") == "a" * 100  # from disk, now more recently used than b
+    clock.now += 1.0
+    cache.put("c", "c" * 100)
+    cache.flush()
+
+    statistics = cache.get_statistics()
+    assert (statistics.evictions, statistics.disk_bytes) == (1, 200)
+    assert cache.get("b") is None
+    assert cache.get("a") == "a" * 100
+    cache.close()
+
+
+def test_repeated_translations_are_served_from_the_cache(tmp_path: Path) -> None:
+    backend = FakeBackend(median_latency=0.0)
+    client = GeminiClient(backend=backend, cache=TranslationCache(tmp_path / "cache.db"))
+    first = asyncio.run(client.translate_text("सत्यमेव जयते", "sanskrit-to-english"))
+    second = asyncio.run(client.translate_text("सत्यमेव जयते", "sanskrit-to-english"))
+
+    assert first == second
+    assert backend.calls == 1
+    client.close()
@@ -0,0 +1,77 @@
+"""Tests for translation memory lookups and capacity."""
+
+from sanskrit_mcp.lib.translation_memory import (
+    ENGLISH_TO_SANSKRIT,
+    LEARNED,
+    SANSKRIT_TO_ENGLISH,
+    TranslationMemory,
+)
+
+
+def test_exact_match_across_scripts() -> None:
+    memory = TranslationMemory()
+    memory.add("सत्यमेव जयते", "Truth alone triumphs", SANSKRIT_TO_ENGLISH, "Muṇḍaka 3.1.6")
+    for spelling in ("सत्यमेव जयते", "satyameva jayate", "satyam eva jayate", "Satyameva jayate ।"):
+        (match,) = memory.lookup(spelling, SANSKRIT_TO_ENGLISH)
+        assert (match.target, match.score, match.origin) == (
+            "Truth alone triumphs",
+            1.0,
+            "Muṇḍaka 3.1.6",
+        )
+
+
+def test_diacritics_decide_exact_matches() -> None:
+    memory = TranslationMemory()
+    memory.add("kāla", "time", SANSKRIT_TO_ENGLISH)
+    memory.add("śava", "corpse", SANSKRIT_TO_ENGLISH)
+    memory.add("nāsti", "there is not", SANSKRIT_TO_ENGLISH)
+    for spelling, target in (("kala", "time"), ("sava", "corpse"), ("na asti", "there is not")):
+        match = memory.lookup(spelling, SANSKRIT_TO_ENGLISH)[0]
+        assert match.target == target
+        assert match.score < 1.0
+    assert memory.get_statistics().exact_hits == 0
+
+
+def test_fuzzy_matches_rank_by_similarity() -> None:
+    memory = TranslationMemory(hint_threshold=0.5)
+    memory.add("the king goes to the forest", "rājā vanaṃ gacchati", ENGLISH_TO_SANSKRIT)
+    memory.add("the queen sings", "rājñī gāyati", ENGLISH_TO_SANSKRIT)
+    matches = memory.lookup("the king goes to the city", ENGLISH_TO_SANSKRIT)
+    assert matches[0].target == "rājā vanaṃ gacchati"
+    assert 0.5 <= matches[0].score < 1.0
+    assert memory.lookup("completely unrelated words", ENGLISH_TO_SANSKRIT) == []
+    assert memory.get_statistics().fuzzy_hits == 1
+
+
+def test_directions_are_kept_apart() -> None:
+    memory = TranslationMemory()
+    memory.add("dharma", "duty", ENGLISH_TO_SANSKRIT)
+    assert memory.lookup("dharma", SANSKRIT_TO_ENGLISH) == []
+
+
+def test_capacity_drops_the_oldest_learned_segments() -> None:
+    memory = TranslationMemory(capacity=2)
+    memory.add("सत्यमेव जयते", "Truth alone triumphs", SANSKRIT_TO_ENGLISH, "corpus")
+    for word in ("गच्छति", "वदति", "पश्यति"):
+        memory.add(word, word, SANSKRIT_TO_ENGLISH, LEARNED)
+
+    statistics = memory.get_statistics()
+    assert (statistics.segments, statistics.learned) == (3, 2)
+    assert memory.lookup("गच्छति", SANSKRIT_TO_ENGLISH) == []
+    assert memory.lookup("पश्यति", SANSKRIT_TO_ENGLISH)
+    assert memory.lookup("सत्यमेव जयते", SANSKRIT_TO_ENGLISH)  # corpus segments are always kept
+
+
+def test_replaced_segments_free_their_capacity() -> None:
+    memory = TranslationMemory(capacity=2)
+    for n in range(5):
+        memory.add("गच्छति", f"goes ({n})", SANSKRIT_TO_ENGLISH)
+    memory.add("वदति", "speaks", SANSKRIT_TO_ENGLISH)
+
+    statistics = memory.get_statistics()
+    assert (statistics.segments, statistics.learned) == (2, 2)
+    assert memory.lookup("गच्छति", SANSKRIT_TO_ENGLISH)[0].target == "goes (4)"
+
+    # A corpus segment replacing a learned one no longer counts against the capacity
+    memory.add("वदति", "says", SANSKRIT_TO_ENGLISH, "corpus")
+    assert memory.get_statistics().learned == 1
@@ -0,0 +1,70 @@
+"""Tests for the table-driven transliteration engine."""
+
+import pytest
+
+from sanskrit_mcp.lib.transliteration import (
+    DEVANAGARI,
+    HK,
+    IAST,
+    SCHEMES,
+    SLP1,
+    UNKNOWN,
+    detect_scheme,
+    source_scheme,
+    transliterate,
+    transliterate_many,
+)
+
+VERSES = [
+    "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः ।",
+    "अग्निमीळे पुरोहितं यज्ञस्य देवमृत्विजम् ॥",
+    "ॐ पूर्णमदः पूर्णमिदं पूर्णात्पूर्णमुदच्यते",
+    "मीळ्हुषे कॢप्तं सोऽहम् १२३",
+]
+
+
+@pytest.mark.parametrize("scheme", SCHEMES)
+@pytest.mark.parametrize("verse", VERSES)
+def test_round_trip_through_every_scheme(verse: str, scheme: str) -> None:
+    converted = transliterate(verse, scheme, DEVANAGARI)
+    assert transliterate(converted, DEVANAGARI, scheme) == verse
+
+
+def test_known_spellings() -> None:
+    verse = "धर्मक्षेत्रे कुरुक्षेत्रे समवेता युयुत्सवः"
+    assert transliterate(verse, IAST, DEVANAGARI) == "dharmakṣetre kurukṣetre samavetā yuyutsavaḥ"
+    assert transliterate(verse, SLP1, DEVANAGARI) == "Darmakzetre kurukzetre samavetA yuyutsavaH"
+    assert transliterate(verse, HK, DEVANAGARI) == "dharmakSetre kurukSetre samavetA yuyutsavaH"
+
+
+def test_many_matches_one_by_one() -> None:
+    expected = [transliterate(verse, IAST, DEVANAGARI) for verse in VERSES]
+    assert transliterate_many(VERSES, IAST, DEVANAGARI) == expected
+
+
+def test_hk_lR_reads_as_the_vowel() -> None:
+    assert transliterate("lRkAra", DEVANAGARI, HK) == "ऌकार"
+
+
+@pytest.mark.parametrize(
+    ("text", "scheme"),
+    [
+        ("राम", DEVANAGARI),
+        ("rāmaḥ", IAST),
+        ("rAmaH", HK),
+        ("rama gacchati", HK),
+        ("123 !", UNKNOWN),
+    ],
+)
+def test_detect_scheme(text: str, scheme: str) -> None:
+    assert detect_scheme(text) == scheme
+
+
+def test_plain_ascii_reads_as_hk_unless_a_scheme_is_given() -> None:
+    assert source_scheme("dharma") == HK
+    assert transliterate("dharma kSetre", DEVANAGARI) == "धर्म क्षेत्रे"
+    assert transliterate("dharma", IAST) == "dharma"
+    with pytest.raises(ValueError):
+        source_scheme("123")
+    assert source_scheme("rama gacchati", SLP1) == SLP1
+    assert transliterate("rAma", DEVANAGARI, SLP1) == "राम"
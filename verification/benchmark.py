@@ -0,0 +1,772 @@
+"""
+Throughput benchmarks for the Sanskrit MCP library modules.
+
+Run from the repository root:
+    python verification/benchmark.py
+"""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+# Add src to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from sanskrit_mcp.lib.agent_registry import EVICTION_TICK, AgentRegistry
+from sanskrit_mcp.lib.chandas import analyze_meters
+from sanskrit_mcp.lib.circuit_breaker import CircuitBreaker
+from sanskrit_mcp.lib.conversation_log import ConversationLog
+from sanskrit_mcp.lib.fake_backend import FakeBackend
+from sanskrit_mcp.lib.gemini_client import GeminiClient, GeminiUnavailable
+from sanskrit_mcp.lib.latency import LatencyHistogram
+from sanskrit_mcp.lib.mailbox import MailboxHub
+from sanskrit_mcp.lib.morphology import MorphologicalAnalyzer
+from sanskrit_mcp.lib.registry_store import RegistryStore
+from sanskrit_mcp.lib.request_limiter import RequestLimiter
+from sanskrit_mcp.lib.sandhi_splitter import SandhiSplitter, corpus_lexicon
+from sanskrit_mcp.lib.shared_registry import SharedRegistryTable
+from sanskrit_mcp.lib.single_flight import SingleFlight
+from sanskrit_mcp.lib.tokenizer import akshara_spans, word_spans
+from sanskrit_mcp.lib.translation_cache import TranslationCache, cache_key
+from sanskrit_mcp.lib.translation_memory import TranslationMemory
+from sanskrit_mcp.lib.transliteration import SCHEMES, transliterate, transliterate_many
+from sanskrit_mcp.lib.types import (
+    Agent,
+    ComprehensionLevel,
+    Formality,
+    Language,
+    OverflowPolicy,
+    SanskritCapabilities,
+    SanskritMessage,
+    TokenUsage,
+)
+from sanskrit_mcp.lib.vedic_corpus_parser import VedicCorpusParser
+
+T = TypeVar("T")
+
+
+def timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    """Run fn once and return (result, seconds)."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def corpus_text(repeat: int) -> str:
+    """Build a long Devanagari text from the corpus verses."""
+    corpus = VedicCorpusParser()
+    verses = [p.sanskrit for group in corpus.corpus.values() for p in group]
+    return "\n".join(verses * repeat)
+
+
+def bench_transliteration() -> None:
+    print("🔤 Transliteration")
+    text = corpus_text(2000)
+    size_mb = len(text.encode("utf-8")) / 1e6
+
+    for target in SCHEMES[1:]:
+        romanized, seconds = timed(transliterate, text, target, "devanagari")
+        print(f"   devanagari → {target:<6} {size_mb / seconds:8.1f} MB/s")
+        back, seconds = timed(transliterate, romanized, "devanagari", target)
+        status = "✅" if back == text else "❌"
+        print(f"   {target:<6} → devanagari {size_mb / seconds:8.1f} MB/s  round-trip {status}")
+
+    lines = text.split("\n")
+    _, seconds = timed(transliterate_many, lines, "iast", "devanagari")
+    print(f"   transliterate_many: {len(lines) / seconds:,.0f} texts/s")
+
+
+def bench_tokenizer() -> None:
+    print("✂️  Tokenization")
+    text = corpus_text(2000)
+    size_mb = len(text.encode("utf-8")) / 1e6
+
+    count, seconds = timed(lambda: sum(1 for _ in akshara_spans(text)))
+    print(f"   aksharas: {count:,} in {seconds * 1000:.0f} ms ({size_mb / seconds:.1f} MB/s)")
+    count, seconds = timed(lambda: sum(1 for _ in word_spans(text)))
+    print(f"   words:    {count:,} in {seconds * 1000:.0f} ms ({size_mb / seconds:.1f} MB/s)")
+
+
+def bench_sandhi() -> None:
+    print("🔗 Sandhi splitting")
+    corpus = VedicCorpusParser()
+    splitter, seconds = timed(SandhiSplitter)
+    splitter.add_words(corpus_lexicon(p.transliteration for p in corpus.all_passages()))
+    print(f"   lexicon load: {seconds * 1000:.1f} ms ({len(splitter.lexicon)} words)")
+
+    compound = "DarmakzetrekurukzetresamavetAyuyutsavaHmAmakAHpARqavAScEvakimakurvatasaYjaya"
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        splits = splitter.split(compound, "slp1")
+    seconds = (time.perf_counter() - start) / runs
+    print(
+        f"   {len(compound)}-letter compound: {seconds * 1000:.2f} ms → "
+        f"{' + '.join(splits[0].words)}"
+    )
+
+
+def bench_morphology() -> None:
+    print("🔬 Morphological analysis")
+    analyzer, seconds = timed(MorphologicalAnalyzer)
+    print(
+        f"   build: {seconds * 1000:.1f} ms "
+        f"({analyzer.form_count} forms → {analyzer.state_count} DAWG states)"
+    )
+
+    words = corpus_text(200).split()
+    results, seconds = timed(analyzer.analyze_many, words, "devanagari")
+    recognised = sum(1 for analyses in results if analyses)
+    print(
+        f"   {len(words) / seconds:,.0f} words/s ({recognised / len(words):.0%} with an analysis)"
+    )
+
+
+def bench_chandas() -> None:
+    print("📜 Metrical analysis")
+    verses = corpus_text(6000).split("\n")
+    results, seconds = timed(analyze_meters, verses)
+    recognised = sum(1 for analysis in results if analysis.meter)
+    print(
+        f"   {len(verses):,} verses in {seconds:.2f} s ({len(verses) / seconds:,.0f} verses/s, "
+        f"{recognised / len(verses):.0%} recognised)"
+    )
+
+
+def make_registry(agents: int, store: RegistryStore = None) -> AgentRegistry:
+    """Build a registry of simulated agents."""
+    registry = AgentRegistry(store=store)
+    for i in range(agents):
+        registry.register_agent(
+            Agent(
+                id=f"agent_{i}",
+                name=f"Agent {i}",
+                capabilities=["debate"],
+                sanskrit_capabilities=SanskritCapabilities(can_read=True, can_write=i % 2 == 0),
+            )
+        )
+    return registry
+
+
+def check_counts(registry: AgentRegistry, expected: int) -> str:
+    """Verify that no message update was lost."""
+    agents = registry.get_all_agents()
+    sent = sum(a.statistics.messages_sent for a in agents)
+    received = sum(a.statistics.messages_received for a in agents)
+    total = registry.get_statistics().total_messages
+    return (
+        "✅ no lost updates"
+        if sent == received == total == expected
+        else f"❌ {sent}/{received}/{total} of {expected}"
+    )
+
+
+def bench_registry() -> None:
+    print("👥 Agent registry under contention")
+    agents, workers, per_worker = 200, 16, 20000
+
+    def send(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(per_worker):
+            registry.record_message(
+                f"agent_{rng.randrange(agents)}", f"agent_{rng.randrange(agents)}"
+            )
+
+    registry = make_registry(agents)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        list(pool.map(send, range(workers)))
+    seconds = time.perf_counter() - start
+    expected = workers * per_worker
+    print(f"   threads: {expected / seconds:,.0f} msg/s  {check_counts(registry, expected)}")
+
+    async def fan_out(seed: int) -> None:
+        rng = random.Random(seed)
+        for _ in range(per_worker):
+            registry.record_message(
+                f"agent_{rng.randrange(agents)}", f"agent_{rng.randrange(agents)}"
+            )
+            if rng.random() < 0.01:
+                await asyncio.sleep(0)
+
+    async def run_tasks() -> None:
+        await asyncio.gather(*(fan_out(seed) for seed in range(workers)))
+
+    registry = make_registry(agents)
+    _, seconds = timed(asyncio.run, run_tasks())
+    print(f"   asyncio: {expected / seconds:,.0f} msg/s  {check_counts(registry, expected)}")
+
+    registry = make_registry(100000)
+    reads = 10000
+    _, seconds = timed(lambda: [registry.get_statistics() for _ in range(reads)])
+    print(f"   get_statistics with 100k agents: {seconds / reads * 1e6:.1f} µs")
+
+
+def bench_registry_store() -> None:
+    print("💾 Persistent registry")
+    agents, messages = 10000, 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "registry.db"
+        registry = make_registry(agents, RegistryStore(path))
+        rng = random.Random(0)
+        pairs = [
+            (f"agent_{rng.randrange(agents)}", f"agent_{rng.randrange(agents)}")
+            for _ in range(messages)
+        ]
+        start = time.perf_counter()
+        for sender, receiver in pairs:
+            registry.record_message(sender, receiver)
+        seconds = time.perf_counter() - start
+        print(f"   record_message with write-behind: {messages / seconds:,.0f} msg/s")
+        registry.close()
+
+        restored, seconds = timed(lambda: AgentRegistry(store=RegistryStore(path)))
+        print(
+            f"   restart: {len(restored.get_all_agents()):,} agents restored in "
+            f"{seconds * 1000:.0f} ms  {check_counts(restored, messages)}"
+        )
+        restored.close()
+
+
+def bench_conversation_log() -> None:
+    print("📜 Communication log")
+    messages, sessions = 500000, 1000
+    start_time = datetime(2025, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        log = ConversationLog(capacity=10000, spill_dir=tmp)
+        rng = random.Random(0)
+        batch = [
+            SanskritMessage(
+                id=str(i),
+                content="तत्त्वमसि",
+                timestamp=start_time + timedelta(milliseconds=i),
+                language=Language.SANSKRIT,
+            )
+            for i in range(messages)
+        ]
+        start = time.perf_counter()
+        for i, message in enumerate(batch):
+            a, b = f"agent_{rng.randrange(50)}", f"agent_{rng.randrange(50)}"
+            log.record(a, b, message, f"session_{i % sessions}")
+        seconds = time.perf_counter() - start
+        print(f"   append: {messages / seconds:,.0f} msg/s ({len(log):,} in memory, rest spilled)")
+
+        queries = 10000
+        _, seconds = timed(
+            lambda: [log.get_summary(f"session_{i % sessions}") for i in range(queries)]
+        )
+        print(f"   session summary: {seconds / queries * 1e6:.1f} µs")
+        window = start_time + timedelta(milliseconds=messages - 5000)
+        entries, seconds = timed(log.entries_between, window, window + timedelta(seconds=1))
+        print(f"   time range ({len(entries)} entries): {seconds * 1e6:.0f} µs")
+        log.close()
+
+
+def bench_find_agents() -> None:
+    print("🔎 Agent discovery")
+    agents = 100000
+    capabilities = [
+        "debate",
+        "translation",
+        "teaching",
+        "vedanta",
+        "nyaya",
+        "grammar",
+        "poetry",
+        "ritual",
+    ]
+    formalities, levels = list(Formality), list(ComprehensionLevel)
+    rng = random.Random(0)
+    population = [
+        Agent(
+            id=f"agent_{i}",
+            name=f"Agent {i}",
+            capabilities=rng.sample(capabilities, 3),
+            sanskrit_capabilities=SanskritCapabilities(
+                can_read=rng.random() < 0.8,
+                can_write=rng.random() < 0.5,
+                formality=rng.choice(formalities),
+                comprehension_level=rng.choice(levels),
+            ),
+        )
+        for i in range(agents)
+    ]
+    registry = AgentRegistry()
+    _, seconds = timed(lambda: [registry.register_agent(agent) for agent in population])
+    print(f"   register {agents:,} agents: {seconds * 1000:.0f} ms")
+
+    queries: dict[str, dict[str, Any]] = {
+        "debate AND vedanta": {"capabilities": ["debate", "vedanta"]},
+        "(nyaya OR grammar) AND formal AND scholarly, page 50": {
+            "any_capabilities": ["nyaya", "grammar"],
+            "formality": [Formality.FORMAL],
+            "comprehension_level": [ComprehensionLevel.SCHOLARLY],
+            "offset": 1000,
+        },
+        "can write, last page": {"can_write": True, "offset": 49980},
+    }
+    runs = 100
+    for label, query in queries.items():
+        result, seconds = timed(
+            lambda query=query: [registry.find_agents(**query) for _ in range(runs)]
+        )
+        print(f"   {label}: {result[0].total:,} matches, {seconds / runs * 1000:.2f} ms")
+
+
+def bench_eviction() -> None:
+    print("⏳ Idle agent eviction")
+    agents, ttl = 100000, 3600.0
+    registry = AgentRegistry(idle_ttl=ttl)
+    now = datetime.now()
+    population = [
+        Agent(
+            id=f"agent_{i}",
+            name=f"Agent {i}",
+            capabilities=["debate"],
+            sanskrit_capabilities=SanskritCapabilities(can_read=True, can_write=True),
+            # Half the agents were last seen more than a TTL ago
+            last_seen=now - timedelta(seconds=ttl * (1.5 if i % 2 else 0.5)),
+        )
+        for i in range(agents)
+    ]
+    _, seconds = timed(lambda: [registry.register_agent(agent) for agent in population])
+    print(f"   register {agents:,} agents with timers: {seconds * 1000:.0f} ms")
+
+    checks = 10000
+    _, seconds = timed(lambda: [registry.evict_idle_agents() for _ in range(checks)])
+    print(f"   eviction check with nothing due: {seconds / checks * 1e6:.1f} µs")
+
+    time.sleep(EVICTION_TICK * 1.1)
+    evicted, seconds = timed(registry.evict_idle_agents)
+    stats = registry.get_statistics()
+    print(
+        f"   last sweep evicted {len(evicted):,} agents in {seconds * 1000:.0f} ms "
+        f"({stats.evicted_agents:,} evicted in total, {stats.total_agents:,} remain)"
+    )
+
+
+def bench_latency() -> None:
+    print("⏱️ Latency histograms")
+    samples = [random.lognormvariate(-4, 1) for _ in range(200000)]
+    histogram = LatencyHistogram()
+    _, seconds = timed(lambda: [histogram.record(sample) for sample in samples])
+    print(f"   record: {seconds / len(samples) * 1e9:.0f} ns/sample")
+
+    merges = 1000
+    parts = [LatencyHistogram() for _ in range(merges)]
+    for i, sample in enumerate(samples):
+        parts[i % merges].record(sample)
+    merged = LatencyHistogram()
+    _, seconds = timed(lambda: [merged.merge(part) for part in parts])
+    print(f"   merge: {seconds / merges * 1e6:.1f} µs/histogram")
+
+    ordered = sorted(samples)
+    for p in (50, 90, 99):
+        exact = ordered[int(len(ordered) * p / 100) - 1]
+        error = abs(merged.percentile(p) - exact) / exact * 100
+        print(
+            f"   p{p}: {merged.percentile(p) * 1000:.2f} ms (exact {exact * 1000:.2f} ms, "
+            f"{error:.1f}% off)"
+        )
+
+
+def bench_mailboxes() -> None:
+    print("📬 Mailbox delivery")
+    log = ConversationLog()
+    message = SanskritMessage(
+        id="0", content="नमः", timestamp=datetime.now(), language=Language.SANSKRIT
+    )
+    entry = log.record("a", "b", message, "a+b")
+    messages, agents, capacity = 1_000_000, 100, 1000
+
+    async def pump(policy: OverflowPolicy) -> tuple[float, MailboxHub]:
+        hub = MailboxHub(capacity=capacity, policy=policy, block_timeout=5.0)
+        done = asyncio.Event()
+
+        async def consume(agent_id: str) -> None:
+            while not done.is_set():
+                await hub.receive(agent_id, max_messages=100, timeout=0.05)
+
+        consumers = [asyncio.create_task(consume(f"agent_{i}")) for i in range(agents)]
+        start = time.perf_counter()
+        for i in range(messages):
+            await hub.deliver(f"agent_{i % agents}", entry)
+        seconds = time.perf_counter() - start
+        done.set()
+        await asyncio.gather(*consumers)
+        return seconds, hub
+
+    for policy in OverflowPolicy:
+        seconds, hub = asyncio.run(pump(policy))
+        stats = hub.get_statistics()
+        print(
+            f"   {policy.value}: {messages / seconds:,.0f} msg/s, "
+            f"{stats.dropped:,} dropped, {stats.rejected:,} rejected, "
+            f"{stats.queued:,} left queued (cap {agents * capacity:,})"
+        )
+
+    async def fan_out() -> float:
+        hub = MailboxHub(capacity=capacity, policy=OverflowPolicy.DROP_OLDEST)
+        recipients = [f"agent_{i}" for i in range(10000)]
+        start = time.perf_counter()
+        for _ in range(100):
+            await hub.broadcast(recipients, entry)
+        return time.perf_counter() - start
+
+    seconds = asyncio.run(fan_out())
+    print(
+        f"   broadcast to 10,000 agents: {seconds / 100 * 1000:.1f} ms "
+        f"({1e6 / seconds:,.0f} deliveries/s)"
+    )
+
+
+SHARED_NAME = "sanskrit_mcp_benchmark"
+
+
+def shared_worker(messages: int) -> None:
+    registry = AgentRegistry(shared=SharedRegistryTable(SHARED_NAME))
+    for i in range(messages):
+        registry.record_message(f"agent_{i % 100}", f"agent_{(i + 1) % 100}")
+    registry.close()
+
+
+def bench_shared_registry() -> None:
+    print("🔗 Shared-memory registry")
+    # Start from a fresh segment even if an earlier run was interrupted
+    stale = SharedRegistryTable(SHARED_NAME)
+    stale.close()
+    stale.unlink()
+
+    registry = AgentRegistry(shared=SharedRegistryTable(SHARED_NAME, capacity=4096))
+    agents = make_registry(1000).get_all_agents()
+    _, seconds = timed(lambda: [registry.register_agent(agent) for agent in agents])
+    print(f"   register: {seconds / len(agents) * 1e6:.0f} µs/agent")
+
+    workers, messages = 4, 10000
+    processes = [
+        multiprocessing.Process(target=shared_worker, args=(messages,)) for _ in range(workers)
+    ]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    seconds = time.perf_counter() - start
+    stats = registry.get_statistics()
+    lost = workers * messages - stats.total_messages
+    print(f"   {workers} processes: {workers * messages / seconds:,.0f} msg/s, {lost} updates lost")
+
+    reads = 20000
+    _, seconds = timed(lambda: [registry.get_agent(f"agent_{i % 1000}") for i in range(reads)])
+    print(f"   get_agent (seqlock read): {seconds / reads * 1e6:.1f} µs")
+    _, seconds = timed(lambda: [registry.get_statistics() for _ in range(reads)])
+    print(f"   get_statistics: {seconds / reads * 1e6:.1f} µs")
+    registry.close()
+    stale.unlink()
+
+
+def bench_translation_cache() -> None:
+    print("🗄️ Translation cache")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranslationCache(Path(tmp) / "cache.db", capacity=1000, max_bytes=2 * 1024 * 1024)
+        keys = [
+            cache_key("model", "translate_text", f"text {i}", "sanskrit-to-english")
+            for i in range(5000)
+        ]
+        response = "An academic translation with cultural context. " * 20
+        _, seconds = timed(lambda: [cache.put(key, response) for key in keys])
+        print(f"   store: {seconds / len(keys) * 1e6:.1f} µs/entry")
+        _, seconds = timed(cache.flush)
+        print(
+            f"   write-behind flush: {seconds / len(keys) * 1e6:.0f} µs/entry, off the event loop"
+        )
+
+        lookups = 20000
+        recent = keys[-500:]
+        _, seconds = timed(lambda: [cache.get(recent[i % len(recent)]) for i in range(lookups)])
+        print(f"   memory hit: {seconds / lookups * 1e6:.1f} µs")
+        older = keys[-2000:-1000]
+        _, seconds = timed(lambda: [cache.get(key) for key in older])
+        print(f"   disk hit: {seconds / len(older) * 1e6:.0f} µs")
+
+        stats = cache.get_statistics()
+        print(
+            f"   {stats.disk_entries:,} entries on disk "
+            f"({stats.disk_bytes / 2**20:.1f} MiB of 2 MiB cap, "
+            f"{stats.evictions:,} evicted), hit rate {stats.hit_rate * 100:.0f}%"
+        )
+        cache.close()
+
+
+def bench_single_flight() -> None:
+    print("🛬 Request coalescing")
+    upstream_calls = 0
+
+    async def upstream() -> str:
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(0.05)  # a model round-trip
+        return "answer"
+
+    async def burst(clients: int, prompts: int) -> float:
+        flights = SingleFlight()
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(flights.run(f"prompt {i % prompts}", upstream) for i in range(clients))
+        )
+        return time.perf_counter() - start
+
+    clients, prompts = 10000, 10
+    seconds = asyncio.run(burst(clients, prompts))
+    print(
+        f"   {clients:,} concurrent requests for {prompts} prompts: "
+        f"{upstream_calls} upstream calls "
+        f"({clients - upstream_calls:,} coalesced) in {seconds * 1000:.0f} ms"
+    )
+
+
+def bench_request_limiter() -> None:
+    print("🚦 Request limiter")
+
+    class Overloaded(Exception):
+        pass
+
+    async def burst(requests: int, failure_rate: float) -> tuple[float, int, RequestLimiter]:
+        limiter = RequestLimiter(max_in_flight=8, base_backoff=0.01, max_retries=5)
+        peak = active = 0
+
+        async def upstream() -> str:
+            nonlocal peak, active
+            active += 1
+            peak = max(peak, active)
+            try:
+                await asyncio.sleep(0.005)  # a model round-trip
+                if random.random() < failure_rate:
+                    raise Overloaded()
+                return "answer"
+            finally:
+                active -= 1
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                limiter.run(upstream, retryable=lambda e: isinstance(e, Overloaded))
+                for _ in range(requests)
+            ),
+            return_exceptions=True,
+        )
+        return time.perf_counter() - start, peak, limiter
+
+    random.seed(7)
+    for failure_rate in (0.0, 0.2):
+        seconds, peak, limiter = asyncio.run(burst(300, failure_rate))
+        stats = limiter.get_statistics()
+        print(
+            f"   300 requests, 8 in flight, {failure_rate:.0%} transient failures: "
+            f"{seconds:.2f} s, "
+            f"peak in flight {peak}, {stats.retries} retries, {stats.failed} failed, "
+            f"p99 queue wait {stats.p99_wait_ms:.0f} ms"
+        )
+
+
+def bench_batch_translation() -> None:
+    print("📦 Batched translation")
+    verses = [f"verse {i} " + "धर्मक्षेत्रे कुरुक्षेत्रे " * 3 for i in range(200)]
+
+    async def translate(batched: bool) -> tuple[float, TokenUsage]:
+        client = GeminiClient(backend=FakeBackend(median_latency=0.02, seed=1))
+        start = time.perf_counter()
+        if batched:
+            await client.translate_many(verses, "sanskrit-to-english")
+        else:
+            await asyncio.gather(
+                *(client.translate_text(verse, "sanskrit-to-english") for verse in verses)
+            )
+        return time.perf_counter() - start, client.usage.get_total()
+
+    for batched in (False, True):
+        seconds, usage = asyncio.run(translate(batched))
+        print(
+            f"   {len(verses)} verses {'batched' if batched else 'one per call'}: "
+            f"{usage.calls} calls, {usage.prompt_tokens / len(verses):.0f} prompt tokens "
+            f"and {seconds / len(verses) * 1000:.2f} ms per verse"
+        )
+
+
+def bench_streaming() -> None:
+    print("🌊 Streamed responses")
+    answer = " ".join(["word"] * 160)
+
+    async def first_output(streamed: bool) -> tuple[float, float]:
+        client = GeminiClient(backend=FakeBackend(median_latency=0.4, responses={"prompt": answer}))
+        start = time.perf_counter()
+        first = None
+
+        async def on_chunk(chunk: str) -> None:
+            nonlocal first
+            first = first or time.perf_counter() - start
+
+        await client.generate_content("prompt", on_chunk=on_chunk if streamed else None)
+        total = time.perf_counter() - start
+        return first or total, total
+
+    for streamed in (False, True):
+        first, total = asyncio.run(first_output(streamed))
+        print(
+            f"   {'streamed' if streamed else 'buffered'}: "
+            f"first output after {first * 1000:.0f} ms, "
+            f"complete after {total * 1000:.0f} ms"
+        )
+
+
+def bench_circuit_breaker() -> None:
+    print("🔌 Circuit breaker")
+
+    async def requests(count: int, budget: float) -> LatencyHistogram:
+        # An overloaded upstream: every call hangs for five seconds
+        client = GeminiClient(
+            backend=FakeBackend(median_latency=5), breaker=CircuitBreaker(failure_threshold=5)
+        )
+        latency = LatencyHistogram()
+        for i in range(count):
+            start = time.perf_counter()
+            try:
+                await client.translate_text(f"verse {i}", "sanskrit-to-english", budget=budget)
+            except GeminiUnavailable:
+                pass
+            latency.record(time.perf_counter() - start)
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+        return latency
+
+    count, budget = 200, 0.1
+    latency = asyncio.run(requests(count, budget))
+    print(
+        f"   {count} requests to a hanging upstream, {budget * 1000:.0f} ms budget: "
+        f"total {latency.mean * count:.2f} s, p50 {latency.percentile(50) * 1000:.3f} ms, "
+        f"max {latency.percentile(100) * 1000:.0f} ms"
+    )
+
+
+def bench_translation_memory() -> None:
+    print("📚 Translation memory")
+    from sanskrit_mcp.lib.vedic_corpus_parser import VedicCorpusParser
+
+    passages = VedicCorpusParser().all_passages()
+    rng = random.Random(5)
+    # Exact repeats, IAST spellings, one-word edits of corpus verses, and new texts
+    requests = []
+    for i in range(400):
+        verse = rng.choice(passages).sanskrit
+        kind = i % 4
+        if kind == 0:
+            requests.append(verse)
+        elif kind == 1:
+            requests.append(transliterate(verse, "iast", "devanagari"))
+        elif kind == 2:
+            words = verse.split()
+            words[rng.randrange(len(words))] = "च"
+            requests.append(" ".join(words))
+        else:
+            requests.append(f"नूतनं वाक्यं {i}")
+
+    memory = TranslationMemory()
+    seeded = memory.add_passages(passages)
+    start = time.perf_counter()
+    for text in requests:
+        memory.lookup(text, "sanskrit-to-english")
+    lookup = (time.perf_counter() - start) / len(requests)
+    print(f"   {seeded} corpus passages: {lookup * 1000:.3f} ms per lookup")
+
+    async def translate(memory: Optional[TranslationMemory]) -> GeminiClient:
+        client = GeminiClient(backend=FakeBackend(median_latency=0.02, seed=1), memory=memory)
+        await asyncio.gather(
+            *(client.translate_text(text, "sanskrit-to-english") for text in requests)
+        )
+        return client
+
+    for with_memory in (False, True):
+        memory = None
+        if with_memory:
+            memory = TranslationMemory()
+            memory.add_passages(passages)
+        client = asyncio.run(translate(memory))
+        print(
+            f"   {len(requests)} requests {'with' if with_memory else 'without'} memory: "
+            f"{client.usage.get_total().calls} model calls, "
+            f"{client.memory_answers} answered from memory, "
+            f"{client.memory_hints} with hints"
+        )
+
+
+def bench_server() -> None:
+    print("🖥️ Whole server, fake LLM backend")
+    # Configure the server before importing it: seeded fake model,
+    # 20 ms median, 200 ms p99, 2% errors
+    os.environ.update(
+        SANSKRIT_LLM_BACKEND="fake",
+        SANSKRIT_FAKE_MEDIAN_MS="20",
+        SANSKRIT_FAKE_P99_MS="200",
+        SANSKRIT_FAKE_ERROR_RATE="0.02",
+        SANSKRIT_FAKE_SEED="7",
+        SANSKRIT_GEMINI_MAX_IN_FLIGHT="32",
+    )
+    import sanskrit_mcp.__main__ as server
+
+    async def load(requests: int) -> float:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                server.call_tool(
+                    "translate_sanskrit", {"text": f"verse {i}", "direction": "sanskrit-to-english"}
+                )
+                for i in range(requests)
+            )
+        )
+        return time.perf_counter() - start
+
+    requests = 2000
+    seconds = asyncio.run(load(requests))
+    tool = next(
+        stats
+        for stats in server.tool_latency.get_statistics()
+        if stats.name == "translate_sanskrit"
+    )
+    print(
+        f"   {requests} translate_sanskrit calls: {requests / seconds:,.0f} calls/s, "
+        f"p50 {tool.p50_ms:.0f} ms, p99 {tool.p99_ms:.0f} ms, "
+        f"{server.gemini_client.limiter.get_statistics().retries} retries"
+    )
+
+
+if __name__ == "__main__":
+    bench_transliteration()
+    bench_tokenizer()
+    bench_sandhi()
+    bench_morphology()
+    bench_chandas()
+    bench_registry()
+    bench_registry_store()
+    bench_conversation_log()
+    bench_find_agents()
+    bench_eviction()
+    bench_latency()
+    bench_mailboxes()
+    bench_shared_registry()
+    bench_translation_cache()
+    bench_single_flight()
+    bench_request_limiter()
+    bench_batch_translation()
+    bench_streaming()
+    bench_circuit_breaker()
+    bench_translation_memory()
+    bench_server()